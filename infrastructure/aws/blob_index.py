@@ -0,0 +1,160 @@
+"""Reference-counted index of content-addressed diff blobs stored in S3.
+
+Each stored event whose ``diff_url`` points at a blob holds one reference;
+retention releases them when it deletes or drops the events.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    Integer,
+    String,
+    case,
+    func,
+    inspect,
+    select,
+    update,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Mapped, mapped_column
+
+from shared.config.database import Base, get_session
+
+# Tail of S3Client.content_key: .../sha256/<2-char fan-out>/<hash>.gz
+_CONTENT_KEY = re.compile(r"/sha256/[0-9a-f]{2}/([0-9a-f]{64})\.gz$")
+
+
+class DiffBlob(Base):
+    """One row per unique diff blob; ``ref_count`` counts deliveries."""
+
+    __tablename__ = "diff_blobs"
+
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    s3_key: Mapped[str] = mapped_column(String(512), nullable=False)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=func.now()
+    )
+    last_referenced_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"<DiffBlob(hash={self.content_hash[:12]}, refs={self.ref_count})>"
+
+
+def lookup_blob(content_hash: str) -> Optional[str]:
+    """Return the S3 key already stored for ``content_hash``, if any.
+
+    Rows whose references were all released may already be collected, so
+    they do not count as present.
+    """
+    with get_session() as session:
+        return session.scalar(
+            select(DiffBlob.s3_key).where(
+                DiffBlob.content_hash == content_hash, DiffBlob.ref_count > 0
+            )
+        )
+
+
+def add_reference(content_hash: str, s3_key: str, size_bytes: int) -> None:
+    """Record one more delivery of a blob, inserting it on first sight."""
+    increment = (
+        update(DiffBlob)
+        .where(DiffBlob.content_hash == content_hash)
+        .values(ref_count=DiffBlob.ref_count + 1, last_referenced_at=func.now())
+    )
+
+    with get_session() as session:
+        if session.execute(increment).rowcount:
+            return
+        try:
+            with session.begin_nested():
+                session.add(
+                    DiffBlob(
+                        content_hash=content_hash,
+                        s3_key=s3_key,
+                        size_bytes=size_bytes,
+                        ref_count=1,
+                    )
+                )
+        except IntegrityError:
+            # Another worker inserted the same blob concurrently
+            session.execute(increment)
+
+
+def release_reference(content_hash: str) -> int:
+    """Drop one reference and return the remaining count (0 = collectable)."""
+    with get_session() as session:
+        session.execute(
+            update(DiffBlob)
+            .where(DiffBlob.content_hash == content_hash, DiffBlob.ref_count > 0)
+            .values(ref_count=DiffBlob.ref_count - 1)
+        )
+        return (
+            session.scalar(
+                select(DiffBlob.ref_count).where(DiffBlob.content_hash == content_hash)
+            )
+            or 0
+        )
+
+
+def content_hash_of(diff_url: Optional[str]) -> Optional[str]:
+    """Content hash of a deduplicated diff URL (None for other URLs)."""
+    match = _CONTENT_KEY.search(diff_url or "")
+    return match.group(1) if match else None
+
+
+def release_diff_urls(
+    connection: Connection, diff_urls: Iterable[Optional[str]]
+) -> int:
+    """Drop one reference per deleted event pointing at a blob.
+
+    Runs on the caller's connection so the release commits with the delete;
+    returns the number of references released.
+    """
+    counts = Counter(filter(None, map(content_hash_of, diff_urls)))
+    if not counts or not inspect(connection).has_table(DiffBlob.__tablename__):
+        return 0
+    for content_hash, references in counts.items():
+        connection.execute(
+            update(DiffBlob)
+            .where(DiffBlob.content_hash == content_hash)
+            .values(
+                ref_count=case(
+                    (DiffBlob.ref_count > references, DiffBlob.ref_count - references),
+                    else_=0,
+                )
+            )
+        )
+    return sum(counts.values())
+
+
+def get_dedup_stats() -> Dict[str, int]:
+    """Storage grows with unique content; this shows how much delivery saved."""
+    with get_session() as session:
+        unique_blobs, references, unique_bytes, logical_bytes = session.execute(
+            select(
+                func.count(DiffBlob.content_hash),
+                func.coalesce(func.sum(DiffBlob.ref_count), 0),
+                func.coalesce(func.sum(DiffBlob.size_bytes), 0),
+                func.coalesce(func.sum(DiffBlob.size_bytes * DiffBlob.ref_count), 0),
+            )
+        ).one()
+
+    return {
+        "unique_blobs": unique_blobs,
+        "total_references": references,
+        "unique_bytes": unique_bytes,
+        "logical_bytes": logical_bytes,
+        "saved_bytes": logical_bytes - unique_bytes,
+    }
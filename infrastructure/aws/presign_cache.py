@@ -0,0 +1,150 @@
+"""In-process LRU cache for S3 presigned URLs with an optional Redis tier."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, int]
+
+
+class PresignedUrlCache:
+    """Reuse presigned URLs while most of their lifetime is still ahead.
+
+    Entries are keyed on ``(key, expiration)`` and served only during the
+    first ``reuse_fraction`` of the URL lifetime, so a caller always gets a
+    URL valid for at least ``(1 - reuse_fraction) * expiration`` seconds.
+    When ``redis_client`` is given, signatures are shared across replicas.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        reuse_fraction: float = 0.5,
+        redis_client: Any = None,
+        namespace: str = "presign",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.reuse_fraction = min(max(reuse_fraction, 0.0), 1.0)
+        self.redis_client = redis_client
+        self.namespace = namespace
+        self._clock = clock
+        self._entries: OrderedDict[CacheKey, Tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.redis_hits = 0
+
+    def get_or_sign(
+        self, key: str, expiration: int, sign: Callable[[], Optional[str]]
+    ) -> Optional[str]:
+        """Return a cached URL for ``key`` or call ``sign`` and cache the result."""
+        cache_key = (key, expiration)
+        reuse_seconds = expiration * self.reuse_fraction
+
+        url = self._get_local(cache_key)
+        if url is not None:
+            return url
+
+        shared = self._get_shared(cache_key)
+        if shared is not None:
+            url, remaining = shared
+            self._put_local(cache_key, url, remaining)
+            return url
+
+        with self._lock:
+            self.misses += 1
+        url = sign()
+        if url is not None and reuse_seconds > 0:
+            self._put_local(cache_key, url, reuse_seconds)
+            self._put_shared(cache_key, url, reuse_seconds)
+        return url
+
+    def invalidate(self, key: str) -> None:
+        """Forget every cached URL for ``key`` in this process."""
+        with self._lock:
+            for cache_key in [k for k in self._entries if k[0] == key]:
+                del self._entries[cache_key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "redis_hits": self.redis_hits,
+            }
+
+    def _get_local(self, cache_key: CacheKey) -> Optional[str]:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                return None
+            url, reuse_until = entry
+            if now >= reuse_until:
+                del self._entries[cache_key]
+                self.evictions += 1
+                return None
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            return url
+
+    def _put_local(self, cache_key: CacheKey, url: str, reuse_seconds: float) -> None:
+        with self._lock:
+            self._entries[cache_key] = (url, self._clock() + reuse_seconds)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _redis_key(self, cache_key: CacheKey) -> str:
+        key, expiration = cache_key
+        return f"{self.namespace}:{expiration}:{key}"
+
+    def _get_shared(self, cache_key: CacheKey) -> Optional[Tuple[str, float]]:
+        """Return ``(url, seconds of reuse left)`` from Redis, if present."""
+        if self.redis_client is None:
+            return None
+        try:
+            value = self.redis_client.get(self._redis_key(cache_key))
+        except Exception as exc:
+            logger.warning("Presigned URL cache: Redis lookup failed: %s", exc)
+            return None
+        if value is None:
+            return None
+
+        if isinstance(value, bytes):
+            value = value.decode()
+        deadline, _, url = value.partition(" ")
+        try:
+            remaining = float(deadline) - time.time()
+        except ValueError:
+            return None
+        if remaining <= 0 or not url:
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self.redis_hits += 1
+        return url, remaining
+
+    def _put_shared(self, cache_key: CacheKey, url: str, reuse_seconds: float) -> None:
+        ttl = int(reuse_seconds)
+        if self.redis_client is None or ttl <= 0:
+            return
+        # Store the wall-clock reuse deadline so other replicas never serve
+        # the URL past its reuse window, whatever Redis TTL is left.
+        value = f"{time.time() + reuse_seconds:.3f} {url}"
+        try:
+            self.redis_client.setex(self._redis_key(cache_key), ttl, value)
+        except Exception as exc:
+            logger.warning("Presigned URL cache: Redis store failed: %s", exc)
@@ -2,64 +2,578 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import importlib.util
 import os
 import logging
-from typing import Optional
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
 
-logger = logging.getLogger(__name__)
+from infrastructure.aws import blob_index
+from infrastructure.aws.presign_cache import PresignedUrlCache
+from shared.config.settings import get_settings
+from shared.utils.tracing import trace_span
 
-try:
-    import boto3
-    from botocore.exceptions import ClientError
+logger = logging.getLogger(__name__)
 
-    BOTO3_AVAILABLE = True
-except ImportError:
+# boto3/botocore are slow to import, so the first S3Client loads them
+BOTO3_AVAILABLE = importlib.util.find_spec("boto3") is not None
+if not BOTO3_AVAILABLE:
     logger.warning("boto3 not installed, S3 upload disabled")
-    BOTO3_AVAILABLE = False
+
+boto3: Any = None
+Config: Any = None
+ClientError: Any = None
+
+
+def _import_boto3() -> None:
+    global boto3, Config, ClientError
+    if boto3 is None:
+        import boto3 as _boto3
+        from botocore.config import Config as _Config
+        from botocore.exceptions import ClientError as _ClientError
+
+        boto3, Config, ClientError = _boto3, _Config, _ClientError
+
+
+# S3 rejects multipart parts smaller than 5 MiB (except the last one)
+MIN_PART_SIZE = 5 * 1024 * 1024
+STREAM_READ_SIZE = 64 * 1024
+
+DiffSource = Union[bytes, str, BinaryIO, Iterable[Union[bytes, str]]]
+
+
+@dataclass
+class UploadResult:
+    """Outcome of a single object upload within a batch."""
+
+    key: str
+    success: bool
+    url: Optional[str] = None
+    size_bytes: int = 0
+    duration_seconds: float = 0.0
+    error: Optional[str] = None
+    deduplicated: bool = False
+
+
+@dataclass
+class BatchUploadResult:
+    """Per-key results and aggregate throughput of ``upload_diffs_batch``."""
+
+    results: List[UploadResult]
+    total_bytes: int
+    duration_seconds: float
+
+    @property
+    def succeeded(self) -> List[UploadResult]:
+        return [result for result in self.results if result.success]
+
+    @property
+    def failed(self) -> List[UploadResult]:
+        return [result for result in self.results if not result.success]
+
+    @property
+    def throughput_bytes_per_second(self) -> float:
+        if self.duration_seconds <= 0:
+            return 0.0
+        return self.total_bytes / self.duration_seconds
+
+
+@dataclass
+class UploadMetrics:
+    """Cumulative upload counters kept by an ``S3Client`` instance."""
+
+    objects: int = 0
+    failures: int = 0
+    deduplicated: int = 0
+    bytes_uploaded: int = 0
+    bytes_saved: int = 0
+    total_latency_seconds: float = 0.0
+    max_latency_seconds: float = 0.0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def record(self, result: UploadResult) -> None:
+        with self._lock:
+            self.objects += 1
+            self.total_latency_seconds += result.duration_seconds
+            self.max_latency_seconds = max(
+                self.max_latency_seconds, result.duration_seconds
+            )
+            if not result.success:
+                self.failures += 1
+            elif result.deduplicated:
+                self.deduplicated += 1
+                self.bytes_saved += result.size_bytes
+            else:
+                self.bytes_uploaded += result.size_bytes
+
+    def snapshot(self) -> Dict[str, float]:
+        """Return a plain dict view including mean latency and throughput."""
+        with self._lock:
+            mean = self.total_latency_seconds / self.objects if self.objects else 0.0
+            throughput = (
+                self.bytes_uploaded / self.total_latency_seconds
+                if self.total_latency_seconds
+                else 0.0
+            )
+            return {
+                "objects": self.objects,
+                "failures": self.failures,
+                "deduplicated": self.deduplicated,
+                "bytes_uploaded": self.bytes_uploaded,
+                "bytes_saved": self.bytes_saved,
+                "mean_latency_seconds": mean,
+                "max_latency_seconds": self.max_latency_seconds,
+                "bytes_per_second": throughput,
+            }
+
+
+def _iter_source(source: DiffSource) -> Iterator[bytes]:
+    """Yield raw byte chunks from bytes, text, a file-like object or an iterator."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        yield bytes(source)
+        return
+    if isinstance(source, str):
+        yield source.encode("utf-8")
+        return
+
+    if hasattr(source, "read"):
+        while True:
+            chunk = source.read(STREAM_READ_SIZE)
+            if not chunk:
+                return
+            yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+
+    for chunk in source:
+        if chunk:
+            yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+
+
+def _create_presign_redis(redis_url: Optional[str]) -> Any:
+    """Build the optional shared presign cache client; failures fall back to local."""
+    if not redis_url:
+        return None
+    try:
+        import redis
+
+        return redis.Redis.from_url(redis_url, socket_timeout=0.2)
+    except Exception as exc:
+        logger.warning("Presigned URL Redis cache disabled: %s", exc)
+        return None
+
+
+def _sha256_hex(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+class _GzipPartReader:
+    """Compress a chunk stream on the fly and hand it out in fixed-size parts."""
+
+    def __init__(self, chunks: Iterator[bytes], part_size: int):
+        self._chunks = chunks
+        self._part_size = part_size
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # gzip container
+        self._buffer = bytearray()
+        self._eof = False
+
+    def read_part(self) -> Optional[bytes]:
+        while not self._eof and len(self._buffer) < self._part_size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._buffer += self._compressor.flush()
+                self._eof = True
+            else:
+                self._buffer += self._compressor.compress(chunk)
+
+        if not self._buffer:
+            return None
+        part = bytes(self._buffer[: self._part_size])
+        del self._buffer[: self._part_size]
+        return part
+
+
+class _BytesPartReader:
+    """Hand out an in-memory payload in fixed-size parts without copying it whole."""
+
+    def __init__(self, content: bytes, part_size: int):
+        self._view = memoryview(content)
+        self._part_size = part_size
+        self._offset = 0
+
+    def read_part(self) -> Optional[bytes]:
+        if self._offset >= len(self._view):
+            return None
+        part = self._view[self._offset : self._offset + self._part_size].tobytes()
+        self._offset += len(part)
+        return part
 
 
 class S3Client:
-    """AWS S3 client for uploading large diff files."""
+    """AWS S3 client for uploading large diff files.
+
+    Blocking boto3 calls run on a bounded thread pool so the event loop is
+    never stalled. Payloads at or above ``multipart_threshold`` are sent as
+    a concurrent multipart upload. The thread pool matches the botocore
+    connection pool so every worker reuses a kept-alive connection.
+
+    ``upload_diff_deduplicated`` stores blobs under a content-hash key and
+    skips the upload when that key is already known to exist. Presigned
+    URLs are reused through ``presign_cache``.
+    """
 
-    def __init__(self):
+    def __init__(
+        self,
+        multipart_threshold: Optional[int] = None,
+        part_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        batch_concurrency: Optional[int] = None,
+    ):
         if not BOTO3_AVAILABLE:
             raise RuntimeError("boto3 not available")
+        _import_boto3()
 
         self.bucket = os.environ.get("AWS_S3_BUCKET")
         if not self.bucket:
             raise ValueError("AWS_S3_BUCKET environment variable required")
 
+        settings = get_settings()
+        self.multipart_threshold = (
+            multipart_threshold or settings.s3_multipart_threshold_bytes
+        )
+        self.part_size = max(
+            part_size or settings.s3_multipart_part_size_bytes, MIN_PART_SIZE
+        )
+        self.max_concurrency = max(
+            max_concurrency or settings.s3_upload_max_concurrency, 1
+        )
+        self.batch_concurrency = max(
+            batch_concurrency or settings.s3_batch_max_concurrency, 1
+        )
+        self.max_pool_connections = max(
+            settings.s3_max_pool_connections, self.max_concurrency
+        )
+        self.metrics = UploadMetrics()
+        self.dedup_index_enabled = settings.s3_dedup_index_enabled
+        self._known_keys_limit = settings.s3_dedup_cache_size
+        self._known_keys: OrderedDict[str, None] = OrderedDict()
+        self._known_keys_lock = threading.Lock()
+        self.presign_cache = PresignedUrlCache(
+            max_entries=settings.s3_presign_cache_size,
+            reuse_fraction=settings.s3_presign_reuse_fraction,
+            redis_client=_create_presign_redis(settings.s3_presign_cache_redis_url),
+            namespace=f"presign:{self.bucket}",
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_pool_connections, thread_name_prefix="s3-upload"
+        )
+
         self.s3_client = boto3.client(
             "s3",
             aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID"),
             aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY"),
             region_name=os.environ.get("AWS_REGION", "us-east-1"),
+            config=Config(max_pool_connections=self.max_pool_connections),
         )
 
     async def upload_diff(self, key: str, content: bytes) -> str:
-        """Upload diff content to S3 and return the S3 URL."""
+        """Upload already gzip-compressed diff content and return the S3 URL."""
+
+        reader = _BytesPartReader(content, self.part_size)
+        with trace_span("s3.upload", key=key, size_bytes=len(content)):
+            size = await self._upload_parts(key, reader.read_part)
+
+        s3_url = f"s3://{self.bucket}/{key}"
+        logger.info("Uploaded diff to S3: %s (%d bytes)", s3_url, size)
+        return s3_url
+
+    async def upload_diff_stream(self, key: str, source: DiffSource) -> str:
+        """Gzip-compress ``source`` on the fly, upload it and return the S3 URL.
+
+        ``source`` may be bytes, text, a binary/text file object or any
+        iterator of chunks; at most ``max_concurrency + 1`` parts are held
+        in memory at a time.
+        """
+
+        reader = _GzipPartReader(_iter_source(source), self.part_size)
+        with trace_span("s3.upload_stream", key=key):
+            size = await self._upload_parts(key, reader.read_part)
+
+        s3_url = f"s3://{self.bucket}/{key}"
+        logger.info("Streamed diff to S3: %s (%d bytes compressed)", s3_url, size)
+        return s3_url
+
+    @staticmethod
+    def content_key(content_hash: str, prefix: str = "diffs") -> str:
+        """Object key for a blob; the hash fan-out keeps S3 prefixes balanced."""
+        return f"{prefix}/sha256/{content_hash[:2]}/{content_hash}.gz"
+
+    async def upload_diff_deduplicated(
+        self, content: bytes, prefix: str = "diffs", add_reference: bool = True
+    ) -> UploadResult:
+        """Upload gzip-compressed ``content`` under its content-hash key.
+
+        The key hashes the compressed bytes, so callers must compress
+        deterministically (``gzip.compress(data, mtime=0)``); the default
+        header timestamp would give every delivery its own key. Existence
+        is checked in the in-process key cache, then the ``diff_blobs``
+        index (when enabled), then with a HEAD request. ``add_reference``
+        is False for a redelivery of content that is already referenced.
+        """
+
+        started = time.perf_counter()
+        content_hash = await self._run(_sha256_hex, content)
+        key = self.content_key(content_hash, prefix)
+
+        with trace_span("s3.exists", key=key):
+            exists = await self._blob_exists(key, content_hash)
+        if not exists:
+            await self.upload_diff(key, content)
+        self._remember_key(key)
+
+        if self.dedup_index_enabled and add_reference:
+            await self._run(blob_index.add_reference, content_hash, key, len(content))
+
+        result = UploadResult(
+            key=key,
+            success=True,
+            url=f"s3://{self.bucket}/{key}",
+            size_bytes=len(content),
+            duration_seconds=time.perf_counter() - started,
+            deduplicated=exists,
+        )
+        self.metrics.record(result)
+
+        if exists:
+            logger.info("Skipped duplicate diff upload: %s", key)
+        return result
+
+    async def upload_diffs_batch(
+        self,
+        items: Union[Mapping[str, bytes], Iterable[Tuple[str, bytes]]],
+    ) -> BatchUploadResult:
+        """Upload many gzip-compressed diffs concurrently.
+
+        At most ``batch_concurrency`` objects are in flight. A failing key
+        never aborts the rest of the batch; it is reported in ``failed``.
+        """
+
+        pairs = list(items.items() if isinstance(items, Mapping) else items)
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+
+        async def upload_one(key: str, content: bytes) -> UploadResult:
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    url = await self.upload_diff(key, content)
+                    result = UploadResult(
+                        key=key, success=True, url=url, size_bytes=len(content)
+                    )
+                except Exception as exc:
+                    result = UploadResult(
+                        key=key,
+                        success=False,
+                        size_bytes=len(content),
+                        error=f"{type(exc).__name__}: {exc}",
+                    )
+                result.duration_seconds = time.perf_counter() - started
+                self.metrics.record(result)
+                return result
+
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(upload_one(key, content) for key, content in pairs)
+        )
+        batch = BatchUploadResult(
+            results=list(results),
+            total_bytes=sum(r.size_bytes for r in results if r.success),
+            duration_seconds=time.perf_counter() - started,
+        )
+
+        logger.info(
+            "Uploaded diff batch to S3: %d ok, %d failed, %d bytes in %.3fs (%.0f B/s)",
+            len(batch.succeeded),
+            len(batch.failed),
+            batch.total_bytes,
+            batch.duration_seconds,
+            batch.throughput_bytes_per_second,
+        )
+        return batch
+
+    async def _blob_exists(self, key: str, content_hash: str) -> bool:
+        with self._known_keys_lock:
+            if key in self._known_keys:
+                self._known_keys.move_to_end(key)
+                return True
+
+        if self.dedup_index_enabled:
+            if await self._run(blob_index.lookup_blob, content_hash):
+                return True
 
         try:
-            self.s3_client.put_object(
-                Bucket=self.bucket,
-                Key=key,
-                Body=content,
-                ContentType="text/plain",
-                ContentEncoding="gzip",
-                ACL="private",
-            )
+            await self._run(self.s3_client.head_object, Bucket=self.bucket, Key=key)
+            return True
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                return False
+            raise
 
-            s3_url = f"s3://{self.bucket}/{key}"
-            logger.info("Uploaded diff to S3: %s (%d bytes)", s3_url, len(content))
-            return s3_url
+    def _remember_key(self, key: str) -> None:
+        # Only positive lookups are cached: content-addressed objects are
+        # immutable, while a missing one may be uploaded by another node.
+        with self._known_keys_lock:
+            self._known_keys[key] = None
+            self._known_keys.move_to_end(key)
+            while len(self._known_keys) > self._known_keys_limit:
+                self._known_keys.popitem(last=False)
+
+    def close(self) -> None:
+        """Release the upload thread pool."""
+        self._executor.shutdown(wait=True)
+
+    async def _run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(func, *args, **kwargs)
+        )
+
+    def _object_args(self) -> Dict[str, Any]:
+        return {
+            "ContentType": "text/plain",
+            "ContentEncoding": "gzip",
+            "ACL": "private",
+        }
+
+    async def _upload_parts(
+        self, key: str, read_part: Callable[[], Optional[bytes]]
+    ) -> int:
+        """Upload parts from ``read_part``; single PUT below the threshold."""
+
+        head: list[bytes] = []
+        size = 0
+        while size < self.multipart_threshold:
+            part = await self._run(read_part)
+            if part is None:
+                break
+            head.append(part)
+            size += len(part)
+
+        try:
+            if size < self.multipart_threshold:
+                await self._run(
+                    self.s3_client.put_object,
+                    Bucket=self.bucket,
+                    Key=key,
+                    Body=b"".join(head),
+                    **self._object_args(),
+                )
+                return size
+
+            return await self._multipart_upload(key, head, size, read_part)
 
         except ClientError as exc:
             logger.exception("Failed to upload diff to S3: %s", exc)
             raise
 
+    async def _multipart_upload(
+        self,
+        key: str,
+        head: list[bytes],
+        size: int,
+        read_part: Callable[[], Optional[bytes]],
+    ) -> int:
+        response = await self._run(
+            self.s3_client.create_multipart_upload,
+            Bucket=self.bucket,
+            Key=key,
+            **self._object_args(),
+        )
+        upload_id = response["UploadId"]
+
+        # Bound in-flight parts so memory stays flat for very large streams
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks: list[asyncio.Task] = []
+
+        async def send(number: int, body: bytes) -> Dict[str, Any]:
+            try:
+                result = await self._run(
+                    self.s3_client.upload_part,
+                    Bucket=self.bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=number,
+                    Body=body,
+                )
+                return {"PartNumber": number, "ETag": result["ETag"]}
+            finally:
+                semaphore.release()
+
+        async def schedule(body: bytes) -> None:
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(send(len(tasks) + 1, body)))
+
+        try:
+            for body in head:
+                await schedule(body)
+            head.clear()
+
+            while True:
+                body = await self._run(read_part)
+                if body is None:
+                    break
+                size += len(body)
+                await schedule(body)
+
+            parts = await asyncio.gather(*tasks)
+            await self._run(
+                self.s3_client.complete_multipart_upload,
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+            return size
+
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._run(
+                self.s3_client.abort_multipart_upload,
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+            )
+            raise
+
     def get_presigned_url(self, key: str, expiration: int = 3600) -> Optional[str]:
-        """Generate a presigned URL for downloading a diff file."""
+        """Return a (possibly cached) presigned URL for downloading a diff file."""
+
+        return self.presign_cache.get_or_sign(
+            key, expiration, partial(self._sign_download_url, key, expiration)
+        )
 
+    def _sign_download_url(self, key: str, expiration: int) -> Optional[str]:
         try:
             url = self.s3_client.generate_presigned_url(
                 "get_object",
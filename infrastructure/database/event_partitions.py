@@ -0,0 +1,464 @@
+"""Indexes, monthly range partitions and retention for the ``events`` table.
+
+On PostgreSQL ``events`` is converted to a table partitioned by month on
+``created_at`` (``events_pYYYYMM`` plus a default partition), so expiring a
+month is a ``DETACH PARTITION`` followed by ``DROP TABLE`` or a move into the
+archive schema - constant time, no row-by-row ``DELETE`` and no vacuum debt.
+Other dialects keep a plain table and fall back to batched deletes.
+
+PostgreSQL requires the partition key in every unique constraint, so the
+partitioned table only enforces ``(repository, commit_sha, created_at)``.
+Global uniqueness of ``(repository, commit_sha)`` moves to the unpartitioned
+``event_keys`` table, which ``EventWriteBuffer`` inserts into in the same
+transaction as the event.
+
+The conversion is never run at startup: ``scripts/partition_events.py``
+copies the rows in batches and swaps the tables at the end.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import DateTime, String, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Mapped, mapped_column
+
+from shared.config.database import Base
+
+logger = logging.getLogger(__name__)
+
+EVENT_RETENTION_TASK = "events.maintain_partitions"
+
+RETENTION_MODES = ("drop", "archive")
+
+_PARTITION_NAME = re.compile(r"^events_p(\d{4})(\d{2})$")
+_DELETE_BATCH = 5000
+_STAGING_TABLE = "events_partitioned"
+
+_EVENT_INDEXES = (
+    ("ix_events_repository_created_at", "repository, created_at"),
+    ("ix_events_timestamp_utc", "timestamp_utc"),
+)
+
+# Indexes of the package model, recreated on the partitioned table
+_MODEL_INDEXES = (
+    ("ix_events_repository", "repository"),
+    ("ix_events_pusher", "pusher"),
+    ("ix_events_commit_sha", "commit_sha"),
+)
+
+
+class EventKey(Base):
+    """``(repository, commit_sha)`` of every event (partitioned dedup guard)."""
+
+    __tablename__ = "event_keys"
+
+    repository: Mapped[str] = mapped_column(String(255), primary_key=True)
+    commit_sha: Mapped[str] = mapped_column(String(64), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+
+
+def _month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _add_months(value: date, months: int) -> date:
+    month = value.month - 1 + months
+    return date(value.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"events_p{month.year:04d}{month.month:02d}"
+
+
+def ensure_event_indexes(connection: Connection) -> None:
+    """Index the range and hot columns of the (package-owned) events table.
+
+    ``(repository, created_at)`` serves "pushes to repo X since T" with an
+    index range scan; ``timestamp_utc`` is the extracted head commit time.
+    On PostgreSQL pass an autocommit connection: the indexes are built
+    concurrently so inserts keep flowing.
+    """
+    from .migrations import create_index
+
+    if not inspect(connection).has_table("events"):
+        return
+    # Plain DDL (Index() objects would attach to the package-owned Table)
+    for name, columns in _EVENT_INDEXES:
+        create_index(connection, name, "events", columns)
+
+
+def is_partitioned(connection: Connection) -> bool:
+    if connection.dialect.name != "postgresql":
+        return False
+    return bool(
+        connection.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table p "
+                "JOIN pg_class c ON c.oid = p.partrelid "
+                "WHERE c.relname = 'events' AND pg_table_is_visible(c.oid)"
+            )
+        ).scalar()
+    )
+
+
+def list_partitions(connection: Connection, table: str = "events") -> Dict[date, str]:
+    """Monthly partitions currently attached to ``table`` by month start."""
+    names = connection.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:table AS regclass)"
+        ),
+        {"table": table},
+    ).scalars()
+    partitions = {}
+    for name in names:
+        match = _PARTITION_NAME.match(name)
+        if match:
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return partitions
+
+
+def ensure_monthly_partitions(
+    connection: Connection, start: date, months_ahead: int, table: str = "events"
+) -> List[str]:
+    """Create missing partitions from ``start``'s month to ``months_ahead`` ahead."""
+    existing = list_partitions(connection, table)
+    month = _month_start(start)
+    last = _add_months(_month_start(date.today()), months_ahead)
+    created = []
+    while month <= last:
+        if month not in existing:
+            name = partition_name(month)
+            connection.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                    f"FOR VALUES FROM ('{month.isoformat()}') "
+                    f"TO ('{_add_months(month, 1).isoformat()}')"
+                )
+            )
+            created.append(name)
+        month = _add_months(month, 1)
+    return created
+
+
+def _create_staging_table(connection: Connection, months_ahead: int) -> None:
+    oldest = connection.execute(text("SELECT min(created_at) FROM events")).scalar()
+    connection.execute(
+        text(
+            f"CREATE TABLE {_STAGING_TABLE} (LIKE events INCLUDING DEFAULTS) "
+            "PARTITION BY RANGE (created_at)"
+        )
+    )
+    connection.execute(
+        text(f"ALTER TABLE {_STAGING_TABLE} ADD PRIMARY KEY (id, created_at)")
+    )
+    connection.execute(
+        text(
+            f"ALTER TABLE {_STAGING_TABLE} ADD CONSTRAINT "
+            "uq_events_repository_commit_created "
+            "UNIQUE (repository, commit_sha, created_at)"
+        )
+    )
+    # Built while the staging table is empty; renamed after the swap
+    for name, columns in _MODEL_INDEXES + _EVENT_INDEXES:
+        connection.execute(
+            text(f"CREATE INDEX {name}_new ON {_STAGING_TABLE} ({columns})")
+        )
+    ensure_monthly_partitions(
+        connection,
+        oldest.date() if oldest else date.today(),
+        months_ahead,
+        table=_STAGING_TABLE,
+    )
+    connection.execute(
+        text(f"CREATE TABLE events_default PARTITION OF {_STAGING_TABLE} DEFAULT")
+    )
+
+
+def _copy_batch(connection: Connection, batch_size: int) -> int:
+    """Copy events (and their keys) past the last copied id; returns rows."""
+    last_id = connection.execute(
+        text(f"SELECT COALESCE(max(id), 0) FROM {_STAGING_TABLE}")
+    ).scalar()
+    copied = connection.execute(
+        text(
+            f"INSERT INTO {_STAGING_TABLE} SELECT * FROM events "
+            "WHERE id > :last_id ORDER BY id LIMIT :limit"
+        ),
+        {"last_id": last_id, "limit": batch_size},
+    ).rowcount
+    connection.execute(
+        text(
+            "INSERT INTO event_keys (repository, commit_sha, created_at) "
+            f"SELECT repository, commit_sha, created_at FROM {_STAGING_TABLE} "
+            "WHERE id > :last_id ON CONFLICT DO NOTHING"
+        ),
+        {"last_id": last_id},
+    )
+    return copied
+
+
+def _reconcile_copy(connection: Connection) -> None:
+    """Make the staging table match ``events`` exactly (under the lock).
+
+    Batches only copy ids above the last one copied, so rows committed late
+    with a lower id, and rows updated or deleted after their batch, are
+    fixed here by comparing whole rows.
+    """
+    connection.execute(
+        text(
+            f"DELETE FROM {_STAGING_TABLE} s WHERE NOT EXISTS ("
+            "SELECT 1 FROM events e "
+            "WHERE e.id = s.id AND ROW(e.*) IS NOT DISTINCT FROM ROW(s.*))"
+        )
+    )
+    connection.execute(
+        text(
+            f"WITH copied AS (INSERT INTO {_STAGING_TABLE} SELECT * FROM events e "
+            f"WHERE NOT EXISTS (SELECT 1 FROM {_STAGING_TABLE} s WHERE s.id = e.id) "
+            "RETURNING repository, commit_sha, created_at) "
+            "INSERT INTO event_keys (repository, commit_sha, created_at) "
+            "SELECT repository, commit_sha, created_at FROM copied "
+            "ON CONFLICT DO NOTHING"
+        )
+    )
+    source, copied = connection.execute(
+        text(
+            "SELECT (SELECT count(*) FROM events), "
+            f"(SELECT count(*) FROM {_STAGING_TABLE})"
+        )
+    ).one()
+    if source != copied:
+        raise RuntimeError(
+            f"events has {source} rows but {_STAGING_TABLE} {copied}; not swapping"
+        )
+
+
+def convert_events_to_partitioned(
+    connection: Connection, months_ahead: int = 3, batch_size: int = 10000
+) -> bool:
+    """Rebuild ``events`` as a monthly range-partitioned table (PostgreSQL only).
+
+    ``connection`` must not be inside ``begin()``: rows are copied into a
+    staging table ``batch_size`` at a time and committed per batch, so
+    inserts keep flowing and an interrupted run resumes where it stopped.
+    The final transaction locks ``events``, reconciles the staging table
+    with it (rows inserted, updated or deleted meanwhile), checks the row
+    counts match and swaps the tables. Returns ``False`` when there is nothing
+    to do (other dialects, missing table, already partitioned).
+    """
+    if connection.dialect.name != "postgresql":
+        return False
+    if not inspect(connection).has_table("events") or is_partitioned(connection):
+        connection.commit()
+        return False
+
+    EventKey.__table__.create(bind=connection, checkfirst=True)
+    if not inspect(connection).has_table(_STAGING_TABLE):
+        _create_staging_table(connection, months_ahead)
+    connection.commit()
+
+    copied = 0
+    while True:
+        count = _copy_batch(connection, batch_size)
+        connection.commit()
+        copied += count
+        logger.info("Copied %d events into %s", copied, _STAGING_TABLE)
+        if count < batch_size:
+            break
+
+    connection.execute(text("LOCK TABLE events IN ACCESS EXCLUSIVE MODE"))
+    _reconcile_copy(connection)
+    sequence = connection.execute(
+        text("SELECT pg_get_serial_sequence('events', 'id')")
+    ).scalar()
+    connection.execute(text("ALTER TABLE events RENAME TO events_unpartitioned"))
+    connection.execute(text(f"ALTER TABLE {_STAGING_TABLE} RENAME TO events"))
+    if sequence:
+        connection.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY events.id"))
+    connection.execute(text("DROP TABLE events_unpartitioned"))
+    connection.execute(
+        text(
+            f"ALTER TABLE events RENAME CONSTRAINT {_STAGING_TABLE}_pkey "
+            "TO events_pkey"
+        )
+    )
+    for name, _ in _MODEL_INDEXES + _EVENT_INDEXES:
+        connection.execute(text(f"ALTER INDEX {name}_new RENAME TO {name}"))
+    connection.commit()
+
+    logger.info("Converted events to a monthly partitioned table")
+    return True
+
+
+def apply_retention(
+    engine: Engine,
+    retention_months: int,
+    mode: str = "drop",
+    archive_schema: str = "events_archive",
+    now: Optional[datetime] = None,
+) -> List[str]:
+    """Expire events older than ``retention_months`` whole months.
+
+    Partitioned tables detach whole month partitions and drop them (or move
+    them to ``archive_schema``); expired rows that landed in
+    ``events_default`` are deleted (or moved) in batches. Plain tables delete
+    expired rows in batches; archiving needs partitions, so it is skipped
+    there. Returns the partitions expired (plus ``"events_default: <n> rows"``),
+    or ``["<n> rows"]`` for the fallback.
+    """
+    if retention_months <= 0:
+        return []
+    if mode not in RETENTION_MODES:
+        raise ValueError(
+            f"Unknown retention mode '{mode}' (expected {RETENTION_MODES})"
+        )
+
+    cutoff = _add_months(
+        _month_start((now or datetime.utcnow()).date()), -retention_months
+    )
+
+    with engine.begin() as connection:
+        partitioned = is_partitioned(connection)
+        if partitioned:
+            expired = _expire_partitions(connection, cutoff, mode, archive_schema)
+
+    if partitioned:
+        # Rows outside every monthly partition are never detached with one
+        archive_table = (
+            f"{archive_schema}.events_default" if mode == "archive" else None
+        )
+        deleted = _delete_expired_rows(engine, cutoff, "events_default", archive_table)
+        return expired + ([f"events_default: {deleted} rows"] if deleted else [])
+
+    if mode == "archive":
+        logger.warning("Event archiving requires partitioned PostgreSQL; rows kept")
+        return []
+    deleted = _delete_expired_rows(engine, cutoff)
+    return [f"{deleted} rows"] if deleted else []
+
+
+def _expire_partitions(
+    connection: Connection, cutoff: date, mode: str, archive_schema: str
+) -> List[str]:
+    expired = [
+        name
+        for month, name in sorted(list_partitions(connection).items())
+        if _add_months(month, 1) <= cutoff
+    ]
+    if expired and mode == "archive":
+        connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {archive_schema}"))
+
+    for name in expired:
+        connection.execute(text(f"ALTER TABLE events DETACH PARTITION {name}"))
+        if mode == "archive":
+            connection.execute(text(f"ALTER TABLE {name} SET SCHEMA {archive_schema}"))
+        else:
+            _release_diff_blobs(
+                connection,
+                connection.execute(
+                    text(f"SELECT diff_url FROM {name} WHERE diff_url IS NOT NULL")
+                ).scalars(),
+            )
+            connection.execute(text(f"DROP TABLE {name}"))
+        logger.info("Expired events partition %s (%s)", name, mode)
+
+    if mode == "drop" and expired:
+        _delete_expired_payloads(connection, cutoff)
+    return expired
+
+
+def _delete_expired_rows(
+    engine: Engine,
+    cutoff: date,
+    table: str = "events",
+    archive_table: Optional[str] = None,
+) -> int:
+    """Delete (or move to ``archive_table``) rows before ``cutoff`` in batches."""
+    delete = (
+        f"DELETE FROM {table} WHERE id IN ("
+        f"SELECT id FROM {table} WHERE created_at < :cutoff LIMIT :limit)"
+    )
+    if archive_table:
+        schema = archive_table.partition(".")[0]
+        with engine.begin() as connection:
+            connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema}"))
+            connection.execute(
+                text(f"CREATE TABLE IF NOT EXISTS {archive_table} (LIKE {table})")
+            )
+        delete = (
+            f"WITH moved AS ({delete} RETURNING *) "
+            f"INSERT INTO {archive_table} SELECT * FROM moved"
+        )
+
+    else:
+        delete += " RETURNING diff_url"
+
+    deleted = 0
+    while True:
+        with engine.begin() as connection:
+            result = connection.execute(
+                text(delete), {"cutoff": cutoff, "limit": _DELETE_BATCH}
+            )
+            if archive_table:
+                count = result.rowcount
+            else:
+                diff_urls = result.scalars().all()
+                count = len(diff_urls)
+                _release_diff_blobs(connection, diff_urls)
+                _delete_expired_payloads(connection, cutoff)
+        deleted += count
+        if count < _DELETE_BATCH:
+            return deleted
+
+
+def _release_diff_blobs(
+    connection: Connection, diff_urls: Iterable[Optional[str]]
+) -> None:
+    # Archived rows keep their blobs; deleted ones give their reference back
+    from infrastructure.aws.blob_index import release_diff_urls
+
+    released = release_diff_urls(connection, diff_urls)
+    if released:
+        logger.info("Released %d diff blob references", released)
+
+
+def _delete_expired_payloads(connection: Connection, cutoff: date) -> None:
+    # Expired keys go too, so a re-sent old push can be stored again
+    tables = set(inspect(connection).get_table_names())
+    for table in ("event_payloads", EventKey.__tablename__):
+        if table in tables:
+            connection.execute(
+                text(f"DELETE FROM {table} WHERE created_at < :cutoff"),
+                {"cutoff": cutoff},
+            )
+
+
+def maintain_event_partitions() -> Dict[str, List[str]]:
+    """Periodic task: pre-create upcoming partitions and apply retention."""
+    from shared.config.database import get_sync_engine
+    from shared.config.settings import get_settings
+
+    settings = get_settings()
+    engine = get_sync_engine()
+
+    created: List[str] = []
+    with engine.begin() as connection:
+        if is_partitioned(connection):
+            created = ensure_monthly_partitions(
+                connection, date.today(), settings.event_partition_months_ahead
+            )
+
+    expired = apply_retention(
+        engine,
+        settings.event_retention_months,
+        mode=settings.event_retention_mode,
+        archive_schema=settings.event_archive_schema,
+    )
+    return {"created": created, "expired": expired}
@@ -0,0 +1,234 @@
+"""Compressed side table for ``events.payload`` plus hot-field extraction.
+
+The full push JSON is stored compressed in ``event_payloads`` keyed by
+``(repository, commit_sha)`` (unique on ``events``), and ``events.payload``
+keeps an empty string. Queries on ``events`` then never read the blob;
+``load_event_payload`` fetches and decompresses it on demand.
+
+Used only with ``EVENT_PAYLOAD_STORAGE=compressed``: readers that parse
+``events.payload`` themselves (``yeonjae_universal_data_retriever``) see
+an empty payload for moved rows.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    LargeBinary,
+    String,
+    func,
+    select,
+    text,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Mapped, mapped_column
+
+from shared.config.database import Base
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+CODECS = ("zstd", "gzip", "none")
+
+
+class EventPayload(Base):
+    """Compressed GitHub push payload of one ``events`` row."""
+
+    __tablename__ = "event_payloads"
+
+    repository: Mapped[str] = mapped_column(String(255), primary_key=True)
+    commit_sha: Mapped[str] = mapped_column(String(64), primary_key=True)
+    codec: Mapped[str] = mapped_column(String(8), nullable=False)
+    raw_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    payload: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    # The event's created_at (retention deletes by it); now() only as a fallback
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=func.now(), index=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<EventPayload({self.repository}@{self.commit_sha[:8]}, {self.codec})>"
+
+
+def resolve_codec(codec: str = "auto") -> str:
+    """``auto`` prefers zstd when installed and falls back to gzip."""
+    if codec == "auto":
+        return "zstd" if ZSTD_AVAILABLE else "gzip"
+    if codec not in CODECS:
+        raise ValueError(f"Unknown payload codec '{codec}' (expected auto or {CODECS})")
+    if codec == "zstd" and not ZSTD_AVAILABLE:
+        raise ValueError("zstd payload codec requires the 'zstandard' package")
+    return codec
+
+
+def compress_payload(raw: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(raw)
+    if codec == "gzip":
+        return gzip.compress(raw, compresslevel=6)
+    return raw
+
+
+def decompress_payload(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "gzip":
+        return gzip.decompress(data)
+    return data
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def extract_hot_fields(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Head SHA, head commit timestamp and file/commit counts of a push."""
+    commits = payload.get("commits") or []
+    head_commit = payload.get("head_commit") or (commits[-1] if commits else {})
+    files = set()
+    for commit in commits:
+        for key in ("added", "modified", "removed"):
+            files.update(commit.get(key) or [])
+
+    fields = {
+        "commit_sha": payload.get("after") or head_commit.get("id"),
+        "timestamp_utc": _parse_timestamp(head_commit.get("timestamp")),
+        "commit_count": len(commits),
+        "files_changed": len(files) if commits else None,
+    }
+    return {key: value for key, value in fields.items() if value is not None}
+
+
+def split_event_row(
+    row: Dict[str, Any], codec: str
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Return ``(events row, event_payloads row)`` for one event.
+
+    Hot fields missing from ``row`` are filled from the payload, which is
+    parsed once here instead of on every query.
+    """
+    event = dict(row)
+    raw_payload = event.get("payload") or ""
+    raw = raw_payload.encode() if isinstance(raw_payload, str) else raw_payload
+
+    try:
+        parsed = json.loads(raw) if raw else {}
+    except ValueError:
+        parsed = {}
+    if isinstance(parsed, dict):
+        for key, value in extract_hot_fields(parsed).items():
+            if event.get(key) is None:
+                event[key] = value
+
+    event["payload"] = ""
+    payload_row = {
+        "repository": event["repository"],
+        "commit_sha": event["commit_sha"],
+        "codec": codec,
+        "raw_size": len(raw),
+        "payload": compress_payload(raw, codec),
+    }
+    # Retention deletes payloads by created_at: keep the event's
+    if event.get("created_at") is not None:
+        payload_row["created_at"] = event["created_at"]
+    return event, payload_row
+
+
+def load_event_payload(
+    connection: Connection, repository: str, commit_sha: str
+) -> Optional[Dict[str, Any]]:
+    """Lazily load one event's payload (side table first, inline fallback)."""
+    table = EventPayload.__table__
+    row = connection.execute(
+        select(table.c.codec, table.c.payload).where(
+            table.c.repository == repository, table.c.commit_sha == commit_sha
+        )
+    ).first()
+    if row is not None:
+        return json.loads(decompress_payload(row.payload, row.codec))
+
+    inline = connection.execute(
+        text(
+            "SELECT payload FROM events "
+            "WHERE repository = :repository AND commit_sha = :commit_sha"
+        ),
+        {"repository": repository, "commit_sha": commit_sha},
+    ).scalar()
+    return json.loads(inline) if inline else None
+
+
+def migrate_inline_payloads(
+    connection: Connection, codec: str = "auto", batch_size: int = 500
+) -> int:
+    """Move inline ``events.payload`` JSON into ``event_payloads`` in batches.
+
+    Also back-fills empty hot columns. ``connection`` must not be inside
+    ``begin()``: each batch is committed on its own, so the migration can be
+    interrupted and resumed. Returns the rows moved.
+    """
+    codec = resolve_codec(codec)
+    moved = 0
+    while True:
+        rows = (
+            connection.execute(
+                text(
+                    "SELECT id, repository, commit_sha, payload, timestamp_utc, "
+                    "files_changed, created_at FROM events "
+                    "WHERE payload <> '' LIMIT :limit"
+                ).columns(created_at=DateTime),
+                {"limit": batch_size},
+            )
+            .mappings()
+            .all()
+        )
+        if not rows:
+            connection.commit()
+            return moved
+
+        payload_rows, updates = [], []
+        for row in rows:
+            event, payload_row = split_event_row(dict(row), codec)
+            payload_rows.append(payload_row)
+            updates.append(
+                {
+                    "id": row["id"],
+                    "timestamp_utc": event.get("timestamp_utc"),
+                    "files_changed": event.get("files_changed"),
+                }
+            )
+
+        connection.execute(EventPayload.__table__.insert(), payload_rows)
+        connection.execute(
+            text(
+                "UPDATE events SET payload = '', "
+                "timestamp_utc = COALESCE(timestamp_utc, :timestamp_utc), "
+                "files_changed = COALESCE(files_changed, :files_changed) "
+                "WHERE id = :id"
+            ),
+            updates,
+        )
+        connection.commit()
+        moved += len(rows)
+        logger.info("Moved %d event payloads to event_payloads", moved)
@@ -0,0 +1,213 @@
+"""Hourly and daily per-repository/pusher rollups of ``events``.
+
+Rollups are maintained incrementally: ``EventWriteBuffer`` adds each
+batch's counts in the same transaction that inserts the events, so a
+rolled-back batch never reaches the rollups. The webhook task inserts
+through the buffer (``modules.event_storage``); with
+``EVENT_WRITE_BUFFER_ENABLED=false`` events bypass it, and the nightly
+compaction task recounts the rollups from ``events`` instead. Reports then
+read one row per bucket instead of re-aggregating the events (and their
+payloads).
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import DateTime, Integer, String, delete, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Mapped, mapped_column
+
+from shared.config.database import Base
+
+logger = logging.getLogger(__name__)
+
+EVENT_ROLLUP_COMPACTION_TASK = "events.compact_rollups"
+
+COUNTERS = ("pushes", "commits", "files_changed", "added_lines", "deleted_lines")
+
+
+class _RollupColumns:
+    bucket_start: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    repository: Mapped[str] = mapped_column(String(255), primary_key=True)
+    pusher: Mapped[str] = mapped_column(String(255), primary_key=True)
+    pushes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    commits: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    files_changed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    added_lines: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    deleted_lines: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+
+
+class EventRollupHourly(_RollupColumns, Base):
+    """Event counts per hour, repository and pusher."""
+
+    __tablename__ = "event_rollups_hourly"
+
+
+class EventRollupDaily(_RollupColumns, Base):
+    """Event counts per (UTC) day, repository and pusher."""
+
+    __tablename__ = "event_rollups_daily"
+
+
+ROLLUP_TABLES = {
+    "hourly": EventRollupHourly.__table__,
+    "daily": EventRollupDaily.__table__,
+}
+
+Key = Tuple[datetime, str, str]
+
+
+def _bucket(created_at: datetime, granularity: str) -> datetime:
+    if granularity == "hourly":
+        return created_at.replace(minute=0, second=0, microsecond=0)
+    return created_at.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def aggregate_events(
+    rows: Iterable[Dict[str, Any]],
+) -> Dict[str, Dict[Key, Dict[str, int]]]:
+    """Sum event rows per granularity and (bucket, repository, pusher) key."""
+    totals: Dict[str, Dict[Key, Dict[str, int]]] = {
+        granularity: defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+        for granularity in ROLLUP_TABLES
+    }
+    for row in rows:
+        created_at = row.get("created_at") or datetime.utcnow()
+        commit_count = row.get("commit_count")
+        increments = {
+            "pushes": 1,
+            "commits": 1 if commit_count is None else commit_count,
+            "files_changed": row.get("files_changed") or 0,
+            "added_lines": row.get("added_lines") or 0,
+            "deleted_lines": row.get("deleted_lines") or 0,
+        }
+        for granularity, buckets in totals.items():
+            counters = buckets[
+                (_bucket(created_at, granularity), row["repository"], row["pusher"])
+            ]
+            for name, value in increments.items():
+                counters[name] += value
+    return totals
+
+
+def apply_rollups(connection: Connection, rows: List[Dict[str, Any]]) -> None:
+    """Add ``rows`` to the rollup tables inside the caller's transaction."""
+    for granularity, buckets in aggregate_events(rows).items():
+        table = ROLLUP_TABLES[granularity]
+        # Sorted so concurrent writers lock rollup rows in the same order
+        values = [
+            {"bucket_start": key[0], "repository": key[1], "pusher": key[2], **counters}
+            for key, counters in sorted(buckets.items())
+        ]
+        _upsert_add(connection, table, values)
+
+
+def _upsert_add(connection: Connection, table, values: List[Dict[str, Any]]) -> None:
+    dialect = connection.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = (postgresql if dialect == "postgresql" else sqlite).insert
+        statement = insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=["bucket_start", "repository", "pusher"],
+            set_={
+                **{name: table.c[name] + statement.excluded[name] for name in COUNTERS},
+                "updated_at": func.now(),
+            },
+        )
+        for value in values:
+            connection.execute(statement, value)
+        return
+
+    for value in values:
+        key = (
+            (table.c.bucket_start == value["bucket_start"])
+            & (table.c.repository == value["repository"])
+            & (table.c.pusher == value["pusher"])
+        )
+        changed = connection.execute(
+            update(table)
+            .where(key)
+            .values({name: table.c[name] + value[name] for name in COUNTERS})
+        ).rowcount
+        if not changed:
+            connection.execute(table.insert(), value)
+
+
+def rebuild_rollups(connection: Connection, batch_size: int = 5000) -> int:
+    """Recompute both rollup tables from ``events``; returns rows read.
+
+    Runs in the caller's transaction, so readers never see empty rollups.
+    """
+    from yeonjae_universal_data_storage.models import Event
+
+    events = Event.__table__
+    columns = [
+        events.c.id,
+        events.c.repository,
+        events.c.pusher,
+        events.c.created_at,
+        events.c.commit_count,
+        events.c.files_changed,
+        events.c.added_lines,
+        events.c.deleted_lines,
+    ]
+    for table in ROLLUP_TABLES.values():
+        connection.execute(delete(table))
+
+    read, last_id = 0, 0
+    while True:
+        rows = (
+            connection.execute(
+                select(*columns)
+                .where(events.c.id > last_id)
+                .order_by(events.c.id)
+                .limit(batch_size)
+            )
+            .mappings()
+            .all()
+        )
+        if not rows:
+            return read
+        apply_rollups(connection, [dict(row) for row in rows])
+        read += len(rows)
+        last_id = rows[-1]["id"]
+
+
+def compact_rollups(
+    engine: Engine, hourly_retention_days: int, now: datetime = None
+) -> int:
+    """Drop hourly buckets older than the retention; daily buckets are kept."""
+    if hourly_retention_days <= 0:
+        return 0
+    cutoff = _bucket(now or datetime.utcnow(), "daily") - timedelta(
+        days=hourly_retention_days
+    )
+    table = ROLLUP_TABLES["hourly"]
+    with engine.begin() as connection:
+        deleted = connection.execute(
+            delete(table).where(table.c.bucket_start < cutoff)
+        ).rowcount
+    logger.info("Compacted %d hourly event rollups older than %s", deleted, cutoff)
+    return deleted
+
+
+def compact_event_rollups() -> int:
+    """Periodic task: recount rollups if events bypass the buffer, then compact."""
+    from shared.config.database import get_sync_engine
+    from shared.config.settings import get_settings
+
+    settings = get_settings()
+    engine = get_sync_engine()
+    if not settings.event_write_buffer_enabled:
+        with engine.begin() as connection:
+            read = rebuild_rollups(connection)
+        logger.info("Rebuilt event rollups from %d events", read)
+    return compact_rollups(engine, settings.event_rollup_hourly_retention_days)
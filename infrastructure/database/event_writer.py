@@ -0,0 +1,334 @@
+"""Write-behind buffer that persists webhook events in batches."""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import Table, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+
+from .event_partitions import EventKey
+from .event_payloads import EventPayload, resolve_codec, split_event_row
+from .event_rollups import apply_rollups
+
+logger = logging.getLogger(__name__)
+
+DURABILITY_MODES = ("sync", "async")
+
+Pending = Tuple[Dict[str, Any], Future]
+
+
+def _events_table() -> Table:
+    from yeonjae_universal_data_storage.models import Event
+
+    return Event.__table__
+
+
+class EventWriteBuffer:
+    """Collect event rows and insert them N at a time or every T seconds.
+
+    ``durability="sync"`` (group commit): ``write`` returns once the batch
+    holding the row is committed and re-raises its error, e.g. a duplicate
+    ``(repository, commit_sha)``; rows arriving during a commit form the
+    next batch. ``durability="async"``: ``write`` returns immediately and
+    batches linger up to ``flush_interval``; buffered rows are lost on a
+    crash.
+
+    Batches use a multi-row ``INSERT`` (executemany) or ``COPY`` on
+    PostgreSQL via psycopg 3. With ``payload_codec`` set, payloads go to
+    the compressed ``event_payloads`` side table in the same transaction;
+    with ``rollups`` the hourly/daily rollup counters are updated there too.
+    With ``dedup_keys`` each row's ``(repository, commit_sha)`` goes into
+    ``event_keys`` first, which keeps duplicates out once ``events`` is
+    partitioned and its own unique key includes ``created_at``. If a batch
+    violates a constraint, its rows are retried one by one so only the
+    offending rows fail.
+    """
+
+    def __init__(
+        self,
+        engine_factory: Callable[[], Engine],
+        table: Optional[Table] = None,
+        max_batch: int = 500,
+        flush_interval: float = 0.05,
+        durability: str = "sync",
+        max_buffered: int = 10000,
+        use_copy: bool = True,
+        payload_codec: Optional[str] = None,
+        rollups: bool = False,
+        dedup_keys: bool = False,
+    ):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"durability must be one of {DURABILITY_MODES}")
+        self.engine_factory = engine_factory
+        self._table = table
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.durability = durability
+        self.max_buffered = max_buffered
+        self.use_copy = use_copy
+        self.payload_codec = resolve_codec(payload_codec) if payload_codec else None
+        self.rollups = rollups
+        self.dedup_keys = dedup_keys
+
+        self.rows_written = 0
+        self.rows_failed = 0
+        self.batches = 0
+
+        self._pending: Deque[Pending] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def table(self) -> Table:
+        if self._table is None:
+            self._table = _events_table()
+        return self._table
+
+    def submit(self, row: Dict[str, Any]) -> Future:
+        """Buffer one row; the future resolves when its batch is committed."""
+        future: Future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Event write buffer is closed")
+            self._ensure_started()
+            # Backpressure: wait for the flusher instead of growing unbounded
+            while len(self._pending) >= self.max_buffered:
+                self._cond.wait()
+            self._pending.append((row, future))
+            # Wake the flusher to start the batch timer, or early when full
+            if len(self._pending) in (1, self.max_batch):
+                self._cond.notify_all()
+        return future
+
+    def write(self, row: Dict[str, Any]) -> None:
+        """Persist ``row`` according to the configured durability."""
+        future = self.submit(row)
+        if self.durability == "sync":
+            future.result()
+
+    def flush(self) -> int:
+        """Write everything buffered now; returns the number of rows."""
+        written = 0
+        while True:
+            batch = self._take(self.max_batch)
+            if not batch:
+                return written
+            self._write_batch(batch)
+            written += len(batch)
+
+    def close(self) -> None:
+        """Flush remaining rows and stop the flusher thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=30)
+        self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "buffered": len(self._pending),
+                "rows_written": self.rows_written,
+                "rows_failed": self.rows_failed,
+                "batches": self.batches,
+            }
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="event-write-buffer", daemon=True
+            )
+            self._thread.start()
+
+    def _take(self, limit: int) -> List[Pending]:
+        with self._cond:
+            batch = [
+                self._pending.popleft() for _ in range(min(limit, len(self._pending)))
+            ]
+            if batch:
+                self._cond.notify_all()
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # Async writers nobody waits on may linger up to flush_interval
+                # for a fuller batch; sync writers are flushed at once and the
+                # next batch fills while this one commits (group commit)
+                linger = self.flush_interval if self.durability == "async" else 0
+                deadline = time.monotonic() + linger
+                while len(self._pending) < self.max_batch and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            batch = self._take(self.max_batch)
+            if batch:
+                self._write_batch(batch)
+
+    def _write_batch(self, batch: List[Pending]) -> None:
+        rows = [row for row, _ in batch]
+        try:
+            engine = self.engine_factory()
+            with engine.begin() as connection:
+                self._insert(connection, rows)
+        except IntegrityError:
+            self._write_rows_individually(batch, rows)
+            return
+        except Exception as exc:
+            logger.error("Failed to write %d events: %s", len(batch), exc)
+            self._fail(batch, exc)
+            return
+
+        with self._cond:
+            self.rows_written += len(batch)
+            self.batches += 1
+        for _, future in batch:
+            future.set_result(None)
+
+    def _write_rows_individually(
+        self, batch: List[Pending], rows: List[Dict[str, Any]]
+    ) -> None:
+        engine = self.engine_factory()
+        for (_, future), row in zip(batch, rows):
+            try:
+                with engine.begin() as connection:
+                    self._insert(connection, [row])
+            except Exception as exc:
+                self._fail([(row, future)], exc)
+            else:
+                with self._cond:
+                    self.rows_written += 1
+                future.set_result(None)
+        with self._cond:
+            self.batches += 1
+
+    def _fail(self, batch: List[Pending], exc: Exception) -> None:
+        with self._cond:
+            self.rows_failed += len(batch)
+        for _, future in batch:
+            future.set_exception(exc)
+        if self.durability == "async":
+            logger.warning("Dropped %d buffered events: %s", len(batch), exc)
+
+    def _insert(self, connection, rows: List[Dict[str, Any]]) -> None:
+        payload_rows = None
+        if self.payload_codec is not None:
+            # Stamp created_at first so the payload expires with its event
+            rows = _normalize(self.table, rows)
+            split = [split_event_row(row, self.payload_codec) for row in rows]
+            rows = [event for event, _ in split]
+            payload_rows = [payload for _, payload in split]
+
+        rows = _normalize(self.table, rows)
+        if self.dedup_keys:
+            connection.execute(
+                insert(EventKey.__table__),
+                [
+                    {
+                        "repository": row["repository"],
+                        "commit_sha": row["commit_sha"],
+                        "created_at": row["created_at"],
+                    }
+                    for row in rows
+                ],
+            )
+        if self.use_copy and _supports_copy(connection):
+            _copy_rows(connection, self.table, rows)
+        else:
+            connection.execute(insert(self.table), rows)
+        if payload_rows:
+            connection.execute(insert(EventPayload.__table__), payload_rows)
+        if self.rollups:
+            apply_rollups(connection, rows)
+
+
+def _normalize(table: Table, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Give every row the same keys (executemany and COPY require it)."""
+    keys = {key for row in rows for key in row} | {"created_at"}
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    defaults: Dict[str, Any] = {"created_at": now}
+    for column in table.columns:
+        default = column.default
+        if column.name in keys and default is not None and default.is_scalar:
+            defaults[column.name] = default.arg
+    return [{key: row.get(key, defaults.get(key)) for key in keys} for row in rows]
+
+
+def _supports_copy(connection) -> bool:
+    return (
+        connection.dialect.name == "postgresql"
+        and connection.dialect.driver == "psycopg"
+    )
+
+
+def _copy_rows(connection, table: Table, rows: List[Dict[str, Any]]) -> None:
+    """``COPY ... FROM STDIN`` through psycopg 3 (binary-safe, one round trip)."""
+    columns = [column.name for column in table.columns if column.name in rows[0]]
+    statement = "COPY {} ({}) FROM STDIN".format(
+        table.name, ", ".join(f'"{name}"' for name in columns)
+    )
+    cursor = connection.connection.driver_connection.cursor()
+    with cursor.copy(statement) as copy:
+        for row in rows:
+            copy.write_row([row.get(name) for name in columns])
+
+
+_event_writer: Optional[EventWriteBuffer] = None
+_event_writer_lock = threading.Lock()
+
+
+def get_event_writer() -> EventWriteBuffer:
+    """Process-wide event write buffer configured from settings."""
+    global _event_writer
+    with _event_writer_lock:
+        if _event_writer is None:
+            from shared.config.database import get_sync_engine
+            from shared.config.settings import get_settings
+
+            settings = get_settings()
+            _event_writer = EventWriteBuffer(
+                get_sync_engine,
+                max_batch=settings.event_write_batch_size,
+                flush_interval=settings.event_write_flush_interval_ms / 1000,
+                durability=settings.event_write_durability,
+                max_buffered=settings.event_write_max_buffered,
+                use_copy=settings.event_write_use_copy,
+                payload_codec=(
+                    settings.event_payload_codec
+                    if settings.event_payload_storage == "compressed"
+                    else None
+                ),
+                rollups=settings.event_rollups_enabled,
+                dedup_keys=settings.event_partitioning_enabled,
+            )
+        return _event_writer
+
+
+def close_event_writer() -> None:
+    """Flush and release the process-wide buffer (shutdown)."""
+    global _event_writer
+    with _event_writer_lock:
+        writer, _event_writer = _event_writer, None
+    if writer is not None:
+        writer.close()
+
+
+# Celery workers have no lifespan hook; flush whatever is buffered at exit
+atexit.register(close_event_writer)
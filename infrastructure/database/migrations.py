@@ -0,0 +1,339 @@
+"""Versioned schema migrations with a fast "already current" path.
+
+Applied versions are recorded in ``schema_migrations``. ``run_migrations``
+first reads the applied versions with a single query and returns when the
+schema is current, so replicas booting against a migrated database take no
+locks and touch no catalog. Otherwise one process takes a PostgreSQL
+advisory lock, re-checks, and applies the pending migrations; the others
+wait for the lock and then find nothing to do.
+
+Migrations marked ``transactional=False`` run in autocommit mode so they
+can use ``CREATE INDEX CONCURRENTLY`` (see ``create_index``). They must be
+idempotent: their version is recorded only after they finish, and a crash
+in between re-runs them.
+
+Migrations marked ``data=True`` rewrite rows and never run at startup:
+``run_data_migrations`` (``scripts/migrate_database.py --data``) runs them
+on request, every time, so they must be idempotent too. They get a
+connection outside ``begin()`` and may commit per batch.
+
+To change the schema, append a ``Migration`` with the next version number
+to ``MIGRATIONS``; never edit or reorder applied ones. Migration functions
+work on the connection they are passed.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, Set
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_TABLE = "schema_migrations"
+
+# pg_advisory_lock key: any constant shared by every replica ("cpmigrat")
+ADVISORY_LOCK_KEY = 0x63706D6967726174
+
+_local_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    apply: Callable[[Connection], None]
+    transactional: bool = True
+    data: bool = False
+
+
+def create_index(
+    connection: Connection, name: str, table: str, columns: str, unique: bool = False
+) -> None:
+    """``CREATE INDEX IF NOT EXISTS``, concurrently on PostgreSQL.
+
+    A concurrent build that failed earlier leaves an INVALID index behind;
+    it is dropped and rebuilt. Concurrent builds need an autocommit
+    connection, i.e. a ``transactional=False`` migration.
+    """
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    if connection.dialect.name != "postgresql":
+        connection.execute(
+            text(f"CREATE {kind} IF NOT EXISTS {name} ON {table} ({columns})")
+        )
+        return
+
+    invalid = connection.execute(
+        text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ),
+        {"name": name},
+    ).scalar()
+    if invalid:
+        connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+
+    # Partitioned parents do not support CONCURRENTLY; their partitions are
+    # indexed as part of the statement instead
+    partitioned = connection.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table p "
+            "JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = :table AND pg_table_is_visible(c.oid)"
+        ),
+        {"table": table},
+    ).scalar()
+    concurrently = "" if partitioned else " CONCURRENTLY"
+    connection.execute(
+        text(f"CREATE {kind}{concurrently} IF NOT EXISTS {name} ON {table} ({columns})")
+    )
+
+
+# Migrations -----------------------------------------------------------------
+
+
+def _create_local_tables(connection: Connection) -> None:
+    """Tables owned by this repository plus the package ``events`` table."""
+    from yeonjae_universal_data_storage.models import Event
+
+    # Model modules register their tables on Base.metadata when imported
+    import infrastructure.aws.blob_index  # noqa: F401
+    import infrastructure.database.event_partitions  # noqa: F401
+    import infrastructure.database.event_payloads  # noqa: F401
+    import infrastructure.database.event_rollups  # noqa: F401
+    import modules.push_status.models  # noqa: F401
+    import modules.webhook_ingest.models  # noqa: F401
+    from shared.config.database import Base
+
+    Base.metadata.create_all(bind=connection)
+    Event.__table__.create(bind=connection, checkfirst=True)
+
+
+def _create_event_indexes(connection: Connection) -> None:
+    from .event_partitions import ensure_event_indexes
+
+    ensure_event_indexes(connection)
+
+
+def _move_inline_payloads(connection: Connection) -> None:
+    from shared.config.settings import get_settings
+
+    from .event_payloads import migrate_inline_payloads
+
+    settings = get_settings()
+    # Package readers (data_retriever) still parse events.payload directly
+    if settings.event_payload_storage != "compressed":
+        logger.info("EVENT_PAYLOAD_STORAGE=inline; events.payload left in place")
+        return
+    migrate_inline_payloads(connection, codec=settings.event_payload_codec)
+
+
+def _partition_events(connection: Connection) -> None:
+    from shared.config.settings import get_settings
+
+    from .event_partitions import convert_events_to_partitioned
+
+    settings = get_settings()
+    if settings.event_partitioning_enabled:
+        convert_events_to_partitioned(
+            connection, months_ahead=settings.event_partition_months_ahead
+        )
+
+
+def _backfill_rollups(connection: Connection) -> None:
+    from .event_rollups import EventRollupDaily, rebuild_rollups
+
+    # Rollups already maintained by the writer may count expired events
+    if connection.execute(
+        text(f"SELECT 1 FROM {EventRollupDaily.__tablename__}")
+    ).first():
+        return
+    rebuild_rollups(connection)
+
+
+def _create_event_keys(connection: Connection) -> None:
+    from .event_partitions import EventKey
+
+    EventKey.__table__.create(bind=connection, checkfirst=True)
+
+
+def _add_delivery_claim_state(connection: Connection) -> None:
+    """``state``/``owner`` on claims made before in-flight takeover existed."""
+    columns = {
+        column["name"]
+        for column in inspect(connection).get_columns("webhook_deliveries")
+    }
+    if "state" not in columns:
+        connection.execute(
+            text(
+                "ALTER TABLE webhook_deliveries "
+                "ADD COLUMN state VARCHAR(16) NOT NULL DEFAULT 'done'"
+            )
+        )
+    if "owner" not in columns:
+        connection.execute(
+            text("ALTER TABLE webhook_deliveries ADD COLUMN owner VARCHAR(128)")
+        )
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "create tables", _create_local_tables),
+    Migration(2, "events range and hot-column indexes", _create_event_indexes, False),
+    Migration(
+        3,
+        "move events.payload to event_payloads",
+        _move_inline_payloads,
+        transactional=False,
+        data=True,
+    ),
+    Migration(
+        4,
+        "partition events by month (PostgreSQL)",
+        _partition_events,
+        transactional=False,
+        data=True,
+    ),
+    Migration(
+        5, "backfill event rollups", _backfill_rollups, transactional=False, data=True
+    ),
+    Migration(6, "webhook_deliveries claim state", _add_delivery_claim_state),
+    Migration(7, "event_keys dedup guard", _create_event_keys),
+]
+
+
+# Runner ---------------------------------------------------------------------
+
+
+def _ensure_migrations_table(connection: Connection) -> None:
+    connection.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} ("
+            "version INTEGER PRIMARY KEY, "
+            "name VARCHAR(255) NOT NULL, "
+            "applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+        )
+    )
+
+
+def current_version(engine: Engine) -> int:
+    """Highest applied version (0 for an unmigrated database)."""
+    return max(applied_versions(engine), default=0)
+
+
+def applied_versions(engine: Engine) -> Set[int]:
+    with engine.connect() as connection:
+        if not inspect(connection).has_table(MIGRATIONS_TABLE):
+            return set()
+        return set(
+            connection.execute(
+                text(f"SELECT version FROM {MIGRATIONS_TABLE}")
+            ).scalars()
+        )
+
+
+def _record(connection: Connection, migration: Migration) -> None:
+    connection.execute(
+        text(
+            f"INSERT INTO {MIGRATIONS_TABLE} (version, name) VALUES (:version, :name)"
+        ),
+        {"version": migration.version, "name": migration.name},
+    )
+
+
+def _apply(engine: Engine, migration: Migration, record: bool = True) -> None:
+    logger.info("Applying migration %04d: %s", migration.version, migration.name)
+    if migration.transactional:
+        with engine.begin() as connection:
+            migration.apply(connection)
+            _record(connection, migration)
+        return
+
+    with engine.connect() as connection:
+        if not migration.data:
+            connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+        migration.apply(connection)
+        connection.commit()
+    if record:
+        with engine.begin() as connection:
+            _record(connection, migration)
+
+
+def _apply_pending(engine: Engine, migrations: Sequence[Migration]) -> List[int]:
+    with engine.begin() as connection:
+        _ensure_migrations_table(connection)
+    # Re-read under the lock: another replica may have just finished
+    applied = applied_versions(engine)
+    ran = []
+    for migration in migrations:
+        if migration.data or migration.version not in applied:
+            _apply(engine, migration, record=migration.version not in applied)
+            ran.append(migration.version)
+    return ran
+
+
+def _sorted(migrations: Optional[Sequence[Migration]]) -> List[Migration]:
+    return sorted(
+        MIGRATIONS if migrations is None else migrations,
+        key=lambda migration: migration.version,
+    )
+
+
+def run_migrations(
+    engine: Engine, migrations: Optional[Sequence[Migration]] = None
+) -> List[int]:
+    """Apply pending schema migrations once across replicas (startup).
+
+    Data migrations are skipped; returns the applied versions.
+    """
+    migrations = _sorted(migrations)
+    schema = [migration for migration in migrations if not migration.data]
+    applied = applied_versions(engine)
+    pending_data = [
+        migration.version
+        for migration in migrations
+        if migration.data and migration.version not in applied
+    ]
+    if pending_data:
+        logger.info(
+            "Data migrations %s not applied; run scripts/migrate_database.py --data",
+            pending_data,
+        )
+    if {migration.version for migration in schema} <= applied:
+        return []
+    return _with_lock(engine, lambda: _apply_pending(engine, schema))
+
+
+def run_data_migrations(
+    engine: Engine, migrations: Optional[Sequence[Migration]] = None
+) -> List[int]:
+    """Run every data migration (opt-in command); returns the versions run."""
+    data = [migration for migration in _sorted(migrations) if migration.data]
+    if not data:
+        return []
+    return _with_lock(engine, lambda: _apply_pending(engine, data))
+
+
+def _with_lock(engine: Engine, run: Callable[[], List[int]]) -> List[int]:
+    if engine.dialect.name != "postgresql":
+        with _local_lock:
+            return run()
+
+    # Session-level lock on an autocommit connection: an idle-in-transaction
+    # holder would make CREATE INDEX CONCURRENTLY wait for it forever
+    with engine.connect() as lock_connection:
+        lock_connection = lock_connection.execution_options(
+            isolation_level="AUTOCOMMIT"
+        )
+        lock_connection.execute(
+            text("SELECT pg_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY}
+        )
+        try:
+            return run()
+        finally:
+            lock_connection.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY}
+            )
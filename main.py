@@ -1,18 +1,32 @@
 from __future__ import annotations
+import asyncio
 import logging
+import threading
+import time
 from contextlib import asynccontextmanager
-from importlib import import_module
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from shared.config.database import create_tables
+from fastapi.responses import PlainTextResponse
 from shared.config.settings import get_settings
-from shared.utils.logging import setup_detailed_logging
+from shared.utils.logging import (
+    CorrelationIdMiddleware,
+    get_log_queue_stats,
+    setup_detailed_logging,
+    shutdown_logging,
+)
+from shared.utils.metrics import latency_metrics, render_counter
+from shared.utils.tracing import shutdown_tracing
 
-"""Main FastAPI application with modular router auto-discovery."""
+"""Main FastAPI application with modular router auto-discovery.
 
-# Import models to register them with SQLAlchemy
-# Note: Models are now in PyPI packages
-# from modules.data_storage.models import Event
+Feature routers, their models and the webhook dedup middleware are loaded
+on the first request that may need them (see ``LazyFeatureMiddleware``);
+probes are answered without importing SQLAlchemy models, Celery or the
+package routers. Migrations register the models they create themselves.
+"""
+
+# Answered without loading feature routers (liveness/readiness, scraping)
+PROBE_PATHS = frozenset({"/", "/health", "/metrics"})
 
 # Configure detailed logging
 setup_detailed_logging()
@@ -25,22 +39,70 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("🚀 Starting Git Diff Monitor...")
 
-    # Create database tables
-    try:
-        await create_tables()
-        logger.info("✅ Database tables created/verified")
-    except Exception as exc:
-        logger.error("❌ Failed to create database tables: %s", exc)
+    settings = get_settings()
+
+    # Apply pending schema migrations (a single version check when current)
+    if settings.database_migrate_on_startup:
+        from infrastructure.database.migrations import run_migrations
+        from shared.config.database import get_sync_engine
+
+        try:
+            applied = await asyncio.to_thread(run_migrations, get_sync_engine())
+            logger.info("✅ Database schema current (applied: %s)", applied or "none")
+        except Exception as exc:
+            logger.error("❌ Failed to migrate database: %s", exc)
 
     # Log configuration
-    settings = get_settings()
     logger.info("📊 Database: %s", settings.database_url)
     logger.info("🔧 Celery: %s", settings.celery_broker_url)
 
+    # Start webhook ingest drainer (fast path)
+    drainer = None
+    if settings.webhook_ingest_enabled:
+        from modules.webhook_ingest.service import (
+            IngestDrainer,
+            get_deduplicator,
+            get_ingest_queue,
+        )
+
+        drainer = IngestDrainer(
+            get_ingest_queue(),
+            batch_size=settings.webhook_ingest_batch_size,
+            poll_interval=settings.webhook_ingest_poll_interval_ms / 1000,
+            deduplicator=get_deduplicator() if settings.webhook_dedup_enabled else None,
+        )
+        drainer.start()
+
     yield
 
     # Shutdown
     logger.info("🛑 Shutting down Git Diff Monitor...")
+    try:
+        if drainer is not None:
+            drainer.stop()
+            logger.info("✅ Webhook ingest drainer stopped")
+
+        # Let in-process (eager mode) tasks finish before pools are disposed
+        from shared.config.celery_app import drain_inprocess_tasks
+
+        await asyncio.to_thread(drain_inprocess_tasks)
+
+        # Flush buffered event rows while the pools are still open
+        from infrastructure.database.event_writer import close_event_writer
+
+        await asyncio.to_thread(close_event_writer)
+        if settings.push_status_tracking_enabled:
+            from modules.push_status import flush_push_status
+
+            await asyncio.to_thread(flush_push_status)
+        from shared.config.database import dispose_engines
+
+        await dispose_engines()
+        logger.info("✅ Database connection pools disposed")
+    finally:
+        # Always flush queued log records, including errors from the steps above
+        shutdown_tracing()
+        shutdown_logging()
 
 
 def create_app() -> FastAPI:
@@ -62,38 +124,130 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
-    # Auto-discover and include module routers
-    _auto_include_routers(app)
+    settings = get_settings()
+
+    if settings.lazy_router_loading:
+        app.add_middleware(LazyFeatureMiddleware, fastapi_app=app)
+    else:
+        dedup = _dedup_middleware(settings)
+        if dedup is not None:
+            app.add_middleware(dedup[0], **dedup[1])
+        _include_feature_routers(app, settings)
+
+    # Per-push correlation ID (X-GitHub-Delivery) for logs and Celery tasks
+    app.add_middleware(CorrelationIdMiddleware)
+
+    # Prometheus metrics (module latency histograms)
+    app.add_api_route(
+        "/metrics", metrics_endpoint, methods=["GET"], include_in_schema=False
+    )
 
     return app
 
 
-def _auto_include_routers(app: FastAPI) -> None:
-    """Include routers from PyPI packages."""
+class LazyFeatureMiddleware:
+    """Load feature routers and middleware on the first non-probe request.
 
-    # List of PyPI packages that provide routers
-    pypi_routers = [
-        "yeonjae_universal_webhook_receiver.router",
-        # Add other PyPI package routers here as needed
-    ]
+    The imports run in a worker thread once; concurrent first requests wait
+    for the same load. Sits where the dedup middleware would be added, so
+    the middleware order matches eager loading.
+    """
 
-    for router_module_name in pypi_routers:
-        try:
-            # Import router from PyPI package
-            router_module = import_module(router_module_name)
+    def __init__(self, app, fastapi_app: FastAPI):
+        self.app = app
+        self.fastapi_app = fastapi_app
+        self.loaded = False
+        self._lock = threading.Lock()
 
-            if hasattr(router_module, "router"):
-                app.include_router(router_module.router)
-                logger.info("✅ Included router from %s", router_module_name)
-            else:
-                logger.warning("⚠️  No 'router' found in %s", router_module_name)
+    async def __call__(self, scope, receive, send):
+        if (
+            not self.loaded
+            and scope["type"] in ("http", "websocket")
+            and scope["path"] not in PROBE_PATHS
+        ):
+            await asyncio.to_thread(self._load)
+        await self.app(scope, receive, send)
+
+    def _load(self) -> None:
+        with self._lock:
+            if self.loaded:
+                return
+            started = time.perf_counter()
+            settings = get_settings()
+            dedup = _dedup_middleware(settings)
+            if dedup is not None:
+                self.app = dedup[0](self.app, **dedup[1])
+            _include_feature_routers(self.fastapi_app, settings)
+            self.loaded = True
+            logger.info(
+                "✅ Feature routers loaded in %.0f ms",
+                (time.perf_counter() - started) * 1000,
+            )
+
+
+def _dedup_middleware(settings):
+    """Drop GitHub redeliveries before the package webhook router parses them.
+
+    The ingest fast path deduplicates in its own router and drainer.
+    """
+    if not settings.webhook_dedup_enabled or settings.webhook_ingest_enabled:
+        return None
+    from modules.webhook_ingest.dedup import DeliveryDedupMiddleware
+    from modules.webhook_ingest.service import get_deduplicator
+
+    return DeliveryDedupMiddleware, {
+        "deduplicator": get_deduplicator(),
+        "secret": settings.github_webhook_secret,
+    }
+
+
+def _include_feature_routers(app: FastAPI, settings) -> None:
+    # Webhook ingest fast path takes precedence over the package router
+    if settings.webhook_ingest_enabled:
+        from modules.webhook_ingest.router import router as ingest_router
+
+        app.include_router(ingest_router)
+        logger.info("✅ Included webhook ingest fast path")
+
+    if settings.push_status_tracking_enabled:
+        from modules.push_status.router import router as push_status_router
+
+        app.include_router(push_status_router)
+
+    # Read API over processed pushes, mounted alongside the webhook router
+    if settings.event_query_enabled:
+        from modules.event_query.router import router as event_query_router
+
+        app.include_router(event_query_router)
+
+    # Auto-discover and include package routers
+    _auto_include_routers(app, settings)
+
+
+async def metrics_endpoint() -> PlainTextResponse:
+    """Expose in-process metrics in Prometheus text format."""
+    body = latency_metrics.render_prometheus() + render_counter(
+        "codeping_log_records_dropped_total",
+        "Log records dropped by the async log queue.",
+        get_log_queue_stats()["dropped"],
+    )
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+
+def _auto_include_routers(app: FastAPI, settings) -> None:
+    """Include routers from PyPI packages (``codeping.routers`` entry points)."""
+    from shared.config.plugins import get_router_plugins
+
+    for plugin in get_router_plugins(settings):
+        try:
+            router = plugin.load()
+            app.include_router(router)
+            logger.info("✅ Included router %s from %s", plugin.name, plugin.module)
 
         except ImportError as exc:
-            logger.warning("⚠️  Failed to import %s: %s", router_module_name, exc)
+            logger.warning("⚠️  Failed to import %s: %s", plugin.value, exc)
         except Exception as exc:
-            logger.error(
-                "❌ Failed to include router from %s: %s", router_module_name, exc
-            )
+            logger.error("❌ Failed to include router %s: %s", plugin.name, exc)
 
 
 # Create app instance
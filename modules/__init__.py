@@ -0,0 +1 @@
+"""Local application modules (not yet published as PyPI packages)."""
@@ -0,0 +1,21 @@
+"""Read API over processed pushes (the ``events`` table).
+
+Keyset pagination on ``(created_at, id)`` and summary projections keep
+deep pages and large exports cheap; payload JSON is loaded only on request.
+"""
+
+from .service import (
+    decode_cursor,
+    encode_cursor,
+    list_events,
+    stream_events,
+    summarize_events,
+)
+
+__all__ = [
+    "decode_cursor",
+    "encode_cursor",
+    "list_events",
+    "stream_events",
+    "summarize_events",
+]
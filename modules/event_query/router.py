@@ -0,0 +1,97 @@
+"""Read endpoints over processed pushes."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Optional
+
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from shared.config.settings import get_settings
+
+from .service import list_events, stream_events, summarize_events
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+@router.get("")
+async def read_events(
+    repository: Optional[str] = None,
+    pusher: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=50, ge=1),
+    include_payload: bool = False,
+) -> dict:
+    """Newest-first page of events; pass ``next_cursor`` back for the next page."""
+    limit = min(limit, get_settings().event_query_max_page_size)
+    try:
+        return await list_events(
+            repository=repository,
+            pusher=pusher,
+            since=since,
+            until=until,
+            cursor=cursor,
+            limit=limit,
+            include_payload=include_payload,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+
+@router.get("/summary")
+async def read_event_summary(
+    granularity: str = "daily",
+    group_by: str = "repository",
+    repository: Optional[str] = None,
+    pusher: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> dict:
+    """Pushes, commits and line/file counts per repository or pusher (rollups)."""
+    try:
+        items = await summarize_events(
+            granularity=granularity,
+            group_by=group_by,
+            repository=repository,
+            pusher=pusher,
+            since=since,
+            until=until,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    return {"granularity": granularity, "group_by": group_by, "items": items}
+
+
+@router.get("/export")
+async def export_events(
+    repository: Optional[str] = None,
+    pusher: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    include_payload: bool = False,
+) -> StreamingResponse:
+    """Stream every matching event as newline-delimited JSON."""
+    events = stream_events(
+        repository=repository,
+        pusher=pusher,
+        since=since,
+        until=until,
+        chunk_size=get_settings().event_query_export_chunk_size,
+        include_payload=include_payload,
+    )
+
+    async def lines() -> AsyncIterator[bytes]:
+        async for event in events:
+            yield json.dumps(event, default=_json_default).encode() + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
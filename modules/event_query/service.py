@@ -0,0 +1,219 @@
+"""Keyset-paginated queries over ``events`` and reports over its rollups."""
+
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy import Select, and_, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from yeonjae_universal_data_storage.models import Event
+
+from infrastructure.database.event_payloads import EventPayload, decompress_payload
+from infrastructure.database.event_rollups import COUNTERS, ROLLUP_TABLES
+from shared.config.database import get_async_session
+
+_events = Event.__table__
+_payloads = EventPayload.__table__
+
+# Everything except the payload JSON and the raw diff blob
+SUMMARY_COLUMNS = (
+    _events.c.id,
+    _events.c.repository,
+    _events.c.commit_sha,
+    _events.c.ref,
+    _events.c.pusher,
+    _events.c.author_name,
+    _events.c.commit_count,
+    _events.c.files_changed,
+    _events.c.added_lines,
+    _events.c.deleted_lines,
+    _events.c.timestamp_utc,
+    _events.c.created_at,
+)
+
+Cursor = Tuple[datetime, int]
+
+
+def encode_cursor(created_at: datetime, event_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), event_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """Inverse of ``encode_cursor``; raises ``ValueError`` when malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, event_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(event_id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from exc
+
+
+def _build_query(
+    repository: Optional[str],
+    pusher: Optional[str],
+    since: Optional[datetime],
+    until: Optional[datetime],
+    after: Optional[Cursor],
+    limit: int,
+    include_payload: bool,
+) -> Select:
+    columns = list(SUMMARY_COLUMNS)
+    if include_payload:
+        columns += [
+            _events.c.payload.label("inline_payload"),
+            _payloads.c.codec,
+            _payloads.c.payload.label("stored_payload"),
+        ]
+
+    query = select(*columns)
+    if include_payload:
+        query = query.select_from(
+            _events.outerjoin(
+                _payloads,
+                and_(
+                    _payloads.c.repository == _events.c.repository,
+                    _payloads.c.commit_sha == _events.c.commit_sha,
+                ),
+            )
+        )
+
+    # Equality filters first so (repository, created_at) / pusher indexes apply
+    if repository:
+        query = query.where(_events.c.repository == repository)
+    if pusher:
+        query = query.where(_events.c.pusher == pusher)
+    if since:
+        query = query.where(_events.c.created_at >= since)
+    if until:
+        query = query.where(_events.c.created_at < until)
+    if after:
+        query = query.where(tuple_(_events.c.created_at, _events.c.id) < after)
+
+    return query.order_by(_events.c.created_at.desc(), _events.c.id.desc()).limit(limit)
+
+
+def _to_item(row: Any, include_payload: bool) -> Dict[str, Any]:
+    item = {column.name: row._mapping[column.name] for column in SUMMARY_COLUMNS}
+    if include_payload:
+        if row.stored_payload is not None:
+            item["payload"] = json.loads(
+                decompress_payload(row.stored_payload, row.codec)
+            )
+        else:
+            item["payload"] = (
+                json.loads(row.inline_payload) if row.inline_payload else None
+            )
+    return item
+
+
+async def _fetch(
+    session: AsyncSession, limit: int, include_payload: bool, **filters: Any
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    rows = (
+        await session.execute(
+            _build_query(limit=limit + 1, include_payload=include_payload, **filters)
+        )
+    ).all()
+    items = [_to_item(row, include_payload) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last["created_at"], last["id"])
+    return items, next_cursor
+
+
+async def list_events(
+    repository: Optional[str] = None,
+    pusher: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    include_payload: bool = False,
+) -> Dict[str, Any]:
+    """One page of events, newest first, plus the cursor of the next page."""
+    async with get_async_session() as session:
+        items, next_cursor = await _fetch(
+            session,
+            limit,
+            include_payload,
+            repository=repository,
+            pusher=pusher,
+            since=since,
+            until=until,
+            after=decode_cursor(cursor) if cursor else None,
+        )
+    return {"items": items, "next_cursor": next_cursor}
+
+
+async def stream_events(
+    repository: Optional[str] = None,
+    pusher: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    chunk_size: int = 1000,
+    include_payload: bool = False,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield every matching event, walking keyset pages of ``chunk_size``.
+
+    Each chunk is its own short query, so an export never holds a
+    connection or a server-side cursor open while the client reads.
+    """
+    after: Optional[Cursor] = None
+    while True:
+        async with get_async_session() as session:
+            items, next_cursor = await _fetch(
+                session,
+                chunk_size,
+                include_payload,
+                repository=repository,
+                pusher=pusher,
+                since=since,
+                until=until,
+                after=after,
+            )
+        for item in items:
+            yield item
+        if next_cursor is None:
+            return
+        after = (items[-1]["created_at"], items[-1]["id"])
+
+
+async def summarize_events(
+    granularity: str = "daily",
+    group_by: str = "repository",
+    repository: Optional[str] = None,
+    pusher: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """Totals per repository or pusher, read from the rollup tables.
+
+    The cost depends on the number of buckets in range, not on the size of
+    ``events``; buckets are selected by their start time.
+    """
+    if granularity not in ROLLUP_TABLES:
+        raise ValueError(f"granularity must be one of {tuple(ROLLUP_TABLES)}")
+    if group_by not in ("repository", "pusher"):
+        raise ValueError("group_by must be 'repository' or 'pusher'")
+
+    table = ROLLUP_TABLES[granularity]
+    group = table.c[group_by]
+    query = select(group, *(func.sum(table.c[name]).label(name) for name in COUNTERS))
+    if repository:
+        query = query.where(table.c.repository == repository)
+    if pusher:
+        query = query.where(table.c.pusher == pusher)
+    if since:
+        query = query.where(table.c.bucket_start >= since)
+    if until:
+        query = query.where(table.c.bucket_start < until)
+    query = query.group_by(group).order_by(func.sum(table.c.pushes).desc(), group)
+
+    async with get_async_session() as session:
+        rows = (await session.execute(query)).mappings().all()
+    return [dict(row) for row in rows]
@@ -0,0 +1,9 @@
+"""Local storage path of the webhook pipeline task.
+
+Processed pushes are inserted into ``events`` through the write-behind
+``EventWriteBuffer`` instead of one session commit per push.
+"""
+
+from .service import EventStorageService
+
+__all__ = ["EventStorageService"]
@@ -0,0 +1,143 @@
+"""Store processed pushes as ``events`` rows through the write buffer."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import select
+
+from infrastructure.database.event_writer import EventWriteBuffer, get_event_writer
+
+logger = logging.getLogger(__name__)
+
+# Compressed diffs above this go to S3 when it is configured (as before)
+GZIP_THRESHOLD = 256 * 1024
+
+_S3_VARIABLES = ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_S3_BUCKET")
+
+_s3_client: Any = None
+_s3_client_lock = threading.Lock()
+
+
+def _get_s3_client() -> Any:
+    """Process-wide S3 client, or None when S3 is not configured."""
+    global _s3_client
+    if not all(os.environ.get(name) for name in _S3_VARIABLES):
+        return None
+    with _s3_client_lock:
+        if _s3_client is None:
+            from infrastructure.aws.s3_client import S3Client
+
+            _s3_client = S3Client()
+        return _s3_client
+
+
+def build_event_row(
+    payload: Dict[str, Any],
+    headers: Dict[str, str],
+    diff_data: Any,
+    diff_patch: Optional[bytes] = None,
+    diff_url: Optional[str] = None,
+) -> Dict[str, Any]:
+    """The ``events`` row for one push (same columns as the legacy service)."""
+    pusher = payload.get("pusher") or {}
+    github = "x-github-event" in {key.lower() for key in headers}
+    return {
+        "platform": "github" if github else "gitlab",
+        "repository": diff_data.repository,
+        "commit_sha": diff_data.commit_sha,
+        "author_name": pusher.get("name"),
+        "author_email": pusher.get("email"),
+        "timestamp_utc": None,
+        "ref": payload.get("ref"),
+        "pusher": pusher.get("name", "unknown"),
+        "commit_count": len(payload.get("commits", [])),
+        "diff_patch": diff_patch,
+        "diff_url": diff_url,
+        "added_lines": diff_data.added_lines,
+        "deleted_lines": diff_data.deleted_lines,
+        "files_changed": diff_data.files_changed,
+        "payload": json.dumps(payload),
+    }
+
+
+class EventStorageService:
+    """Drop-in for ``LegacyDataStorageService`` in the webhook task.
+
+    The diff is gzip-compressed and kept inline up to ``GZIP_THRESHOLD``;
+    larger diffs are uploaded (deduplicated) to S3 when it is configured;
+    a redelivered push does not add a ``diff_blobs`` reference.
+    The row then goes to the process-wide ``EventWriteBuffer``, so
+    concurrent tasks share multi-row inserts; with ``sync`` durability a
+    duplicate ``(repository, commit_sha)`` still raises here.
+    """
+
+    def __init__(
+        self, writer: Optional[EventWriteBuffer] = None, s3_client: Any = None
+    ):
+        self.writer = writer
+        self.s3_client = s3_client
+
+    def store_event_with_diff(
+        self, payload: Dict[str, Any], headers: Dict[str, str], diff_data: Any
+    ) -> None:
+        writer = self.writer or get_event_writer()
+        diff_patch, diff_url = self._store_diff(writer, diff_data)
+        row = build_event_row(payload, headers, diff_data, diff_patch, diff_url)
+        writer.write(row)
+        logger.info(
+            "Stored event %s/%s: diff=%s added=%s deleted=%s files=%s",
+            diff_data.repository,
+            diff_data.commit_sha,
+            "s3" if diff_url else ("db" if diff_patch else "none"),
+            diff_data.added_lines or 0,
+            diff_data.deleted_lines or 0,
+            diff_data.files_changed or 0,
+        )
+
+    def _store_diff(
+        self, writer: EventWriteBuffer, diff_data: Any
+    ) -> Tuple[Optional[bytes], Optional[str]]:
+        if not diff_data.diff_content:
+            return None, None
+        # mtime=0: the S3 key hashes these bytes, so equal diffs must match
+        compressed = gzip.compress(diff_data.diff_content, mtime=0)
+        if len(compressed) <= GZIP_THRESHOLD:
+            return compressed, None
+
+        s3_client = self.s3_client or _get_s3_client()
+        if s3_client is None:
+            logger.warning(
+                "Large diff stored in DB (S3 not configured): %d bytes",
+                len(compressed),
+            )
+            return compressed, None
+        # A redelivery's insert is rejected as a duplicate: it adds no reference
+        result = asyncio.run(
+            s3_client.upload_diff_deduplicated(
+                compressed, add_reference=not _is_stored(writer, diff_data)
+            )
+        )
+        return None, result.url
+
+
+def _is_stored(writer: EventWriteBuffer, diff_data: Any) -> bool:
+    table = writer.table
+    with writer.engine_factory().connect() as connection:
+        return (
+            connection.execute(
+                select(table.c.id)
+                .where(
+                    table.c.repository == diff_data.repository,
+                    table.c.commit_sha == diff_data.commit_sha,
+                )
+                .limit(1)
+            ).first()
+            is not None
+        )
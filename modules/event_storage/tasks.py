@@ -0,0 +1,23 @@
+"""Webhook pipeline task bound to the local event storage path.
+
+``process_webhook_async`` from ``yeonjae_universal_webhook_receiver`` looks
+up ``LegacyDataStorageService`` in its module globals on every run and
+commits one session per push. Importing this module (the ``event_storage``
+task plugin, and the in-process task registry) swaps in
+``EventStorageService`` so events go through the write buffer.
+"""
+
+from __future__ import annotations
+
+from yeonjae_universal_webhook_receiver import tasks as receiver_tasks
+
+from shared.config.settings import get_settings
+
+from .service import EventStorageService
+
+if get_settings().event_write_buffer_enabled:
+    receiver_tasks.LegacyDataStorageService = EventStorageService
+
+process_webhook_async = receiver_tasks.process_webhook_async
+
+__all__ = ["process_webhook_async"]
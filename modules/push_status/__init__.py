@@ -0,0 +1,10 @@
+"""Push processing status: one cheap row per webhook delivery.
+
+Celery task results are ignored by default; this table is what tracks
+whether a push was queued, is processing, or finished.
+"""
+
+from .models import PushStatus
+from .service import flush_push_status, get_push_status, record_push_status
+
+__all__ = ["PushStatus", "flush_push_status", "get_push_status", "record_push_status"]
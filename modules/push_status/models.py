@@ -0,0 +1,41 @@
+"""Database models for push status tracking."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from shared.config.database import Base
+
+QUEUED = "queued"
+PROCESSING = "processing"
+RETRYING = "retrying"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class PushStatus(Base):
+    """Latest processing state of one push, keyed by delivery ID."""
+
+    __tablename__ = "push_status"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    delivery_id: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)
+    task_id: Mapped[Optional[str]] = mapped_column(String(64))
+    repository: Mapped[Optional[str]] = mapped_column(String(255), index=True)
+    ref: Mapped[Optional[str]] = mapped_column(String(255))
+    head_sha: Mapped[Optional[str]] = mapped_column(String(40))
+    status: Mapped[str] = mapped_column(String(16), nullable=False)
+    error: Mapped[Optional[str]] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"<PushStatus(delivery={self.delivery_id}, status={self.status})>"
@@ -0,0 +1,21 @@
+"""Push status lookup endpoint."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+from .service import get_push_status
+
+router = APIRouter(prefix="/pushes", tags=["pushes"])
+
+
+@router.get("/{delivery_id}/status")
+async def read_push_status(delivery_id: str) -> dict:
+    """Processing state of one push (queued/processing/retrying/succeeded/failed)."""
+    push_status = await run_in_threadpool(get_push_status, delivery_id)
+    if push_status is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Unknown delivery"
+        )
+    return push_status
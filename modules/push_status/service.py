@@ -0,0 +1,235 @@
+"""Record and read push processing status.
+
+Writes from the publish path (and all eager-mode events) go through a
+single background writer thread, so tracking adds no database round trip
+to ``send_task``; the writer keeps their order, and ``flush_push_status``
+waits for it.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from shared.config.database import get_session
+
+from .models import FAILED, PROCESSING, QUEUED, RETRYING, SUCCEEDED, PushStatus
+
+logger = logging.getLogger(__name__)
+
+PROCESS_WEBHOOK_TASK = "webhook_receiver.process_webhook_async"
+# Set by the webhook ingest coalescer on merged tasks
+COALESCED_DELIVERIES_HEADER = "x-codeping-coalesced-deliveries"
+
+_ERROR_LIMIT = 2000
+
+_writer: Optional[ThreadPoolExecutor] = None
+_writer_lock = threading.Lock()
+
+
+def record_push_status(delivery_id: str, status: str, **fields: Any) -> None:
+    """Upsert the status row for ``delivery_id``.
+
+    Tracking must never break the pipeline, so database errors are logged
+    and swallowed.
+    """
+    values = {key: value for key, value in fields.items() if value is not None}
+    if values.get("error"):
+        values["error"] = str(values["error"])[:_ERROR_LIMIT]
+
+    changed = (
+        update(PushStatus)
+        .where(PushStatus.delivery_id == delivery_id)
+        .values(status=status, updated_at=func.now(), **values)
+    )
+    if status == QUEUED:
+        # A late publish write must not rewind a task that already started
+        changed = changed.where(PushStatus.status.in_((QUEUED, RETRYING)))
+
+    try:
+        with get_session() as session:
+            if session.execute(changed).rowcount:
+                return
+            try:
+                with session.begin_nested():
+                    session.add(
+                        PushStatus(delivery_id=delivery_id, status=status, **values)
+                    )
+            except IntegrityError:
+                # Worker and publisher raced on the first write
+                session.execute(changed)
+    except SQLAlchemyError as exc:
+        logger.warning(
+            "Failed to record push status %s=%s: %s", delivery_id, status, exc
+        )
+
+
+def get_push_status(delivery_id: str) -> Optional[Dict[str, Any]]:
+    with get_session() as session:
+        row = session.scalar(
+            select(PushStatus).where(PushStatus.delivery_id == delivery_id)
+        )
+        if row is None:
+            return None
+        return {
+            "delivery_id": row.delivery_id,
+            "task_id": row.task_id,
+            "repository": row.repository,
+            "ref": row.ref,
+            "head_sha": row.head_sha,
+            "status": row.status,
+            "error": row.error,
+            "created_at": row.created_at,
+            "updated_at": row.updated_at,
+        }
+
+
+def _submit(func: Callable[..., None], *args: Any, **kwargs: Any) -> None:
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="push-status"
+            )
+        _writer.submit(func, *args, **kwargs)
+
+
+def flush_push_status(timeout: float = 10.0) -> bool:
+    """Wait for queued status writes; False if they are still running."""
+    with _writer_lock:
+        writer = _writer
+    if writer is None:
+        return True
+    try:
+        writer.submit(lambda: None).result(timeout)
+    except FutureTimeoutError:
+        return False
+    return True
+
+
+def _reset_writer_after_fork() -> None:
+    global _writer
+    # The writer thread does not survive fork; start a new one on first use
+    _writer = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_writer_after_fork)
+
+
+# Task lifecycle handlers -----------------------------------------------------
+
+
+def _delivery_ids(
+    headers: Optional[Dict[str, Any]], task_id: Optional[str], args: Any = None
+) -> List[str]:
+    """The task's delivery plus every delivery coalesced into it."""
+    primary = (headers or {}).get("correlation_id") or task_id
+    delivery_ids = [primary] if primary else []
+    webhook_headers = (
+        args[1] if isinstance(args, (list, tuple)) and len(args) > 1 else {}
+    )
+    if isinstance(webhook_headers, dict):
+        coalesced = webhook_headers.get(COALESCED_DELIVERIES_HEADER) or ""
+        delivery_ids += [d for d in coalesced.split(",") if d and d not in delivery_ids]
+    return delivery_ids
+
+
+def _record_queued(task_id: Optional[str], delivery_ids: List[str], args: Any):
+    payload = args[0] if args and isinstance(args[0], dict) else {}
+    for delivery_id in delivery_ids:
+        record_push_status(
+            delivery_id,
+            QUEUED,
+            task_id=task_id,
+            repository=(payload.get("repository") or {}).get("full_name"),
+            ref=payload.get("ref"),
+            head_sha=payload.get("after"),
+        )
+
+
+def _record_started(task_id: Optional[str], delivery_ids: List[str]) -> None:
+    for delivery_id in delivery_ids:
+        record_push_status(delivery_id, PROCESSING, task_id=task_id)
+
+
+def _record_finished(
+    task_id: Optional[str], delivery_ids: List[str], state: str, retval: Any
+) -> None:
+    if state == "SUCCESS":
+        status, error = SUCCEEDED, None
+    else:
+        # Celery re-publishes a retried task; it is not finished yet
+        status = RETRYING if state == "RETRY" else FAILED
+        error = repr(retval)
+    for delivery_id in delivery_ids:
+        record_push_status(delivery_id, status, task_id=task_id, error=error)
+
+
+def on_task_published(
+    sender: str = None, headers: dict = None, body: Any = None, **_: Any
+):
+    if sender != PROCESS_WEBHOOK_TASK or headers is None:
+        return
+    args = body[0] if isinstance(body, (list, tuple)) and body else []
+    task_id = headers.get("id")
+    # Runs inside send_task: hand the write to the background writer
+    _submit(_record_queued, task_id, _delivery_ids(headers, task_id, args), args)
+
+
+def _task_headers(task: Any) -> Dict[str, Any]:
+    request = getattr(task, "request", None)
+    headers = dict(getattr(request, "headers", None) or {})
+    correlation_id = getattr(request, "correlation_id", None)
+    if correlation_id:
+        headers.setdefault("correlation_id", correlation_id)
+    return headers
+
+
+def on_task_started(task_id: str = None, task: Any = None, args: Any = None, **_: Any):
+    if getattr(task, "name", None) != PROCESS_WEBHOOK_TASK:
+        return
+    _record_started(task_id, _delivery_ids(_task_headers(task), task_id, args))
+
+
+def on_task_finished(
+    task_id: str = None,
+    task: Any = None,
+    args: Any = None,
+    state: str = None,
+    retval: Any = None,
+    **_: Any,
+):
+    if getattr(task, "name", None) != PROCESS_WEBHOOK_TASK:
+        return
+    delivery_ids = _delivery_ids(_task_headers(task), task_id, args)
+    _record_finished(task_id, delivery_ids, state, retval)
+
+
+def on_inprocess_task(
+    event: str,
+    task_name: str,
+    task_id: str,
+    args: list,
+    correlation_id: Optional[str] = None,
+    state: Optional[str] = None,
+    retval: Any = None,
+) -> None:
+    """``InProcessExecutor`` listener: eager mode fires no Celery signals."""
+    if task_name != PROCESS_WEBHOOK_TASK:
+        return
+    delivery_ids = _delivery_ids({"correlation_id": correlation_id}, task_id, args)
+    # Events arrive on the caller and executor threads; the writer keeps order
+    if event == "published":
+        _submit(_record_queued, task_id, delivery_ids, args)
+    elif event == "started":
+        _submit(_record_started, task_id, delivery_ids)
+    elif event == "finished":
+        _submit(_record_finished, task_id, delivery_ids, state, retval)
@@ -0,0 +1,11 @@
+"""Webhook ingest fast path: verify, enqueue raw bytes, return 202.
+
+A background drainer parses queued deliveries and dispatches Celery tasks,
+so GitHub never waits on payload parsing or a slow broker.
+"""
+
+from .store import IngestQueue, QueuedDelivery
+from .dedup import DeliveryDeduplicator
+from .service import IngestDrainer
+
+__all__ = ["IngestQueue", "QueuedDelivery", "DeliveryDeduplicator", "IngestDrainer"]
@@ -0,0 +1,222 @@
+"""Coalesce bursts of pushes to one repository/ref into a single Celery task."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from shared.utils.logging import correlation_scope, get_correlation_id
+
+logger = logging.getLogger(__name__)
+
+PROCESS_WEBHOOK_TASK = "webhook_receiver.process_webhook_async"
+COALESCED_DELIVERIES_HEADER = "x-codeping-coalesced-deliveries"
+
+BufferKey = Tuple[str, str]
+
+
+@dataclass
+class DeliveryReceipt:
+    """Completion callbacks for one push, e.g. acking its ingest queue row.
+
+    When the coalescer buffers the push it sets ``deferred`` and later calls
+    exactly one of the callbacks, after the merged task was published or
+    failed to publish.
+    """
+
+    on_published: Callable[[], None]
+    on_failed: Callable[[Exception], None]
+    deferred: bool = False
+
+
+_current_receipt: ContextVar[Optional[DeliveryReceipt]] = ContextVar(
+    "delivery_receipt", default=None
+)
+
+
+@contextmanager
+def delivery_receipt(receipt: DeliveryReceipt) -> Iterator[DeliveryReceipt]:
+    """Attach ``receipt`` to pushes sent to the coalescer inside this block."""
+    token = _current_receipt.set(receipt)
+    try:
+        yield receipt
+    finally:
+        _current_receipt.reset(token)
+
+
+@dataclass
+class _PendingPushes:
+    deadline: float
+    payloads: List[Dict[str, Any]] = field(default_factory=list)
+    headers: List[Dict[str, str]] = field(default_factory=list)
+    correlation_ids: List[Optional[str]] = field(default_factory=list)
+    receipts: List[DeliveryReceipt] = field(default_factory=list)
+
+
+def merge_push_payloads(payloads: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge consecutive pushes to one ref into a single push payload.
+
+    The result spans ``before`` of the first push to ``after`` of the last,
+    with the union of commits (first occurrence wins, push order kept). Only
+    the first push may be forced: a force-push rewrites the range, so the
+    coalescer starts a new group at one.
+    """
+    merged = dict(payloads[-1])
+    merged["before"] = payloads[0].get("before", merged.get("before"))
+
+    commits, seen = [], set()
+    for payload in payloads:
+        for commit in payload.get("commits") or []:
+            commit_id = commit.get("id") or commit.get("sha")
+            if commit_id in seen:
+                continue
+            seen.add(commit_id)
+            commits.append(commit)
+    merged["commits"] = commits
+    merged["forced"] = bool(payloads[0].get("forced"))
+    return merged
+
+
+class PushCoalescer:
+    """``send_task`` wrapper that buffers push tasks per repository and ref.
+
+    Pushes are held for at most ``window`` seconds, or until ``max_pushes``
+    arrive, and then dispatched as one merged task. Other tasks pass
+    straight through to ``task_queue``. Buffered pushes live only in memory:
+    callers that need durability send them under a ``delivery_receipt`` and
+    acknowledge their source only from its callbacks. ``close`` flushes the
+    buffer on shutdown.
+    """
+
+    def __init__(self, task_queue: Any, window: float = 0.5, max_pushes: int = 20):
+        self.task_queue = task_queue
+        self.window = window
+        self.max_pushes = max_pushes
+        self.pushes_received = 0
+        self.tasks_dispatched = 0
+        self._pending: Dict[BufferKey, _PendingPushes] = {}
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._run, name="webhook-push-coalescer", daemon=True
+        )
+        self._thread.start()
+
+    def send_task(self, task_name: str, args: list = None, kwargs: dict = None) -> Any:
+        if task_name != PROCESS_WEBHOOK_TASK or not args or kwargs:
+            return self.task_queue.send_task(task_name, args=args, kwargs=kwargs)
+
+        payload, headers = args[0], args[1] if len(args) > 1 else {}
+        key = (
+            (payload.get("repository") or {}).get("full_name", ""),
+            payload.get("ref", ""),
+        )
+
+        receipt = _current_receipt.get()
+        ready = []
+        with self._cond:
+            self.pushes_received += 1
+            pending = self._pending.get(key)
+            if pending is not None and payload.get("forced"):
+                # Commits buffered so far may be gone after the force-push
+                ready.append(self._pending.pop(key))
+                pending = None
+            if pending is None:
+                pending = self._pending[key] = _PendingPushes(
+                    deadline=time.monotonic() + self.window
+                )
+                self._cond.notify()
+            pending.payloads.append(payload)
+            pending.headers.append(headers)
+            pending.correlation_ids.append(get_correlation_id())
+            if receipt is not None:
+                receipt.deferred = True
+                pending.receipts.append(receipt)
+            if len(pending.payloads) >= self.max_pushes:
+                ready.append(self._pending.pop(key))
+
+        for group in ready:
+            self._dispatch(group)
+        return None
+
+    def flush(self) -> int:
+        """Dispatch every buffered group now; returns the number of tasks."""
+        with self._cond:
+            groups = list(self._pending.values())
+            self._pending.clear()
+        for group in groups:
+            self._dispatch(group)
+        return len(groups)
+
+    def close(self) -> None:
+        """Flush what is buffered and stop the timer thread."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        self._thread.join(timeout=self.window + 5)
+        self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "pushes_received": self.pushes_received,
+                "tasks_dispatched": self.tasks_dispatched,
+                "buffered_groups": len(self._pending),
+            }
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if self._stopping:
+                    return
+                now = time.monotonic()
+                due = [
+                    key for key, group in self._pending.items() if group.deadline <= now
+                ]
+                groups = [self._pending.pop(key) for key in due]
+                if not groups:
+                    deadlines = [group.deadline for group in self._pending.values()]
+                    timeout = min(deadlines) - now if deadlines else None
+                    self._cond.wait(timeout)
+                    continue
+            for group in groups:
+                self._dispatch(group)
+
+    def _dispatch(self, group: _PendingPushes) -> None:
+        payload = merge_push_payloads(group.payloads)
+        headers = dict(group.headers[-1])
+        if len(group.payloads) > 1:
+            delivery_ids = [h.get("x-github-delivery") for h in group.headers]
+            headers[COALESCED_DELIVERIES_HEADER] = ",".join(filter(None, delivery_ids))
+            logger.info(
+                "Coalesced %d pushes to %s %s into one task (%d commits)",
+                len(group.payloads),
+                (payload.get("repository") or {}).get("full_name"),
+                payload.get("ref"),
+                len(payload["commits"]),
+            )
+
+        try:
+            # Publish under the latest push's correlation ID
+            with correlation_scope(group.correlation_ids[-1]):
+                self.task_queue.send_task(PROCESS_WEBHOOK_TASK, args=[payload, headers])
+        except Exception as exc:
+            logger.exception("Failed to dispatch coalesced push task")
+            self._settle(group, "on_failed", exc)
+            return
+        with self._cond:
+            self.tasks_dispatched += 1
+        self._settle(group, "on_published")
+
+    @staticmethod
+    def _settle(group: _PendingPushes, callback: str, *args: Any) -> None:
+        for receipt in group.receipts:
+            try:
+                getattr(receipt, callback)(*args)
+            except Exception:
+                logger.exception("Delivery receipt callback failed")
@@ -0,0 +1,285 @@
+"""Webhook delivery deduplication: bounded LRU in front of a unique DB index."""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Mapping, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
+
+from shared.config.database import get_session
+
+from .models import WebhookDelivery
+from .signature import valid_signature
+
+logger = logging.getLogger(__name__)
+
+_ZERO_SHA = "0" * 40
+
+CLAIM_PROCESSING = "processing"
+CLAIM_DONE = "done"
+
+
+def extract_dedup_keys(headers: Mapping[str, str], body: bytes) -> List[str]:
+    """Keys identifying a delivery: the delivery ID and repo/ref/head SHA."""
+    keys = []
+
+    delivery_id = headers.get("x-github-delivery")
+    if delivery_id:
+        keys.append(f"delivery:{delivery_id}")
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return keys
+    if not isinstance(payload, dict):
+        return keys
+
+    repository = payload.get("repository")
+    full_name = repository.get("full_name") if isinstance(repository, dict) else None
+    ref, after = payload.get("ref"), payload.get("after")
+    if (
+        all(isinstance(value, str) and value for value in (full_name, ref, after))
+        and after != _ZERO_SHA
+    ):
+        keys.append(f"head:{full_name}:{ref}:{after}")
+    return keys
+
+
+class DeliveryDeduplicator:
+    """Reject duplicate deliveries in O(1).
+
+    ``seen`` only consults the in-process LRU and is safe on the request
+    path. ``claim`` inserts into the ``webhook_deliveries`` unique index
+    (catching duplicates across replicas and restarts) in the ``processing``
+    state and remembers the keys in the LRU. After the task is dispatched
+    ``complete`` marks the claim ``done``; a failed dispatch should
+    ``release`` it so GitHub's redelivery is processed.
+
+    A ``processing`` claim left behind by a crash does not turn the work
+    into a duplicate: the same ``owner`` (e.g. the ingest queue row that is
+    redelivered after its lease) takes it over, and anyone may take it over
+    once it is older than ``in_flight_timeout`` seconds.
+    """
+
+    def __init__(self, max_entries: int = 100_000, in_flight_timeout: float = 600.0):
+        self.max_entries = max_entries
+        self.in_flight_timeout = in_flight_timeout
+        self.duplicates = 0
+        self._recent: OrderedDict[str, None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def seen(self, keys: List[str]) -> bool:
+        with self._lock:
+            for key in keys:
+                if key in self._recent:
+                    self._recent.move_to_end(key)
+                    self.duplicates += 1
+                    return True
+        return False
+
+    def remember(self, keys: List[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._recent[key] = None
+                self._recent.move_to_end(key)
+            while len(self._recent) > self.max_entries:
+                self._recent.popitem(last=False)
+
+    def claim(self, keys: List[str], owner: Optional[str] = None) -> bool:
+        """Return False if any key was already claimed (duplicate)."""
+        if not keys:
+            return True
+        if owner is None and self.seen(keys):
+            return False
+
+        try:
+            with get_session() as session:
+                session.add_all(
+                    WebhookDelivery(dedup_key=key, state=CLAIM_PROCESSING, owner=owner)
+                    for key in keys
+                )
+        except IntegrityError:
+            if not self._take_over(keys, owner):
+                self.remember(keys)
+                with self._lock:
+                    self.duplicates += 1
+                return False
+        except SQLAlchemyError as exc:
+            # Fail open: a missing index must never drop real pushes
+            logger.warning("Delivery dedup index unavailable: %s", exc)
+
+        self.remember(keys)
+        return True
+
+    def _take_over(self, keys: List[str], owner: Optional[str]) -> bool:
+        """Re-own in-flight claims of the same owner or of a dead one."""
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=self.in_flight_timeout)
+        try:
+            with get_session() as session:
+                claims = {
+                    claim.dedup_key: claim
+                    for claim in session.scalars(
+                        select(WebhookDelivery).where(
+                            WebhookDelivery.dedup_key.in_(keys)
+                        )
+                    )
+                }
+                for claim in claims.values():
+                    if claim.state != CLAIM_PROCESSING:
+                        return False
+                    same_owner = owner is not None and claim.owner == owner
+                    if not same_owner and claim.created_at > stale:
+                        return False
+                for claim in claims.values():
+                    claim.owner = owner
+                    claim.created_at = now
+                session.add_all(
+                    WebhookDelivery(dedup_key=key, state=CLAIM_PROCESSING, owner=owner)
+                    for key in keys
+                    if key not in claims
+                )
+        except IntegrityError:
+            # Another claimant inserted a missing key concurrently
+            return False
+        return True
+
+    def complete(self, keys: List[str]) -> None:
+        """Mark claims ``done`` once their task has been dispatched."""
+        if not keys:
+            return
+        try:
+            with get_session() as session:
+                session.execute(
+                    update(WebhookDelivery)
+                    .where(WebhookDelivery.dedup_key.in_(keys))
+                    .values(state=CLAIM_DONE)
+                )
+        except SQLAlchemyError as exc:
+            logger.warning("Failed to complete delivery claim: %s", exc)
+
+    def release(self, keys: List[str]) -> None:
+        """Forget keys whose processing failed so a redelivery can succeed."""
+        with self._lock:
+            for key in keys:
+                self._recent.pop(key, None)
+        try:
+            with get_session() as session:
+                session.execute(
+                    delete(WebhookDelivery).where(WebhookDelivery.dedup_key.in_(keys))
+                )
+        except SQLAlchemyError as exc:
+            logger.warning("Failed to release delivery claim: %s", exc)
+
+    def purge_older_than(self, max_age: timedelta) -> int:
+        """Delete claims older than ``max_age`` (GitHub stops redelivering)."""
+        cutoff = datetime.utcnow() - max_age
+        with get_session() as session:
+            result = session.execute(
+                delete(WebhookDelivery).where(WebhookDelivery.created_at < cutoff)
+            )
+            return result.rowcount
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"recent": len(self._recent), "duplicates": self.duplicates}
+
+
+class DeliveryDedupMiddleware:
+    """Drop duplicate signed pushes before the package webhook router runs.
+
+    Only deliveries with a valid signature are claimed, so forged requests
+    cannot poison the index. The claim is released if the router fails.
+    """
+
+    def __init__(
+        self,
+        app,
+        deduplicator: DeliveryDeduplicator,
+        secret: str,
+        path_prefix: str = "/webhook",
+    ):
+        self.app = app
+        self.deduplicator = deduplicator
+        self.secret = secret
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or not scope["path"].startswith(self.path_prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        body, receive = await _buffer_body(receive)
+        headers = {
+            k.decode("latin-1"): v.decode("latin-1") for k, v in scope["headers"]
+        }
+
+        keys = []
+        if headers.get("x-github-event") == "push" and valid_signature(
+            body, headers.get("x-hub-signature-256"), self.secret
+        ):
+            keys = extract_dedup_keys(headers, body)
+
+        if keys:
+            if self.deduplicator.seen(keys) or not await run_in_threadpool(
+                self.deduplicator.claim, keys
+            ):
+                await _send_json(send, 200, b'{"status":"duplicate"}')
+                return
+
+        status_holder = {}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder["status"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if keys and status_holder.get("status", 500) >= 300:
+                await run_in_threadpool(self.deduplicator.release, keys)
+            elif keys:
+                await run_in_threadpool(self.deduplicator.complete, keys)
+
+
+async def _buffer_body(receive):
+    chunks = []
+    more = True
+    while more:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        more = message.get("more_body", False)
+    body = b"".join(chunks)
+    sent = False
+
+    async def replay():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return body, replay
+
+
+async def _send_json(send, status: int, body: bytes) -> None:
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json")],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
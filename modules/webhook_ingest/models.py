@@ -0,0 +1,38 @@
+"""Database models for the webhook ingest module."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from typing import Optional
+
+from sqlalchemy import DateTime, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from shared.config.database import Base
+
+
+class WebhookDelivery(Base):
+    """Claimed delivery keys; the unique index rejects redeliveries.
+
+    A claim stays ``processing`` until its task is dispatched and then
+    becomes ``done``. Only ``done`` claims, or ``processing`` claims of
+    another live owner, make a delivery a duplicate.
+    """
+
+    __tablename__ = "webhook_deliveries"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    dedup_key: Mapped[str] = mapped_column(String(512), nullable=False, unique=True)
+    # New claims start "processing". The server default only backfills claims
+    # made before takeover existed (migration 6), which had all been dispatched
+    state: Mapped[str] = mapped_column(
+        String(16), nullable=False, default="processing", server_default="done"
+    )
+    owner: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=func.now(), index=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<WebhookDelivery(key={self.dedup_key})>"
@@ -0,0 +1,57 @@
+"""Fast-path webhook router: HMAC check, durable enqueue, 202."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Request, status
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+
+from shared.config.settings import get_settings
+
+from .dedup import extract_dedup_keys
+from .service import get_deduplicator, get_ingest_queue
+from .signature import valid_signature
+
+router = APIRouter(prefix="/webhook", tags=["webhook"])
+
+
+@router.post("/", status_code=status.HTTP_202_ACCEPTED)
+@router.post("/github", status_code=status.HTTP_202_ACCEPTED)
+async def ingest_github_webhook(request: Request) -> JSONResponse:
+    """Verify the signature over the raw body, enqueue it and return 202.
+
+    Redeliveries already claimed in this process are answered 200 without
+    enqueueing. Parsing and task dispatch happen later in ``IngestDrainer``.
+    """
+    body = await request.body()
+    headers = request.headers
+
+    signature = headers.get("x-hub-signature-256")
+    if not signature:
+        return JSONResponse({"detail": "Missing signature"}, status_code=401)
+    settings = get_settings()
+    if not valid_signature(body, signature, settings.github_webhook_secret):
+        return JSONResponse({"detail": "Invalid signature"}, status_code=401)
+
+    event = headers.get("x-github-event")
+    if event != "push":
+        return JSONResponse(
+            {"detail": f"Event '{event}' ignored (only push handled)"},
+            status_code=status.HTTP_202_ACCEPTED,
+        )
+
+    delivery_id = headers.get("x-github-delivery")
+    if settings.webhook_dedup_enabled and get_deduplicator().seen(
+        extract_dedup_keys(headers, body)
+    ):
+        return JSONResponse({"status": "duplicate", "delivery_id": delivery_id})
+
+    # SQLite write (and fsync with synchronous=FULL) off the event loop
+    await run_in_threadpool(
+        get_ingest_queue().enqueue, body, dict(headers), event, delivery_id
+    )
+
+    return JSONResponse(
+        {"status": "accepted", "delivery_id": delivery_id},
+        status_code=status.HTTP_202_ACCEPTED,
+    )
@@ -0,0 +1,203 @@
+"""Background drainer: parse queued deliveries and dispatch Celery tasks."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from functools import lru_cache
+from typing import Any, List, Optional
+
+from fastapi import HTTPException
+
+from shared.config.settings import get_settings
+from shared.utils.logging import correlation_scope
+
+from .coalesce import DeliveryReceipt, PushCoalescer, delivery_receipt
+from .dedup import DeliveryDeduplicator, extract_dedup_keys
+from .store import IngestQueue, QueuedDelivery
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache()
+def get_ingest_queue() -> IngestQueue:
+    """Process-wide ingest queue configured from settings."""
+    settings = get_settings()
+    return IngestQueue(
+        settings.webhook_ingest_queue_path,
+        synchronous=settings.webhook_ingest_synchronous,
+        max_attempts=settings.webhook_ingest_max_attempts,
+    )
+
+
+@lru_cache()
+def get_deduplicator() -> DeliveryDeduplicator:
+    """Process-wide delivery deduplicator shared by the router and drainer."""
+    settings = get_settings()
+    return DeliveryDeduplicator(
+        settings.webhook_dedup_cache_size,
+        in_flight_timeout=settings.webhook_dedup_in_flight_timeout_seconds,
+    )
+
+
+class IngestDrainer:
+    """Drain the ingest queue on a dedicated thread with its own event loop.
+
+    Parsing and ``send_task`` (which blocks on the broker) therefore never
+    run on the API event loop.
+    """
+
+    def __init__(
+        self,
+        ingest_queue: IngestQueue,
+        webhook_service: Any = None,
+        batch_size: int = 50,
+        poll_interval: float = 0.05,
+        deduplicator: Optional[DeliveryDeduplicator] = None,
+    ):
+        self.ingest_queue = ingest_queue
+        self.webhook_service = webhook_service
+        self.deduplicator = deduplicator
+        self.coalescer: Optional[PushCoalescer] = None
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.processed = 0
+        self.failed = 0
+        self.duplicates = 0
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="webhook-ingest-drainer", daemon=True
+        )
+        self._thread.start()
+        logger.info("✅ Webhook ingest drainer started")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Finish the current batch and stop."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        if self.coalescer is not None:
+            self.coalescer.close()
+
+    def drain_once(self) -> int:
+        """Process one batch synchronously; returns the number of deliveries."""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        deliveries = self.ingest_queue.lease(self.batch_size)
+        done = []
+        for delivery in deliveries:
+            if self._loop.run_until_complete(self._process(delivery)):
+                done.append(delivery.id)
+        self.ingest_queue.ack(done)
+        return len(deliveries)
+
+    def _run(self) -> None:
+        try:
+            while not self._stopping.is_set():
+                try:
+                    if self.drain_once() == 0:
+                        self._stopping.wait(self.poll_interval)
+                except Exception:
+                    logger.exception("Webhook ingest drainer iteration failed")
+                    self._stopping.wait(self.poll_interval)
+        finally:
+            if self._loop is not None:
+                self._loop.close()
+                self._loop = None
+
+    def _service(self) -> Any:
+        if self.webhook_service is None:
+            from shared.config.celery_app import celery_app
+            from yeonjae_universal_webhook_receiver.service import WebhookService
+
+            task_queue = celery_app
+            settings = get_settings()
+            if settings.webhook_coalesce_enabled:
+                task_queue = self.coalescer = PushCoalescer(
+                    celery_app,
+                    window=settings.webhook_coalesce_window_ms / 1000,
+                    max_pushes=settings.webhook_coalesce_max_pushes,
+                )
+            self.webhook_service = WebhookService(task_queue=task_queue)
+        return self.webhook_service
+
+    async def _process(self, delivery: QueuedDelivery) -> bool:
+        """Return True when the delivery can be acked now (dispatched or rejected).
+
+        Pushes buffered by the coalescer are acked, or nacked, from their
+        receipt once the merged task is published; until then the row stays
+        leased and comes back after a crash.
+        """
+        keys = []
+        if self.deduplicator is not None:
+            keys = extract_dedup_keys(delivery.headers, delivery.body)
+            # A crash before dispatch leaves the claim in flight; the leased
+            # row comes back with the same owner and takes it over
+            owner = f"ingest:{self.ingest_queue.queue_id}:{delivery.id}"
+            if not self.deduplicator.claim(keys, owner=owner):
+                self.duplicates += 1
+                logger.info("Duplicate delivery %s skipped", delivery.delivery_id)
+                return True
+
+        receipt = DeliveryReceipt(
+            on_published=lambda: self._published(delivery, keys, ack=True),
+            on_failed=lambda exc: self._failed(delivery, keys, exc),
+        )
+        with correlation_scope(delivery.delivery_id):
+            try:
+                with delivery_receipt(receipt):
+                    await self._service().process_webhook(
+                        headers=delivery.headers,
+                        body=delivery.body,
+                        github_event=delivery.event,
+                    )
+            except HTTPException as exc:
+                # Permanent rejection (ignored event, malformed payload, ...)
+                level = logging.INFO if exc.status_code == 202 else logging.WARNING
+                logger.log(
+                    level,
+                    "Ingested delivery %s rejected: %s",
+                    delivery.delivery_id,
+                    exc.detail,
+                )
+                if keys:
+                    self.deduplicator.complete(keys)
+                return True
+            except Exception as exc:
+                self._failed(delivery, keys, exc)
+                return False
+
+        if receipt.deferred:
+            return False
+        self._published(delivery, keys, ack=False)
+        return True
+
+    def _published(self, delivery: QueuedDelivery, keys: List[str], ack: bool) -> None:
+        self.processed += 1
+        if keys:
+            self.deduplicator.complete(keys)
+        if ack:
+            self.ingest_queue.ack([delivery.id])
+
+    def _failed(
+        self, delivery: QueuedDelivery, keys: List[str], exc: Exception
+    ) -> None:
+        self.failed += 1
+        logger.warning(
+            "Ingested delivery %s failed (attempt %d): %s",
+            delivery.delivery_id,
+            delivery.attempts + 1,
+            exc,
+        )
+        if keys:
+            self.deduplicator.release(keys)
+        self.ingest_queue.nack(delivery.id)
@@ -0,0 +1,15 @@
+"""GitHub ``X-Hub-Signature-256`` verification over the raw body."""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+
+_SIGNATURE_PREFIX = "sha256="
+
+
+def valid_signature(body: bytes, header: str | None, secret: str) -> bool:
+    if not header or not header.startswith(_SIGNATURE_PREFIX):
+        return False
+    expected = hmac.new(secret.encode(), msg=body, digestmod=hashlib.sha256)
+    return hmac.compare_digest(expected.hexdigest(), header[len(_SIGNATURE_PREFIX) :])
@@ -0,0 +1,166 @@
+"""Durable local SQLite queue for raw webhook deliveries."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingest_queue (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    delivery_id TEXT,
+    event TEXT,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    received_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    leased_until REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_ingest_queue_lease ON ingest_queue (leased_until, id);
+CREATE TABLE IF NOT EXISTS ingest_queue_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+
+@dataclass
+class QueuedDelivery:
+    """One raw delivery waiting to be parsed and dispatched."""
+
+    id: int
+    delivery_id: Optional[str]
+    event: Optional[str]
+    headers: Dict[str, str]
+    body: bytes
+    received_at: float
+    attempts: int
+
+
+class IngestQueue:
+    """Append-only SQLite queue with lease/ack semantics.
+
+    WAL mode keeps enqueue to a single sequential append; ``synchronous``
+    controls durability (NORMAL survives process crashes, FULL also
+    survives power loss at the cost of an fsync per delivery).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        synchronous: str = "NORMAL",
+        max_attempts: int = 5,
+    ):
+        synchronous = synchronous.upper()
+        if synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(
+                f"Unknown SQLite synchronous mode {synchronous!r} "
+                f"(expected one of {', '.join(SYNCHRONOUS_MODES)})"
+            )
+        self.path = path
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={synchronous}")
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute(
+            "INSERT OR IGNORE INTO ingest_queue_meta (key, value)"
+            " VALUES ('queue_id', ?)",
+            (uuid.uuid4().hex,),
+        )
+        # Stable across restarts: identifies rows of this queue file
+        self.queue_id = self._conn.execute(
+            "SELECT value FROM ingest_queue_meta WHERE key = 'queue_id'"
+        ).fetchone()[0]
+
+    def enqueue(
+        self,
+        body: bytes,
+        headers: Dict[str, str],
+        event: Optional[str] = None,
+        delivery_id: Optional[str] = None,
+    ) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO ingest_queue"
+                " (delivery_id, event, headers, body, received_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (delivery_id, event, json.dumps(headers), body, time.time()),
+            )
+            return cursor.lastrowid
+
+    def lease(self, limit: int, lease_seconds: float = 60.0) -> List[QueuedDelivery]:
+        """Claim up to ``limit`` deliveries; unacked ones reappear after the lease."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id, delivery_id, event, headers, body, received_at,"
+                    " attempts FROM ingest_queue"
+                    " WHERE leased_until <= ? AND attempts < ?"
+                    " ORDER BY id LIMIT ?",
+                    (now, self.max_attempts, limit),
+                ).fetchall()
+                if rows:
+                    self._conn.executemany(
+                        "UPDATE ingest_queue SET leased_until = ? WHERE id = ?",
+                        [(now + lease_seconds, row[0]) for row in rows],
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return [
+            QueuedDelivery(
+                id=row[0],
+                delivery_id=row[1],
+                event=row[2],
+                headers=json.loads(row[3]),
+                body=row[4],
+                received_at=row[5],
+                attempts=row[6],
+            )
+            for row in rows
+        ]
+
+    def ack(self, ids: List[int]) -> None:
+        if not ids:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM ingest_queue WHERE id = ?", [(i,) for i in ids]
+            )
+
+    def nack(self, delivery_id: int, retry_after: float = 1.0) -> None:
+        """Release a failed delivery for retry (dead after ``max_attempts``)."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE ingest_queue SET attempts = attempts + 1, leased_until = ?"
+                " WHERE id = ?",
+                (time.time() + retry_after, delivery_id),
+            )
+
+    def depth(self) -> Dict[str, int]:
+        with self._lock:
+            pending, dead = self._conn.execute(
+                "SELECT COALESCE(SUM(attempts < ?), 0), COALESCE(SUM(attempts >= ?), 0)"
+                " FROM ingest_queue",
+                (self.max_attempts, self.max_attempts),
+            ).fetchone()
+        return {"pending": pending, "dead": dead}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,9 +1,19 @@
 #!/usr/bin/env python3
-"""Direct Celery worker runner script."""
+"""Direct Celery worker runner script.
 
+Usage:
+    python run_worker.py            # every profile, one child process each
+    python run_worker.py webhook    # I/O-bound webhook worker only
+    python run_worker.py bulk       # CPU-bound bulk (Notion sync) worker only
+
+Pool types and autoscale bounds per profile come from Settings
+(CELERY_WEBHOOK_WORKER_* / CELERY_BULK_WORKER_*).
+"""
+
+import signal
+import subprocess
 import sys
 import os
-from shared.config.celery_app import celery_app
 
 # Set environment variables
 os.environ["CELERY_ALWAYS_EAGER"] = "false"
@@ -11,13 +21,57 @@ os.environ["CELERY_ALWAYS_EAGER"] = "false"
 # Add current directory to Python path
 sys.path.insert(0, os.getcwd())
 
+from shared.config.worker_profiles import get_worker_profiles  # noqa: E402
+
+
+def run_profile(name: str) -> None:
+    """Run one worker profile in this process."""
+    profile = get_worker_profiles()[name]
+    argv = profile.worker_argv()
+
+    # Green pools must patch the stdlib before Celery and the app are imported
+    from celery import maybe_patch_concurrency
+
+    maybe_patch_concurrency(argv)
+
+    from shared.config.celery_app import celery_app
+
+    celery_app.worker_main(argv)
+
+
+def run_all(names) -> int:
+    """Run each profile as a child process and stop them together."""
+    children = [
+        subprocess.Popen([sys.executable, os.path.abspath(__file__), name])
+        for name in names
+    ]
+
+    def _forward(signum, _frame):
+        for child in children:
+            if child.poll() is None:
+                child.send_signal(signum)
+
+    signal.signal(signal.SIGTERM, _forward)
+    signal.signal(signal.SIGINT, _forward)
+
+    exit_code = 0
+    for child in children:
+        exit_code = child.wait() or exit_code
+    return exit_code
+
+
 if __name__ == "__main__":
-    # Run worker directly
-    celery_app.worker_main(
-        [
-            "worker",
-            "--loglevel=info",
-            "--concurrency=2",
-            "--queues=celery,webhook_queue,webhook",
-        ]
-    )
+    profiles = get_worker_profiles()
+    requested = sys.argv[1:] or list(profiles)
+
+    unknown = [name for name in requested if name not in profiles]
+    if unknown:
+        sys.exit(
+            f"Unknown worker profile(s): {', '.join(unknown)} "
+            f"(available: {', '.join(profiles)})"
+        )
+
+    if len(requested) == 1:
+        run_profile(requested[0])
+    else:
+        sys.exit(run_all(requested))
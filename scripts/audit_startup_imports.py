@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+API 콜드 스타트 import 감사 (python -X importtime)
+
+새 인터프리터에서 `import main` 후 /health 프로브 한 번을 처리하고,
+import 시간 상위 모듈과 무거운 의존성(Celery, boto3, 분석기 등)의 로드 여부를
+보고합니다. 예산 초과 또는 금지 모듈 로드 시 종료 코드 1.
+
+    python scripts/audit_startup_imports.py
+    python scripts/audit_startup_imports.py --top 30 --json
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# 콜드 스타트 목표: import main + 첫 /health 응답까지의 import 시간
+COLD_START_BUDGET_SECONDS = 0.75
+
+# /health 프로브만으로는 절대 로드되면 안 되는 모듈 (첫 사용 시 지연 로드)
+FORBIDDEN_MODULES = (
+    "celery",
+    "kombu",
+    "redis",
+    "boto3",
+    "botocore",
+    "radon",
+    "pygments",
+    "tree_sitter",
+    "yeonjae_universal_diff_analyzer",
+    "yeonjae_universal_webhook_receiver",
+    "sqlalchemy",
+)
+
+# 새 프로세스에서 실행: main import + ASGI 로 /health 한 번 호출
+_PROBE = """
+import asyncio, json, sys
+import main
+
+async def probe():
+    scope = {"type": "http", "method": "GET", "path": "/health",
+             "raw_path": b"/health", "query_string": b"", "headers": [],
+             "http_version": "1.1", "scheme": "http", "server": ("test", 80),
+             "client": ("test", 1), "root_path": ""}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await main.app(scope, receive, send)
+    return sent[0]["status"]
+
+status = asyncio.run(probe())
+sys.stdout.write(json.dumps({"status": status, "modules": sorted(sys.modules)}))
+"""
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def run_probe(env=None):
+    """importtime 으로 프로브를 실행하고 (모듈 import 기록, 결과) 반환"""
+    environment = {**os.environ, **(env or {})}
+    environment.setdefault("DATABASE_MIGRATE_ON_STARTUP", "false")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        cwd=PROJECT_ROOT,
+        env=environment,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    records = []
+    for line in completed.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            depth = (len(indent) - 1) // 2
+            records.append((module, int(self_us), int(cumulative_us), depth))
+    return records, json.loads(completed.stdout)
+
+
+def build_report(budget=COLD_START_BUDGET_SECONDS, top=20, env=None):
+    records, result = run_probe(env)
+    # main 의 하위 import (main 직전 연속 구간) + 프로브 중 추가 import (main 이후)
+    index = next(
+        i for i, record in enumerate(records) if record[0] == "main" and record[3] == 0
+    )
+    first = index
+    while first > 0 and records[first - 1][3] > 0:
+        first -= 1
+    startup = records[first:]
+    total = sum(record[2] for record in startup if record[3] == 0) / 1e6
+
+    loaded = set(result["modules"])
+    heaviest = sorted(
+        (record for record in startup if record[3] <= 1),
+        key=lambda record: record[2],
+        reverse=True,
+    )[:top]
+    return {
+        "status": result["status"],
+        "import_seconds": round(total, 3),
+        "budget_seconds": budget,
+        "within_budget": total <= budget,
+        "forbidden_loaded": [name for name in FORBIDDEN_MODULES if name in loaded],
+        "top_imports": [
+            {"module": module, "cumulative_ms": round(cumulative / 1000, 1)}
+            for module, _, cumulative, _ in heaviest
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--budget", type=float, default=COLD_START_BUDGET_SECONDS)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="JSON 으로 출력")
+    args = parser.parse_args()
+
+    report = build_report(args.budget, args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(
+            f"⏱️  cold start imports: {report['import_seconds']:.3f}s "
+            f"(budget {report['budget_seconds']:.2f}s), /health → {report['status']}"
+        )
+        for entry in report["top_imports"]:
+            print(f"   {entry['cumulative_ms']:>8.1f} ms  {entry['module']}")
+        if report["forbidden_loaded"]:
+            print(f"❌ loaded on /health: {', '.join(report['forbidden_loaded'])}")
+
+    ok = (
+        report["within_budget"]
+        and not report["forbidden_loaded"]
+        and report["status"] == 200
+    )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
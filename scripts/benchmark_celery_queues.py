@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Celery 큐 분리 벤치마크 (로컬 Redis 필요)
+
+Notion 동기화처럼 오래 걸리는 bulk 태스크가 쌓인 상태에서 webhook 태스크의
+대기 시간(발행 → 워커 시작)을 측정합니다.
+
+  --layout shared     : 워커 하나가 모든 큐를 소비 (기존 구성과 유사)
+  --layout dedicated  : webhook 큐 / bulk 큐 전용 워커를 각각 실행
+
+    redis-server &
+    python scripts/benchmark_celery_queues.py --layout shared
+    python scripts/benchmark_celery_queues.py --layout dedicated
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+os.environ["CELERY_ALWAYS_EAGER"] = "false"
+
+from shared.config.celery_app import celery_app, prefetch_multiplier_for  # noqa: E402
+from shared.config.settings import get_settings  # noqa: E402
+
+if not hasattr(celery_app, "worker_main"):
+    sys.exit("Celery could not be initialised (is the broker reachable?)")
+
+
+# 라우팅 패턴(webhook_receiver.* / notion_sync.*)에 걸리는 벤치마크 전용 태스크
+@celery_app.task(name="webhook_receiver.bench_ping")
+def bench_ping(published_at: float) -> float:
+    return time.time() - published_at
+
+
+@celery_app.task(name="notion_sync.bench_sync")
+def bench_sync(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def _start_worker(queues, concurrency):
+    settings = get_settings()
+    command = [
+        sys.executable,
+        "-m",
+        "celery",
+        "-A",
+        "scripts.benchmark_celery_queues:celery_app",
+        "worker",
+        "--loglevel=warning",
+        f"--concurrency={concurrency}",
+        f"--queues={','.join(queues)}",
+        f"--prefetch-multiplier={prefetch_multiplier_for(queues, settings)}",
+        f"--hostname=bench-{'-'.join(queues)}@%h",
+    ]
+    return subprocess.Popen(command, cwd=str(Path(__file__).parent.parent))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--layout", choices=["shared", "dedicated"], default="dedicated"
+    )
+    parser.add_argument("--bulk-tasks", type=int, default=20)
+    parser.add_argument("--bulk-seconds", type=float, default=2.0)
+    parser.add_argument("--webhooks", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=2)
+    args = parser.parse_args()
+
+    settings = get_settings()
+    webhook_queue, bulk_queue = (
+        settings.celery_webhook_queue,
+        settings.celery_bulk_queue,
+    )
+
+    celery_app.control.purge()
+    if args.layout == "shared":
+        workers = [_start_worker([webhook_queue, bulk_queue], args.concurrency)]
+    else:
+        workers = [
+            _start_worker([webhook_queue], args.concurrency),
+            _start_worker([bulk_queue], args.concurrency),
+        ]
+
+    try:
+        time.sleep(3)  # 워커 기동 대기
+
+        for _ in range(args.bulk_tasks):
+            bench_sync.delay(args.bulk_seconds)
+
+        results = []
+        for _ in range(args.webhooks):
+            results.append(bench_ping.delay(time.time()))
+            time.sleep(0.05)
+
+        timeout = args.bulk_tasks * args.bulk_seconds + 30
+        waits = [result.get(timeout=timeout) * 1000 for result in results]
+    finally:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.wait(timeout=30)
+
+    print(
+        f"📊 layout={args.layout} bulk={args.bulk_tasks}x{args.bulk_seconds}s "
+        f"webhooks={args.webhooks}"
+    )
+    print(
+        f"   webhook queue wait p50={_percentile(waits, 0.5):.1f}ms "
+        f"p95={_percentile(waits, 0.95):.1f}ms "
+        f"p99={_percentile(waits, 0.99):.1f}ms max={max(waits):.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
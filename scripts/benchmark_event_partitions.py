@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+events 범위 조회 / 보존 정책 벤치마크
+
+수백만 행의 events 를 24개월에 걸쳐 생성한 뒤
+"저장소 X 의 최근 24시간 push" 조회를 단일 컬럼 인덱스와
+(repository, created_at) 복합 인덱스로 비교하고, 만료 처리 시간을 측정합니다.
+PostgreSQL 에서는 월별 파티션 전환 후 파티션 DROP 시간을 측정합니다.
+
+    python scripts/benchmark_event_partitions.py --rows 2000000
+    python scripts/benchmark_event_partitions.py --url postgresql+psycopg://localhost/b
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, insert, text  # noqa: E402
+from yeonjae_universal_data_storage.models import Event  # noqa: E402
+
+from infrastructure.database.event_partitions import (  # noqa: E402
+    apply_retention,
+    convert_events_to_partitioned,
+    ensure_event_indexes,
+)
+
+RECENT_QUERY = text(
+    "SELECT count(*) FROM events"
+    " WHERE repository = :repository AND created_at >= :since"
+)
+
+
+def _generate(engine, rows, repositories, months, chunk=20000):
+    """created_at 이 과거 months 개월에 고르게 분포한 이벤트 생성"""
+    now = datetime.utcnow()
+    span = timedelta(days=30 * months).total_seconds()
+    rng = random.Random(42)
+    started = time.perf_counter()
+    for offset in range(0, rows, chunk):
+        batch = [
+            {
+                "repository": f"org/repo-{rng.randrange(repositories)}",
+                "commit_sha": f"{index:040x}",
+                "pusher": "bench",
+                "ref": "refs/heads/main",
+                "payload": "",
+                "created_at": now - timedelta(seconds=rng.random() * span),
+            }
+            for index in range(offset, min(offset + chunk, rows))
+        ]
+        with engine.begin() as connection:
+            connection.execute(insert(Event.__table__), batch)
+    print(f"   {rows:,} rows generated in {time.perf_counter() - started:.1f}s")
+
+
+def _time_recent_query(engine, label, repositories, runs=200):
+    since = datetime.utcnow() - timedelta(hours=24)
+    rng = random.Random(7)
+    with engine.connect() as connection:
+        started = time.perf_counter()
+        for _ in range(runs):
+            connection.execute(
+                RECENT_QUERY,
+                {
+                    "repository": f"org/repo-{rng.randrange(repositories)}",
+                    "since": since,
+                },
+            ).scalar()
+        elapsed = time.perf_counter() - started
+    print(f"   {label:<32} {elapsed / runs * 1000:>8.2f} ms/query")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", help="SQLAlchemy URL (default: temporary SQLite file)")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--repositories", type=int, default=1000)
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--retention-months", type=int, default=12)
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{tempfile.mkdtemp()}/bench_partitions.db"
+    engine = create_engine(url)
+    Event.__table__.drop(engine, checkfirst=True)
+    Event.__table__.create(engine)
+    print(f"📊 {engine.dialect.name}: {args.rows:,} events, {args.repositories} repos")
+
+    _generate(engine, args.rows, args.repositories, args.months)
+    _time_recent_query(engine, "repository index only", args.repositories)
+
+    with engine.connect() as connection:
+        converted = convert_events_to_partitioned(connection)
+    if converted:
+        print("   converted to monthly partitions")
+        _time_recent_query(engine, "partitioned + composite index", args.repositories)
+    else:
+        with engine.connect() as connection:
+            ensure_event_indexes(
+                connection.execution_options(isolation_level="AUTOCOMMIT")
+            )
+        _time_recent_query(engine, "(repository, created_at) index", args.repositories)
+
+    started = time.perf_counter()
+    expired = apply_retention(engine, args.retention_months)
+    print(
+        f"   retention ({args.retention_months} months): {len(expired)} expired "
+        f"in {time.perf_counter() - started:.2f}s {expired[:3]}"
+    )
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
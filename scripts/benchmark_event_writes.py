@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+events 테이블 쓰기 처리량 벤치마크
+
+행마다 세션/커밋하는 기존 방식과 EventWriteBuffer(배치 INSERT / COPY)를
+동시 writer 스레드 기준으로 비교합니다.
+
+    python scripts/benchmark_event_writes.py --events 5000 --writers 16
+    python scripts/benchmark_event_writes.py --url postgresql+psycopg://localhost/cp
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from yeonjae_universal_data_storage.models import Event  # noqa: E402
+
+from infrastructure.database.event_writer import EventWriteBuffer  # noqa: E402
+
+
+def _event(run, index):
+    return {
+        "repository": f"bench/{run}",
+        "commit_sha": f"{index:040x}",
+        "pusher": "bench",
+        "ref": "refs/heads/main",
+        "commit_count": 1,
+        "payload": '{"ref": "refs/heads/main"}',
+    }
+
+
+def _measure(label, events, writers, write):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=writers) as pool:
+        list(pool.map(write, range(events)))
+    elapsed = time.perf_counter() - started
+    print(f"   {label:<24} {events / elapsed:>10,.0f} events/s ({elapsed:.2f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", help="SQLAlchemy URL (default: temporary SQLite file)")
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{tempfile.mkdtemp()}/bench_events.db"
+    engine = create_engine(url, pool_size=args.writers, max_overflow=0)
+    Event.__table__.create(engine, checkfirst=True)
+    print(f"📊 {args.events} events, {args.writers} writers, {engine.dialect.name}")
+
+    def row_per_commit(index):
+        with engine.begin() as connection:
+            connection.execute(insert(Event.__table__), [_event("single", index)])
+
+    _measure("row per commit", args.events, args.writers, row_per_commit)
+
+    for durability in ("sync", "async"):
+        buffer = EventWriteBuffer(
+            lambda: engine, max_batch=args.batch_size, durability=durability
+        )
+        started = time.perf_counter()
+        _measure(
+            f"buffered ({durability})",
+            args.events,
+            args.writers,
+            lambda index: buffer.write(_event(durability, index)),
+        )
+        buffer.close()
+        if durability == "async":
+            elapsed = time.perf_counter() - started
+            rate = args.events / elapsed
+            print(f"   {'  incl. final flush':<24} {rate:>10,.0f} events/s")
+        print(f"     batches={buffer.stats()['batches']}")
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+웹훅 ingest fast path 지연 시간 벤치마크
+
+ASGI 앱에 서명된 push 요청을 동시에 보내 응답 지연의 p50/p95/p99 를 측정합니다.
+목표: p99 < 5ms (WEBHOOK_INGEST_ENABLED=true).
+
+클라이언트와 앱이 같은 이벤트 루프를 공유하므로 동시성을 높이면 측정값에
+클라이언트 대기 시간이 포함됩니다. 단일 워커 기준 지연은 기본값(4)으로 측정하세요.
+
+    python scripts/benchmark_webhook_ingest.py --requests 5000 --concurrency 4
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+async def _run(total, concurrency, payload_commits):
+    import httpx
+
+    from main import create_app
+    from shared.config.settings import get_settings
+
+    secret = get_settings().github_webhook_secret
+    body = json.dumps(
+        {
+            "ref": "refs/heads/main",
+            "repository": {"full_name": "bench/repo", "name": "repo"},
+            "pusher": {"name": "bench"},
+            "commits": [
+                {"id": f"{i:040x}", "message": "bench", "added": [], "modified": []}
+                for i in range(payload_commits)
+            ],
+        }
+    ).encode()
+    signature = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+    transport = httpx.ASGITransport(app=create_app())
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def one(index):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post(
+                    "/webhook/",
+                    content=body,
+                    headers={
+                        "X-Hub-Signature-256": signature,
+                        "X-GitHub-Event": "push",
+                        "X-GitHub-Delivery": f"bench-{index}",
+                    },
+                )
+                latencies.append((time.perf_counter() - started) * 1000)
+                assert response.status_code == 202, response.text
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - started
+
+    return latencies, elapsed, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Webhook ingest latency benchmark")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--commits", type=int, default=20, help="commits per payload")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="ingest-bench-")
+    os.environ["WEBHOOK_INGEST_ENABLED"] = "true"
+    os.environ["WEBHOOK_INGEST_QUEUE_PATH"] = os.path.join(workdir, "ingest.db")
+    os.environ.setdefault("CELERY_ALWAYS_EAGER", "true")
+
+    latencies, elapsed, size = asyncio.run(
+        _run(args.requests, args.concurrency, args.commits)
+    )
+
+    print(
+        f"📦 payload: {size} bytes, requests: {args.requests}, "
+        f"concurrency: {args.concurrency}"
+    )
+    print(f"⚡ throughput: {args.requests / elapsed:.0f} req/s")
+    for label, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+        print(f"   {label}: {_percentile(latencies, q):.2f} ms")
+    print(f"   max: {max(latencies):.2f} ms")
+
+    p99 = _percentile(latencies, 0.99)
+    print("✅ p99 < 5ms" if p99 < 5 else "❌ p99 >= 5ms")
+    return 0 if p99 < 5 else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -2,23 +2,48 @@
 """
 DataStorage MVP 데이터베이스 마이그레이션 스크립트
 
-이 스크립트는 설계서를 바탕으로 구현된 MVP 버전의 DataStorage 모듈을 위한
-데이터베이스 테이블들을 생성합니다.
+infrastructure/database/migrations.py 의 버전 마이그레이션을 적용합니다.
+스키마가 최신이면 버전 조회 한 번으로 끝나며, PostgreSQL 에서는 advisory
+lock 으로 한 프로세스만 마이그레이션합니다. 행을 옮기는 데이터 마이그레이션
+(payload 이동, 파티션 변환, 집계 백필)은 기동 시 실행되지 않으며 --data 로만
+실행됩니다.
+
+    python scripts/migrate_database.py            # 대기 중인 스키마 마이그레이션 적용
+    python scripts/migrate_database.py --data     # 데이터 마이그레이션도 실행
+    python scripts/migrate_database.py --inspect  # 적용 후 테이블/인덱스 출력
 """
 
+import argparse
 import sys
 from pathlib import Path
-from sqlalchemy import inspect
-from shared.config.database import create_tables_sync, get_sync_engine
 
 # 프로젝트 루트를 Python path에 추가
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from sqlalchemy import inspect  # noqa: E402
+
+from infrastructure.database.migrations import (  # noqa: E402
+    MIGRATIONS,
+    current_version,
+    run_data_migrations,
+    run_migrations,
+)
+from shared.config.database import get_sync_engine  # noqa: E402
+
 
 def main():
     """메인 마이그레이션 함수"""
 
+    parser = argparse.ArgumentParser(description="버전 마이그레이션 적용")
+    parser.add_argument(
+        "--inspect", action="store_true", help="테이블/인덱스 정보 출력"
+    )
+    parser.add_argument(
+        "--data", action="store_true", help="데이터 마이그레이션(행 재작성) 실행"
+    )
+    args = parser.parse_args()
+
     print("🔄 DataStorage MVP 데이터베이스 마이그레이션 시작...")
 
     try:
@@ -26,9 +51,20 @@ def main():
         engine = get_sync_engine()
         print(f"📊 데이터베이스 연결: {engine.url}")
 
-        # 테이블 생성
-        print("🏗️  테이블 생성 중...")
-        create_tables_sync()
+        # 버전 마이그레이션 적용
+        applied = run_migrations(engine)
+        if args.data:
+            applied += run_data_migrations(engine)
+        for migration in MIGRATIONS:
+            if migration.version in applied:
+                print(f"   • {migration.version:04d} {migration.name}")
+        print(
+            f"🏷️  스키마 버전: {current_version(engine)} (이번 적용 {len(applied)}개)"
+        )
+
+        if not args.inspect:
+            print("🎉 DataStorage MVP 데이터베이스 마이그레이션 완료!")
+            return 0
 
         # 생성된 테이블 확인
 
@@ -52,7 +88,18 @@ def main():
 
         # 인덱스 확인
         print("🔍 인덱스 정보:")
-        for table in ["commits", "commit_diffs", "events"]:
+        for table in [
+            "commits",
+            "commit_diffs",
+            "events",
+            "diff_blobs",
+            "webhook_deliveries",
+            "push_status",
+            "event_payloads",
+            "event_keys",
+            "event_rollups_hourly",
+            "event_rollups_daily",
+        ]:
             if table in tables:
                 indexes = inspector.get_indexes(table)
                 if indexes:
@@ -65,6 +112,14 @@ def main():
         print("   • commits: 커밋 정보 저장")
         print("   • commit_diffs: diff 정보 저장 (압축 지원)")
         print("   • events: 기존 호환성을 위한 이벤트 테이블")
+        print("   • diff_blobs: 내용 해시 기반 diff 중복 제거 인덱스 (참조 카운트)")
+        print("   • webhook_deliveries: 웹훅 재전송 중복 제거 키 (unique)")
+        print("   • push_status: push 처리 상태 (queued → processing → retrying/종료)")
+        print("   • event_payloads: events.payload 압축 저장 (zstd/gzip, 지연 로딩)")
+        print("   • event_keys: 파티션된 events 의 (repository, commit_sha) 중복 방지")
+        print(
+            "   • event_rollups_hourly/daily: 저장소·pusher 별 시간/일 집계 (증분 갱신)"
+        )
 
         print("\n💡 사용법:")
         print("   from modules.data_storage.service import DataStorageManager")
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+events 테이블을 월 단위 파티션 테이블로 변환 (PostgreSQL 전용)
+
+시작 시 마이그레이션에서는 실행하지 않습니다. 행을 --batch-size 개씩
+별도 트랜잭션으로 복사하므로 쓰기는 계속되고, 중단돼도 다시 실행하면
+이어서 복사합니다. 마지막 전환 단계에서만 events 를 잠급니다.
+
+    python scripts/partition_events.py
+    python scripts/partition_events.py --batch-size 20000 --months-ahead 6
+
+변환 후 EVENT_PARTITIONING_ENABLED=true 로 설정하세요 (event_keys 중복 방지).
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from infrastructure.database.event_partitions import (  # noqa: E402
+    convert_events_to_partitioned,
+)
+from shared.config.database import get_sync_engine  # noqa: E402
+from shared.config.settings import get_settings  # noqa: E402
+
+
+def main():
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="events 월 단위 파티션 변환")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument(
+        "--months-ahead", type=int, default=settings.event_partition_months_ahead
+    )
+    args = parser.parse_args()
+
+    engine = get_sync_engine()
+    print(f"📊 데이터베이스 연결: {engine.url}")
+    with engine.connect() as connection:
+        converted = convert_events_to_partitioned(
+            connection, months_ahead=args.months_ahead, batch_size=args.batch_size
+        )
+    if converted:
+        print("🎉 events 파티션 변환 완료")
+    else:
+        print("⏭️  변환할 것이 없습니다 (PostgreSQL 아님, 테이블 없음 또는 변환됨)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
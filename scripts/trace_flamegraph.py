@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+트레이스 JSONL → flame graph 변환 스크립트
+
+TRACING_EXPORTER=file 로 기록된 스팬을 folded stack 포맷으로 변환합니다.
+결과는 flamegraph.pl 또는 https://www.speedscope.app 에 바로 넣을 수 있습니다.
+
+    python scripts/trace_flamegraph.py traces.jsonl > push.folded
+    python scripts/trace_flamegraph.py traces.jsonl --trace <trace_id>
+"""
+
+import argparse
+import json
+import sys
+from collections import defaultdict
+
+
+def load_spans(path, trace_id=None):
+    spans = {}
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            span = json.loads(line)
+            if trace_id is None or span["trace_id"] == trace_id:
+                spans[span["span_id"]] = span
+    return spans
+
+
+def folded_stacks(spans):
+    """스팬별 self time(µs)을 'service;parent;child' 스택 단위로 합산"""
+    children_time = defaultdict(int)
+    for span in spans.values():
+        if span["parent_id"] in spans:
+            children_time[span["parent_id"]] += span["end_ns"] - span["start_ns"]
+
+    stacks = defaultdict(int)
+    for span in spans.values():
+        frames = []
+        current = span
+        while current is not None:
+            frames.append(f"{current['service']}:{current['name']}")
+            current = spans.get(current["parent_id"])
+        self_ns = span["end_ns"] - span["start_ns"] - children_time[span["span_id"]]
+        stacks[";".join(reversed(frames))] += max(self_ns, 0) // 1000
+    return stacks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("path", help="TRACING_FILE_PATH 로 기록된 JSONL 파일")
+    parser.add_argument("--trace", help="특정 trace_id 만 변환")
+    args = parser.parse_args()
+
+    spans = load_spans(args.path, args.trace)
+    for stack, micros in sorted(folded_stacks(spans).items()):
+        sys.stdout.write(f"{stack} {micros}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -1,44 +1,258 @@
-"""Celery application configuration."""
+"""Celery application configuration.
+
+Importing this module is cheap: Celery, kombu and the task modules are
+imported, and the app is created, on first access to ``celery_app`` (or
+``get_celery_app()``), so API processes that never dispatch a task do not
+pay for them at startup. ``app`` resolves to the same instance for
+``celery -A shared.config.celery_app worker``, which looks it up by that name.
+"""
 
 from __future__ import annotations
 
 import os
 import logging
+import threading
 from typing import Any
 
-from celery import Celery
-from celery.schedules import crontab
+from shared.utils import tracing
+from shared.utils.logging import (
+    get_correlation_id,
+    reset_correlation_id,
+    set_correlation_id,
+)
 
+from .inprocess_executor import InProcessExecutor, create_inprocess_executor
+from .plugins import get_task_plugins
 from .settings import get_settings
 
 logger = logging.getLogger(__name__)
 
 
-class MockCelery:
-    """Mock Celery for testing when broker is not available."""
+_CORRELATION_HEADER = "correlation_id"
+_TRACE_PARENT_HEADER = "trace_parent_span_id"
+_task_correlation_tokens: dict[str, Any] = {}
+_task_trace_spans: dict[str, Any] = {}
 
-    def send_task(
-        self, task_name: str, args: list[Any] = None, kwargs: dict[str, Any] = None
-    ) -> Any:
-        """Mock send_task method."""
-        logger.info(
-            "Mock Celery: Would send task %s with args=%s kwargs=%s",
-            task_name,
-            args,
-            kwargs,
+
+def _request_header(task: Any, name: str) -> Any:
+    request = getattr(task, "request", None)
+    return getattr(request, name, None) or (
+        getattr(request, "headers", None) or {}
+    ).get(name)
+
+
+def _publish_correlation_id(headers: dict[str, Any] = None, **_: Any) -> None:
+    """Attach the current correlation ID and span to outgoing task messages."""
+    if headers is None:
+        return
+    correlation_id = get_correlation_id()
+    if correlation_id:
+        headers.setdefault(_CORRELATION_HEADER, correlation_id)
+    span_id = tracing.current_span_id()
+    if span_id:
+        headers.setdefault(_TRACE_PARENT_HEADER, span_id)
+
+
+def _enter_task_correlation(task_id: str = None, task: Any = None, **_: Any) -> None:
+    """Restore the publisher's correlation ID and open the task span."""
+    correlation_id = _request_header(task, _CORRELATION_HEADER)
+    if correlation_id and task_id:
+        _task_correlation_tokens[task_id] = set_correlation_id(correlation_id)
+
+    span, token = tracing.start_span(
+        f"celery.{getattr(task, 'name', 'task')}",
+        {"celery.task_id": task_id},
+        parent_id=_request_header(task, _TRACE_PARENT_HEADER),
+    )
+    if span is not None and task_id:
+        _task_trace_spans[task_id] = (span, token)
+
+
+def _exit_task_correlation(task_id: str = None, state: str = None, **_: Any) -> None:
+    span, token = _task_trace_spans.pop(task_id, (None, None))
+    if span is not None:
+        span.attributes["celery.state"] = state
+        tracing.end_span(span, token)
+
+    token = _task_correlation_tokens.pop(task_id, None)
+    if token is not None:
+        reset_correlation_id(token)
+
+
+def _install_correlation_propagation() -> None:
+    from celery.signals import before_task_publish, task_postrun, task_prerun
+
+    before_task_publish.connect(_publish_correlation_id, weak=False)
+    task_prerun.connect(_enter_task_correlation, weak=False)
+    task_postrun.connect(_exit_task_correlation, weak=False)
+
+
+def _install_push_status_tracking() -> None:
+    """Track webhook pipeline progress in the push_status table."""
+    from celery.signals import before_task_publish, task_postrun, task_prerun
+
+    from modules.push_status import service as push_status
+
+    before_task_publish.connect(push_status.on_task_published, weak=False)
+    task_prerun.connect(push_status.on_task_started, weak=False)
+    task_postrun.connect(push_status.on_task_finished, weak=False)
+
+
+def _create_inprocess_executor(settings: Any) -> InProcessExecutor:
+    executor = create_inprocess_executor(settings)
+    if settings.push_status_tracking_enabled:
+        from modules.push_status import service as push_status
+
+        # No Celery signals fire in-process; the executor reports instead
+        executor.add_listener(push_status.on_inprocess_task)
+    return executor
+
+
+def build_result_config(settings: Any) -> dict[str, Any]:
+    """Ignore task results unless a task opts in via CELERY_RESULT_TASKS."""
+    return {
+        "task_ignore_result": settings.celery_task_ignore_result,
+        "task_annotations": {
+            name: {"ignore_result": False} for name in settings.celery_result_tasks
+        },
+        "result_backend": settings.celery_result_backend or settings.celery_broker_url,
+        "result_expires": settings.celery_result_expires_seconds,
+    }
+
+
+def _broker_priority(priority: int, max_priority: int, broker_url: str) -> int:
+    """Map "higher runs first" to the broker's order (Redis: 0 runs first)."""
+    priority = min(max(priority, 0), max_priority)
+    if broker_url.startswith(("redis://", "rediss://")):
+        return max_priority - priority
+    return priority
+
+
+def build_routing_config(settings: Any) -> dict[str, Any]:
+    """Queues, routes, priorities and ack semantics from settings."""
+    from kombu import Queue
+
+    max_priority = settings.celery_max_priority
+    queue_arguments = {"x-max-priority": max_priority} if max_priority else None
+    queues = [
+        Queue(name, routing_key=name, queue_arguments=queue_arguments)
+        for name in dict.fromkeys(
+            [
+                settings.celery_webhook_queue,
+                settings.celery_bulk_queue,
+                settings.celery_default_queue,
+            ]
         )
-        return None
+    ]
+
+    def route(queue: str, priority: int) -> dict[str, Any]:
+        options: dict[str, Any] = {"queue": queue, "routing_key": queue}
+        if max_priority:
+            options["priority"] = _broker_priority(
+                priority, max_priority, settings.celery_broker_url
+            )
+        return options
+
+    config: dict[str, Any] = {
+        "task_queues": queues,
+        "task_default_queue": settings.celery_default_queue,
+        "task_routes": {
+            "webhook_receiver.*": route(
+                settings.celery_webhook_queue, settings.celery_webhook_priority
+            ),
+            "notion_sync.*": route(
+                settings.celery_bulk_queue, settings.celery_bulk_priority
+            ),
+            "events.*": route(
+                settings.celery_bulk_queue, settings.celery_bulk_priority
+            ),
+        },
+        "task_acks_late": settings.celery_task_acks_late,
+        # With late acks, a killed worker must not silently drop its task
+        "task_reject_on_worker_lost": settings.celery_task_acks_late,
+        # Per-worker default; run_worker.py overrides it per queue profile
+        "worker_prefetch_multiplier": settings.celery_webhook_prefetch_multiplier,
+        "broker_transport_options": {
+            "visibility_timeout": settings.celery_visibility_timeout_seconds,
+        },
+    }
+    if max_priority:
+        config["task_queue_max_priority"] = max_priority
+        config["task_default_priority"] = _broker_priority(
+            0, max_priority, settings.celery_broker_url
+        )
+        config["broker_transport_options"].update(
+            priority_steps=list(range(max_priority + 1)),
+            sep=":",
+            queue_order_strategy="priority",
+        )
+    return config
+
+
+def build_beat_schedule(settings: Any) -> dict[str, Any]:
+    """Periodic tasks: Notion sync and daily events partition/rollup maintenance."""
+    from celery.schedules import crontab
+
+    from infrastructure.database.event_partitions import EVENT_RETENTION_TASK
+    from infrastructure.database.event_rollups import EVENT_ROLLUP_COMPACTION_TASK
+
+    schedule = {}
+    if any(plugin.name == "notion_sync" for plugin in get_task_plugins(settings)):
+        schedule["sync-notion-documentation"] = {
+            "task": "notion_sync.sync_documentation",
+            "schedule": crontab(minute=f"*/{settings.notion_sync_interval_minutes}"),
+        }
+    if settings.event_partitioning_enabled or settings.event_retention_months > 0:
+        # Off-peak (Asia/Seoul); pre-creates partitions, then drops expired ones
+        schedule["maintain-event-partitions"] = {
+            "task": EVENT_RETENTION_TASK,
+            "schedule": crontab(minute=15, hour=3),
+        }
+    if settings.event_rollups_enabled:
+        schedule["compact-event-rollups"] = {
+            "task": EVENT_ROLLUP_COMPACTION_TASK,
+            "schedule": crontab(minute=45, hour=3),
+        }
+    return schedule
+
+
+def _register_maintenance_tasks(app: Any) -> None:
+    from infrastructure.database.event_partitions import (
+        EVENT_RETENTION_TASK,
+        maintain_event_partitions,
+    )
+    from infrastructure.database.event_rollups import (
+        EVENT_ROLLUP_COMPACTION_TASK,
+        compact_event_rollups,
+    )
+
+    app.task(name=EVENT_RETENTION_TASK)(maintain_event_partitions)
+    app.task(name=EVENT_ROLLUP_COMPACTION_TASK)(compact_event_rollups)
+
+
+def prefetch_multiplier_for(queues: list[str], settings: Any = None) -> int:
+    """Prefetch multiplier for a worker consuming ``queues``.
+
+    Any latency-sensitive queue wins: prefetched webhook tasks would
+    otherwise wait behind a long bulk task on the same process.
+    """
+    settings = settings or get_settings()
+    if settings.celery_webhook_queue in queues:
+        return settings.celery_webhook_prefetch_multiplier
+    return settings.celery_bulk_prefetch_multiplier
 
 
 def create_celery_app():
     """Create Celery app instance or mock for testing."""
 
-    # Check if we should use mock (for testing or when no broker available)
+    # Eager mode (single node, tests): run tasks in-process without a broker
     if os.environ.get("CELERY_ALWAYS_EAGER", "false").lower() == "true":
-        logger.info("Using mock Celery (always eager mode)")
-        return MockCelery()
+        logger.info("Using in-process task executor (always eager mode)")
+        return _create_inprocess_executor(get_settings())
 
     try:
+        from celery import Celery
+
         # Get settings
         settings = get_settings()
 
@@ -50,45 +264,70 @@ def create_celery_app():
             broker_url=settings.celery_broker_url,
             task_always_eager=settings.celery_always_eager,
             task_eager_propagates=settings.celery_eager_propagates_exceptions,
-            # Task discovery
-            include=[
-                "modules.webhook_receiver.tasks",
-                "modules.notion_sync.tasks",
-            ],
+            # Task discovery (``codeping.tasks`` entry points, imported by the worker)
+            include=[plugin.module for plugin in get_task_plugins(settings)],
             # Timezone
             timezone="Asia/Seoul",
             enable_utc=True,
             # Periodic tasks
-            beat_schedule={
-                "sync-notion-documentation": {
-                    "task": "notion_sync.sync_documentation",
-                    "schedule": crontab(
-                        minute=f"*/{settings.notion_sync_interval_minutes}"
-                    ),
-                },
-            },
-            # Task routing - removed for now to use default queue
-            # task_routes={
-            #     "webhook_receiver.*": {"queue": "webhook_queue"},
-            #     "notion_sync.*": {"queue": "celery"},
-            # },
-            # Result backend (optional)
-            result_backend=settings.celery_broker_url,
-            result_expires=3600,  # 1 hour
+            beat_schedule=build_beat_schedule(settings),
+            # Queues, routing, priorities and ack semantics
+            **build_routing_config(settings),
+            # Results are fire-and-forget unless a task opts in
+            **build_result_config(settings),
         )
 
+        _install_correlation_propagation()
+        _register_maintenance_tasks(celery_app)
+        if settings.push_status_tracking_enabled:
+            _install_push_status_tracking()
+
         logger.info(
             "Celery app initialized with broker: %s", settings.celery_broker_url
         )
         return celery_app
 
     except ImportError:
-        logger.warning("Celery not available, using mock")
-        return MockCelery()
+        logger.warning("Celery not available, using in-process executor")
+        return _create_inprocess_executor(get_settings())
     except Exception as exc:
-        logger.warning("Failed to initialize Celery, using mock: %s", exc)
-        return MockCelery()
+        logger.warning(
+            "Failed to initialize Celery, using in-process executor: %s", exc
+        )
+        return _create_inprocess_executor(get_settings())
+
+
+_celery_app: Any = None
+_celery_app_lock = threading.Lock()
+
+
+def get_celery_app() -> Any:
+    """The process-wide Celery app (or in-process executor), created on first use."""
+    global _celery_app
+    if _celery_app is None:
+        with _celery_app_lock:
+            if _celery_app is None:
+                _celery_app = create_celery_app()
+    return _celery_app
+
+
+def __getattr__(name: str) -> Any:
+    # ``from shared.config.celery_app import celery_app`` creates the app lazily
+    if name == "celery_app":
+        return get_celery_app()
+    if name == "app":
+        # ``celery -A shared.config.celery_app`` reads ``app`` after dropping the
+        # working directory from sys.path again; the lazy imports still need it
+        from celery.utils.imports import cwd_in_path
+
+        with cwd_in_path():
+            return get_celery_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-# Create the global Celery app instance
-celery_app = create_celery_app()
+def drain_inprocess_tasks() -> None:
+    """Wait for in-process tasks on shutdown (no-op with a real broker or no app)."""
+    if isinstance(_celery_app, InProcessExecutor):
+        timeout = get_settings().inprocess_executor_drain_timeout_seconds
+        if not _celery_app.drain(timeout):
+            logger.warning("In-process tasks still running after %.0fs", timeout)
@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
+import os
+import threading
 from contextlib import asynccontextmanager, contextmanager
-from typing import AsyncGenerator, Generator
+from typing import Any, AsyncGenerator, Dict, Generator
 
 from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker, Session
 
 from shared.config.settings import get_settings
+from shared.utils.tracing import instrument_engine
 
 
 class Base(DeclarativeBase):
@@ -18,40 +21,134 @@ class Base(DeclarativeBase):
     pass
 
 
+# Process-wide engine/session maker registry keyed by database URL.
+# 엔진마다 커넥션 풀을 가지므로 요청마다 새로 만들지 않고 재사용합니다.
+_engines: Dict[str, Any] = {}
+_session_makers: Dict[str, Any] = {}
+_registry_lock = threading.Lock()
+
+
+def _is_async_url(url: str) -> bool:
+    return url.startswith(("sqlite+aiosqlite", "postgresql+asyncpg"))
+
+
+def _to_sync_url(url: str) -> str:
+    # 동기 버전의 데이터베이스 URL 사용
+    return url.replace("+aiosqlite", "").replace("+asyncpg", "+psycopg2")
+
+
+def _engine_options(url: str) -> Dict[str, Any]:
+    """Build pool options for ``url`` from settings."""
+    settings = get_settings()
+    options: Dict[str, Any] = {
+        "echo": False,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+
+    # SQLite in-memory databases use a singleton/static pool without sizing
+    if not url.startswith("sqlite"):
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+        )
+    return options
+
+
+def _get_or_create_engine(url: str):
+    """Return the cached engine for ``url``, creating it on first use."""
+    engine = _engines.get(url)
+    if engine is not None:
+        return engine
+
+    with _registry_lock:
+        engine = _engines.get(url)
+        if engine is None:
+            factory = create_async_engine if _is_async_url(url) else create_engine
+            engine = factory(url, **_engine_options(url))
+            if get_settings().tracing_enabled:
+                instrument_engine(engine)
+            _engines[url] = engine
+    return engine
+
+
+def _get_or_create_session_maker(url: str):
+    """Return the cached session maker bound to the engine for ``url``."""
+    session_maker = _session_makers.get(url)
+    if session_maker is not None:
+        return session_maker
+
+    engine = _get_or_create_engine(url)
+    with _registry_lock:
+        session_maker = _session_makers.get(url)
+        if session_maker is None:
+            if hasattr(engine, "sync_engine"):  # async engine
+                session_maker = async_sessionmaker(
+                    engine, class_=AsyncSession, expire_on_commit=False
+                )
+            else:  # sync engine
+                session_maker = sessionmaker(bind=engine)
+            _session_makers[url] = session_maker
+    return session_maker
+
+
+def _reset_after_fork() -> None:
+    """Drop inherited pools in a forked child (e.g. Celery prefork workers).
+
+    Connections are abandoned without being closed so the parent's sockets
+    stay usable; the child lazily builds its own engines on next use. The
+    lock is replaced too: a thread of the parent may have held it at fork.
+    """
+    global _registry_lock
+    _registry_lock = threading.Lock()
+    for engine in list(_engines.values()):
+        sync_engine = getattr(engine, "sync_engine", engine)
+        sync_engine.dispose(close=False)
+    _engines.clear()
+    _session_makers.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
 def get_engine():
     """Get SQLAlchemy engine (sync or async based on database URL)."""
     settings = get_settings()
-
-    if settings.database_url.startswith(("sqlite+aiosqlite", "postgresql+asyncpg")):
-        return create_async_engine(settings.database_url, echo=False)
-    else:
-        return create_engine(settings.database_url, echo=False)
+    return _get_or_create_engine(settings.database_url)
 
 
 def get_sync_engine():
     """Get synchronous SQLAlchemy engine."""
     settings = get_settings()
-    # 동기 버전의 데이터베이스 URL 사용
-    sync_url = settings.database_url.replace("+aiosqlite", "").replace(
-        "+asyncpg", "+psycopg2"
-    )
-    return create_engine(sync_url, echo=False)
+    return _get_or_create_engine(_to_sync_url(settings.database_url))
 
 
 def get_session_maker():
     """Get session maker (sync or async based on engine type)."""
-    engine = get_engine()
-
-    if hasattr(engine, "sync_engine"):  # async engine
-        return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    else:  # sync engine
-        return sessionmaker(bind=engine)
+    settings = get_settings()
+    return _get_or_create_session_maker(settings.database_url)
 
 
 def get_sync_session_maker():
     """Get synchronous session maker."""
-    engine = get_sync_engine()
-    return sessionmaker(bind=engine)
+    settings = get_settings()
+    return _get_or_create_session_maker(_to_sync_url(settings.database_url))
+
+
+async def dispose_engines() -> None:
+    """Dispose every cached engine and clear the registry (app shutdown)."""
+    with _registry_lock:
+        engines = list(_engines.values())
+        _engines.clear()
+        _session_makers.clear()
+
+    for engine in engines:
+        if hasattr(engine, "sync_engine"):  # async engine
+            await engine.dispose()
+        else:  # sync engine
+            engine.dispose()
 
 
 @contextmanager
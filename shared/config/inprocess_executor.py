@@ -0,0 +1,322 @@
+"""In-process task executor used instead of a broker in eager mode.
+
+Single-node and docker-compose installs set ``CELERY_ALWAYS_EAGER=true``;
+this executor gives them real, parallel task execution behind Celery's
+``send_task`` interface without running Redis.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import inspect
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from importlib import import_module
+from typing import Any, Callable, Dict, List, Optional
+
+from shared.utils.logging import get_correlation_id
+
+logger = logging.getLogger(__name__)
+
+# Task name -> "module:attribute" of the callable that implements it
+DEFAULT_TASK_REGISTRY: Dict[str, str] = {
+    "webhook_receiver.process_webhook_async": (
+        "modules.event_storage.tasks:process_webhook_async"
+    ),
+    "notion_sync.sync_documentation": (
+        "yeonjae_universal_notion_sync.tasks:sync_notion_documentation"
+    ),
+    "notion_sync.sync_specific_page": (
+        "yeonjae_universal_notion_sync.tasks:sync_specific_notion_page"
+    ),
+    "events.maintain_partitions": (
+        "infrastructure.database.event_partitions:maintain_event_partitions"
+    ),
+    "events.compact_rollups": (
+        "infrastructure.database.event_rollups:compact_event_rollups"
+    ),
+}
+
+
+class ExecutorSaturated(RuntimeError):
+    """Raised when the pending-task bound is reached (backpressure)."""
+
+
+class InProcessResult:
+    """Minimal ``AsyncResult`` look-alike for in-process tasks."""
+
+    def __init__(self, task_id: str, future: Future):
+        self.id = task_id
+        self._future = future
+
+    def ready(self) -> bool:
+        return self._future.done()
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        return self._future.result(timeout)
+
+
+class InProcessExecutor:
+    """Run tasks on a private asyncio loop and a bounded thread pool.
+
+    Coroutine tasks run on the loop; blocking tasks run in the thread pool.
+    At most ``max_pending`` tasks may be queued or running; ``send_task``
+    blocks up to ``submit_timeout`` seconds for a slot and then raises
+    ``ExecutorSaturated``. ``task_limits`` caps concurrent runs per task
+    name. The caller's context (correlation ID, trace span) is carried into
+    the task.
+
+    Celery signals do not fire here; listeners added with ``add_listener``
+    are called as ``listener(event, task_name, task_id, args, **fields)``
+    for the ``published``, ``started`` and ``finished`` events instead.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        max_pending: int = 1000,
+        submit_timeout: float = 5.0,
+        task_limits: Optional[Dict[str, int]] = None,
+        task_registry: Optional[Dict[str, str]] = None,
+    ):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.submit_timeout = submit_timeout
+        self.task_limits = dict(task_limits or {})
+        self._registry: Dict[str, Any] = dict(DEFAULT_TASK_REGISTRY)
+        self._registry.update(task_registry or {})
+
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.rejected = 0
+
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._accepting = True
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._limiters: Dict[str, asyncio.Semaphore] = {}
+        self._inflight: set = set()
+        self._listeners: List[Callable[..., None]] = []
+
+    def register(self, task_name: str, func: Callable[..., Any]) -> None:
+        """Register (or override) the callable for ``task_name``."""
+        self._registry[task_name] = func
+
+    def add_listener(self, listener: Callable[..., None]) -> None:
+        """Call ``listener`` on task lifecycle events (see the class docstring)."""
+        self._listeners.append(listener)
+
+    def send_task(
+        self, task_name: str, args: list = None, kwargs: dict = None, **_: Any
+    ) -> InProcessResult:
+        if not self._accepting:
+            raise ExecutorSaturated("In-process executor is shutting down")
+        if not self._slots.acquire(timeout=self.submit_timeout):
+            with self._lock:
+                self.rejected += 1
+            raise ExecutorSaturated(
+                f"{self.max_pending} tasks already pending; rejected {task_name}"
+            )
+
+        task_id = uuid.uuid4().hex
+        args = list(args or [])
+        correlation_id = get_correlation_id()
+        try:
+            loop = self._ensure_started()
+            context = contextvars.copy_context()
+            future = asyncio.run_coroutine_threadsafe(
+                self._run(task_name, task_id, args, dict(kwargs or {}), context),
+                loop,
+            )
+        except BaseException:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self.submitted += 1
+            self._inflight.add(future)
+        future.add_done_callback(self._finished)
+        self._notify(
+            "published", task_name, task_id, args, correlation_id=correlation_id
+        )
+        return InProcessResult(task_id, future)
+
+    def drain(self, timeout: float = 30.0) -> bool:
+        """Stop accepting tasks and wait for in-flight ones (lifespan shutdown).
+
+        Returns False if tasks were still running when ``timeout`` expired.
+        """
+        self._accepting = False
+        with self._lock:
+            pending = list(self._inflight)
+
+        # One deadline for all of them; task errors were already logged by _run
+        _, not_done = wait(pending, timeout=timeout)
+
+        self._stop()
+        return not not_done
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "submitted": self.submitted,
+                "succeeded": self.succeeded,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "inflight": len(self._inflight),
+            }
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="inprocess-task"
+                )
+                self._loop = asyncio.new_event_loop()
+                self._loop.set_default_executor(self._pool)
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="inprocess-executor",
+                    daemon=True,
+                )
+                self._thread.start()
+            return self._loop
+
+    def _stop(self) -> None:
+        with self._lock:
+            loop, thread, pool = self._loop, self._thread, self._pool
+            self._loop = self._thread = self._pool = None
+            self._limiters.clear()
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+            loop.close()
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _finished(self, future: Future) -> None:
+        self._slots.release()
+        with self._lock:
+            self._inflight.discard(future)
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.succeeded += 1
+
+    def _resolve(self, task_name: str) -> Callable[..., Any]:
+        target = self._registry.get(task_name)
+        if target is None:
+            raise LookupError(f"No in-process implementation for task {task_name}")
+        if isinstance(target, str):
+            module_name, _, attribute = target.partition(":")
+            target = getattr(import_module(module_name), attribute)
+            self._registry[task_name] = target
+        # Celery task objects expose the plain function as .run
+        return getattr(target, "run", target)
+
+    def _notify(
+        self, event: str, task_name: str, task_id: str, args: list, **fields: Any
+    ) -> None:
+        for listener in self._listeners:
+            try:
+                listener(event, task_name, task_id, args, **fields)
+            except Exception:
+                logger.exception("Task listener failed on %s %s", event, task_name)
+
+    def _limiter(self, task_name: str) -> Optional[asyncio.Semaphore]:
+        limit = self.task_limits.get(task_name)
+        if not limit:
+            return None
+        limiter = self._limiters.get(task_name)
+        if limiter is None:
+            limiter = self._limiters[task_name] = asyncio.Semaphore(limit)
+        return limiter
+
+    async def _run(
+        self,
+        task_name: str,
+        task_id: str,
+        args: list,
+        kwargs: dict,
+        context: contextvars.Context,
+    ) -> Any:
+        limiter = self._limiter(task_name)
+        if limiter is not None:
+            await limiter.acquire()
+        correlation_id = context.run(get_correlation_id)
+        try:
+            func = self._resolve(task_name)
+            self._notify(
+                "started", task_name, task_id, args, correlation_id=correlation_id
+            )
+            if inspect.iscoroutinefunction(func):
+                # The task copies the caller's context when it is created
+                result = await context.run(asyncio.ensure_future, func(*args, **kwargs))
+            else:
+                result = await asyncio.get_running_loop().run_in_executor(
+                    None, lambda: context.run(func, *args, **kwargs)
+                )
+        except Exception as exc:
+            logger.exception("In-process task %s failed", task_name)
+            self._notify(
+                "finished",
+                task_name,
+                task_id,
+                args,
+                correlation_id=correlation_id,
+                state="FAILURE",
+                retval=exc,
+            )
+            raise
+        else:
+            self._notify(
+                "finished",
+                task_name,
+                task_id,
+                args,
+                correlation_id=correlation_id,
+                state="SUCCESS",
+                retval=result,
+            )
+            return result
+        finally:
+            if limiter is not None:
+                limiter.release()
+
+    def _reset_after_fork(self) -> None:
+        # Loop and pool threads do not survive fork; restart lazily in the child
+        self._loop = self._thread = self._pool = None
+        self._limiters.clear()
+        self._inflight.clear()
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+
+
+_executors: "list[InProcessExecutor]" = []
+
+
+def create_inprocess_executor(settings: Any) -> InProcessExecutor:
+    """Executor configured from settings."""
+    executor = InProcessExecutor(
+        max_workers=settings.inprocess_executor_max_workers,
+        max_pending=settings.inprocess_executor_max_pending,
+        submit_timeout=settings.inprocess_executor_submit_timeout_seconds,
+        task_limits=settings.inprocess_executor_task_limits,
+    )
+    _executors.append(executor)
+    return executor
+
+
+def _reset_executors_after_fork() -> None:
+    for executor in _executors:
+        executor._reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_executors_after_fork)
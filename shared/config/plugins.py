@@ -0,0 +1,171 @@
+"""Entry-point discovery of API routers and Celery task modules.
+
+Packages advertise what they provide under two entry-point groups::
+
+    [project.entry-points."codeping.routers"]
+    webhook_receiver = "yeonjae_universal_webhook_receiver.router:router"
+
+    [project.entry-points."codeping.tasks"]
+    webhook_receiver = "yeonjae_universal_webhook_receiver.tasks"
+
+Packages released before these groups existed are covered by
+``BUILTIN_PLUGINS``; an installed entry point with the same name wins.
+``PLUGINS_ENABLED`` / ``PLUGINS_DISABLED`` select what a node loads, and
+nothing is imported until a selected plugin is loaded.
+
+Scanning installed distributions grows with every package, so results are
+cached per process and, when ``PLUGIN_CACHE_PATH`` is set, in a JSON file
+keyed by the modification times of the ``sys.path`` directories (installing
+or removing a package changes them).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+import threading
+from dataclasses import dataclass
+from importlib import import_module
+from typing import Any, Dict, Iterable, List, Optional
+
+from .settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+ROUTER_GROUP = "codeping.routers"
+TASK_GROUP = "codeping.tasks"
+
+# Fallback for packages that do not declare entry points yet
+BUILTIN_PLUGINS: Dict[str, Dict[str, str]] = {
+    ROUTER_GROUP: {
+        "webhook_receiver": "yeonjae_universal_webhook_receiver.router:router",
+    },
+    TASK_GROUP: {
+        "webhook_receiver": "yeonjae_universal_webhook_receiver.tasks",
+        "notion_sync": "yeonjae_universal_notion_sync.tasks",
+        # Binds the webhook task to the buffered event storage path
+        "event_storage": "modules.event_storage.tasks",
+    },
+}
+
+_cache: Dict[str, Dict[str, str]] = {}
+_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Plugin:
+    """One discovered router or task module (``module`` or ``module:attribute``)."""
+
+    name: str
+    group: str
+    value: str
+
+    @property
+    def module(self) -> str:
+        return self.value.partition(":")[0]
+
+    def load(self) -> Any:
+        """Import the module and return the referenced attribute (or the module)."""
+        module_name, _, attribute = self.value.partition(":")
+        target = import_module(module_name)
+        for part in filter(None, attribute.split(".")):
+            target = getattr(target, part)
+        return target
+
+
+def _fingerprint() -> List[List[Any]]:
+    fingerprint = []
+    for entry in sys.path:
+        path = os.path.abspath(entry or os.curdir)
+        try:
+            fingerprint.append([path, os.stat(path).st_mtime_ns])
+        except OSError:
+            continue
+    return fingerprint
+
+
+def _scan() -> Dict[str, Dict[str, str]]:
+    from importlib.metadata import entry_points
+
+    return {
+        group: {entry.name: entry.value for entry in entry_points(group=group)}
+        for group in (ROUTER_GROUP, TASK_GROUP)
+    }
+
+
+def _read_cache_file(
+    path: str, fingerprint: List[List[Any]]
+) -> Optional[Dict[str, Dict[str, str]]]:
+    try:
+        with open(path, encoding="utf-8") as handle:
+            cached = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("fingerprint") != fingerprint:
+        return None
+    return cached.get("entry_points")
+
+
+def _write_cache_file(
+    path: str, fingerprint: List[List[Any]], discovered: Dict[str, Dict[str, str]]
+) -> None:
+    # Write-then-rename so concurrent boots never read a partial file
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump({"fingerprint": fingerprint, "entry_points": discovered}, handle)
+        os.replace(temporary, path)
+    except OSError as exc:
+        logger.warning("Could not write plugin cache %s: %s", path, exc)
+
+
+def discover_entry_points(
+    cache_path: Optional[str] = None,
+) -> Dict[str, Dict[str, str]]:
+    """``{group: {name: value}}`` of installed entry points, cached."""
+    with _cache_lock:
+        if not _cache:
+            discovered = None
+            fingerprint = _fingerprint() if cache_path else None
+            if cache_path:
+                discovered = _read_cache_file(cache_path, fingerprint)
+            if discovered is None:
+                discovered = _scan()
+                if cache_path:
+                    _write_cache_file(cache_path, fingerprint, discovered)
+            _cache.update(discovered)
+        return _cache
+
+
+def clear_plugin_cache() -> None:
+    """Forget in-process discovery results (the cache file revalidates itself)."""
+    with _cache_lock:
+        _cache.clear()
+
+
+def _selected(name: str, enabled: Iterable[str], disabled: Iterable[str]) -> bool:
+    enabled = list(enabled)
+    return (not enabled or name in enabled) and name not in disabled
+
+
+def get_plugins(group: str, settings: Any = None) -> List[Plugin]:
+    """Plugins of ``group`` selected by the enable/disable lists, sorted by name."""
+    settings = settings or get_settings()
+    available = dict(BUILTIN_PLUGINS.get(group, {}))
+    available.update(discover_entry_points(settings.plugin_cache_path).get(group, {}))
+    return [
+        Plugin(name, group, value)
+        for name, value in sorted(available.items())
+        if _selected(name, settings.plugins_enabled, settings.plugins_disabled)
+    ]
+
+
+def get_router_plugins(settings: Any = None) -> List[Plugin]:
+    return get_plugins(ROUTER_GROUP, settings)
+
+
+def get_task_plugins(settings: Any = None) -> List[Plugin]:
+    return get_plugins(TASK_GROUP, settings)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from functools import lru_cache
-from typing import Optional
+from typing import Dict, List, Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -10,11 +10,58 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     """Application configuration settings loaded from environment variables."""
 
+    # API startup
+    lazy_router_loading: bool = Field(
+        default=True,
+        description="Import feature routers on the first non-probe request",
+    )
+
+    # Plugins (entry points "codeping.routers" / "codeping.tasks")
+    plugins_enabled: List[str] = Field(
+        default_factory=list,
+        description="Plugin names this node loads (empty = every discovered plugin)",
+    )
+
+    plugins_disabled: List[str] = Field(
+        default_factory=list,
+        description='Plugin names never loaded on this node, e.g. ["notion_sync"]',
+    )
+
+    plugin_cache_path: Optional[str] = Field(
+        default=None,
+        description="JSON file caching plugin discovery across restarts (unset = off)",
+    )
+
     # Database
     database_url: str = Field(
         default="sqlite+aiosqlite:///./dev.db", description="Database connection URL"
     )
 
+    database_migrate_on_startup: bool = Field(
+        default=True,
+        description="Run pending migrations on API startup (off if a deploy step does)",
+    )
+
+    db_pool_size: int = Field(
+        default=5, description="Persistent connections kept per engine pool"
+    )
+
+    db_max_overflow: int = Field(
+        default=10, description="Extra connections allowed beyond the pool size"
+    )
+
+    db_pool_timeout: int = Field(
+        default=30, description="Seconds to wait for a pooled connection"
+    )
+
+    db_pool_pre_ping: bool = Field(
+        default=True, description="Test pooled connections before handing them out"
+    )
+
+    db_pool_recycle: int = Field(
+        default=1800, description="Recycle pooled connections after N seconds (-1 off)"
+    )
+
     # GitHub Webhook
     github_webhook_secret: str = Field(
         default="changeme", description="GitHub webhook signature verification secret"
@@ -29,6 +76,150 @@ class Settings(BaseSettings):
         default=False, description="Test WebhookReceiver module only (no storage)"
     )
 
+    # Batched event persistence (write-behind buffer for the events table)
+    event_write_buffer_enabled: bool = Field(
+        default=True, description="Webhook task inserts events through the buffer"
+    )
+
+    event_write_batch_size: int = Field(
+        default=500, description="Rows per multi-row INSERT / COPY batch"
+    )
+
+    event_write_flush_interval_ms: int = Field(
+        default=50,
+        description="Longest an async-mode event lingers before its batch is flushed",
+    )
+
+    event_write_durability: str = Field(
+        default="sync",
+        description="sync: wait for the batch commit; async: fire-and-forget",
+    )
+
+    event_write_max_buffered: int = Field(
+        default=10000, description="Buffered rows before writers block (backpressure)"
+    )
+
+    event_write_use_copy: bool = Field(
+        default=True, description="Use COPY on PostgreSQL with the psycopg 3 driver"
+    )
+
+    # compressed empties events.payload: only once every reader uses
+    # load_event_payload (yeonjae_universal_data_retriever still does not)
+    event_payload_storage: str = Field(
+        default="inline",
+        description="inline: events.payload; compressed: event_payloads side table",
+    )
+
+    event_payload_codec: str = Field(
+        default="auto",
+        description="Payload compression: auto (zstd if installed), zstd, gzip",
+    )
+
+    # events time partitioning and retention
+    event_partitioning_enabled: bool = Field(
+        default=False,
+        description="events is partitioned by month (scripts/partition_events.py)",
+    )
+
+    event_partition_months_ahead: int = Field(
+        default=3, description="Monthly events partitions created ahead of time"
+    )
+
+    event_retention_months: int = Field(
+        default=0, description="Months of events kept (0 disables retention)"
+    )
+
+    event_retention_mode: str = Field(
+        default="drop",
+        description="drop: drop expired partitions; archive: move to archive schema",
+    )
+
+    event_archive_schema: str = Field(
+        default="events_archive",
+        description="Schema receiving archived events partitions",
+    )
+
+    # Incrementally maintained hourly/daily event rollups
+    event_rollups_enabled: bool = Field(
+        default=True,
+        description="Update event_rollups_* in the same transaction as event inserts",
+    )
+
+    event_rollup_hourly_retention_days: int = Field(
+        default=35,
+        description="Days of hourly rollups kept by compaction (daily ones are kept)",
+    )
+
+    # Read API over events (GET /events, GET /events/export)
+    event_query_enabled: bool = Field(
+        default=True, description="Mount the keyset-paginated events read API"
+    )
+
+    event_query_max_page_size: int = Field(
+        default=500, description="Upper bound on GET /events ?limit="
+    )
+
+    event_query_export_chunk_size: int = Field(
+        default=1000,
+        description="Rows fetched per keyset query while streaming an export",
+    )
+
+    # Webhook ingest fast path (verify → durable enqueue → 202)
+    webhook_ingest_enabled: bool = Field(
+        default=False,
+        description="Serve /webhook via the enqueue-only fast path and a drainer",
+    )
+
+    webhook_ingest_queue_path: str = Field(
+        default="./webhook_ingest.db",
+        description="SQLite file backing the ingest queue",
+    )
+
+    webhook_ingest_synchronous: str = Field(
+        default="NORMAL",
+        description="SQLite synchronous mode for the ingest queue (NORMAL or FULL)",
+    )
+
+    webhook_ingest_max_attempts: int = Field(
+        default=5, description="Dispatch attempts before a delivery is left as dead"
+    )
+
+    webhook_ingest_batch_size: int = Field(
+        default=50, description="Deliveries the drainer processes per batch"
+    )
+
+    webhook_ingest_poll_interval_ms: int = Field(
+        default=50, description="Drainer idle poll interval in milliseconds"
+    )
+
+    # Webhook delivery deduplication (X-GitHub-Delivery + repo/ref/head SHA)
+    webhook_dedup_enabled: bool = Field(
+        default=True,
+        description="Reject redelivered pushes before parsing and dispatch",
+    )
+
+    webhook_dedup_cache_size: int = Field(
+        default=100000, description="Delivery keys kept in the in-process LRU"
+    )
+
+    webhook_dedup_in_flight_timeout_seconds: float = Field(
+        default=600.0,
+        description="Age after which an undispatched claim may be taken over",
+    )
+
+    # Push coalescing (merge bursts per repository/ref before Celery dispatch)
+    webhook_coalesce_enabled: bool = Field(
+        default=False, description="Merge bursts of pushes to one ref into one task"
+    )
+
+    webhook_coalesce_window_ms: int = Field(
+        default=500, description="Longest a push waits for others to the same ref"
+    )
+
+    webhook_coalesce_max_pushes: int = Field(
+        default=20, description="Pushes merged into one task before dispatching early"
+    )
+
     # Notion API Integration
     notion_token: Optional[str] = Field(
         default=None, description="Notion API token for documentation sync"
@@ -55,6 +246,123 @@ class Settings(BaseSettings):
         default=True, description="Propagate exceptions when using eager mode"
     )
 
+    # In-process executor (CELERY_ALWAYS_EAGER=true: no broker, tasks run here)
+    inprocess_executor_max_workers: int = Field(
+        default=8, description="Threads running blocking tasks in eager mode"
+    )
+
+    inprocess_executor_max_pending: int = Field(
+        default=1000,
+        description="Queued + running tasks before send_task applies backpressure",
+    )
+
+    inprocess_executor_submit_timeout_seconds: float = Field(
+        default=5.0,
+        description="How long send_task waits for a free slot before failing",
+    )
+
+    inprocess_executor_task_limits: Dict[str, int] = Field(
+        default_factory=lambda: {"notion_sync.sync_documentation": 1},
+        description="Per-task concurrency limits (task name -> max running tasks)",
+    )
+
+    inprocess_executor_drain_timeout_seconds: float = Field(
+        default=30.0, description="Shutdown wait for in-flight in-process tasks"
+    )
+
+    # Celery queues and routing (webhook = latency-sensitive, bulk = Notion sync)
+    celery_default_queue: str = Field(
+        default="celery", description="Queue for tasks without an explicit route"
+    )
+
+    celery_webhook_queue: str = Field(
+        default="webhook_queue", description="Latency-sensitive queue for webhook tasks"
+    )
+
+    celery_bulk_queue: str = Field(
+        default="bulk", description="Queue for long-running work such as Notion sync"
+    )
+
+    celery_max_priority: int = Field(
+        default=9, description="Highest task priority (0 disables broker priorities)"
+    )
+
+    celery_webhook_priority: int = Field(
+        default=9, description="Priority of webhook tasks (higher runs first)"
+    )
+
+    celery_bulk_priority: int = Field(
+        default=0, description="Priority of bulk tasks (higher runs first)"
+    )
+
+    celery_webhook_prefetch_multiplier: int = Field(
+        default=1,
+        description="Prefetch multiplier for workers consuming the webhook queue",
+    )
+
+    celery_bulk_prefetch_multiplier: int = Field(
+        default=4,
+        description="Prefetch multiplier for workers consuming the bulk queue",
+    )
+
+    # Celery worker profiles (run_worker.py): pool type and autoscale bounds
+    celery_webhook_worker_pool: str = Field(
+        default="threads",
+        description="Webhook worker pool: prefork, threads, gevent or eventlet",
+    )
+
+    celery_webhook_worker_min_concurrency: int = Field(
+        default=4, description="Minimum webhook worker concurrency (prefork autoscale)"
+    )
+
+    celery_webhook_worker_max_concurrency: int = Field(
+        default=32, description="Maximum webhook worker concurrency"
+    )
+
+    celery_bulk_worker_pool: str = Field(
+        default="prefork", description="Pool for the CPU-bound bulk worker"
+    )
+
+    celery_bulk_worker_min_concurrency: int = Field(
+        default=1, description="Minimum bulk worker processes (prefork autoscale)"
+    )
+
+    celery_bulk_worker_max_concurrency: int = Field(
+        default=4, description="Maximum bulk worker processes"
+    )
+
+    # Celery results: ignored unless a task is listed in celery_result_tasks
+    celery_task_ignore_result: bool = Field(
+        default=True, description="Skip storing results for fire-and-forget tasks"
+    )
+
+    celery_result_tasks: List[str] = Field(
+        default_factory=list,
+        description="Task names whose results are stored (callers awaiting .get())",
+    )
+
+    celery_result_backend: Optional[str] = Field(
+        default=None, description="Result backend URL (defaults to the broker URL)"
+    )
+
+    celery_result_expires_seconds: int = Field(
+        default=3600, description="How long stored task results are kept"
+    )
+
+    push_status_tracking_enabled: bool = Field(
+        default=True, description="Record webhook pipeline progress in push_status"
+    )
+
+    celery_task_acks_late: bool = Field(
+        default=True,
+        description="Acknowledge tasks after they finish (redeliver on crash)",
+    )
+
+    celery_visibility_timeout_seconds: int = Field(
+        default=7200,
+        description="Redis redelivery timeout for unacked tasks (> longest task)",
+    )
+
     # AWS S3
     aws_access_key_id: Optional[str] = Field(
         default=None, description="AWS access key for S3 uploads"
@@ -70,6 +378,50 @@ class Settings(BaseSettings):
 
     aws_region: str = Field(default="us-east-1", description="AWS region for S3 bucket")
 
+    s3_multipart_threshold_bytes: int = Field(
+        default=8 * 1024 * 1024,
+        description="Uploads at or above this size use concurrent multipart upload",
+    )
+
+    s3_multipart_part_size_bytes: int = Field(
+        default=8 * 1024 * 1024,
+        description="Multipart part size (S3 minimum is 5 MiB)",
+    )
+
+    s3_upload_max_concurrency: int = Field(
+        default=4, description="In-flight parts per S3 multipart upload"
+    )
+
+    s3_max_pool_connections: int = Field(
+        default=32, description="botocore connection pool size (and upload threads)"
+    )
+
+    s3_batch_max_concurrency: int = Field(
+        default=8, description="Objects uploaded in parallel by upload_diffs_batch"
+    )
+
+    s3_dedup_cache_size: int = Field(
+        default=10000, description="Content-addressed keys remembered as present"
+    )
+
+    s3_dedup_index_enabled: bool = Field(
+        default=False,
+        description="Track diff blobs and reference counts in the diff_blobs table",
+    )
+
+    s3_presign_cache_size: int = Field(
+        default=1024, description="Presigned URLs kept in the in-process LRU cache"
+    )
+
+    s3_presign_reuse_fraction: float = Field(
+        default=0.5,
+        description="Share of a presigned URL's lifetime during which it is reused",
+    )
+
+    s3_presign_cache_redis_url: Optional[str] = Field(
+        default=None, description="Redis URL to share presigned URLs across replicas"
+    )
+
     # Slack (future)
     slack_webhook_url: Optional[str] = Field(
         default=None, description="Slack webhook URL for notifications"
@@ -78,6 +430,61 @@ class Settings(BaseSettings):
     # Logging
     log_level: str = Field(default="INFO", description="Logging level")
 
+    log_flow_format: str = Field(
+        default="pretty",
+        description="Flow log format: 'pretty' (indented) or 'compact' (one line)",
+    )
+
+    log_json_backend: str = Field(
+        default="auto", description="Flow log JSON encoder: 'auto', 'orjson' or 'json'"
+    )
+
+    log_flow_sample_rates: Dict[str, float] = Field(
+        default_factory=dict,
+        description='Per-module flow log sampling, e.g. {"DiffAnalyzer": 0.1}',
+    )
+
+    log_async_enabled: bool = Field(
+        default=False, description="Ship flow/module logs through a background queue"
+    )
+
+    log_queue_maxsize: int = Field(
+        default=10000, description="Maximum records buffered in the log queue"
+    )
+
+    log_queue_overflow_policy: str = Field(
+        default="drop_oldest",
+        description="Log queue overflow policy: 'drop_oldest' or 'drop_newest'",
+    )
+
+    # Tracing
+    tracing_enabled: bool = Field(
+        default=False, description="Record processing-chain spans and export them"
+    )
+
+    tracing_exporter: str = Field(
+        default="file", description="Span exporter: 'file' (JSON lines) or 'otlp'"
+    )
+
+    tracing_file_path: str = Field(
+        default="./traces.jsonl", description="Output file for the file exporter"
+    )
+
+    tracing_otlp_endpoint: str = Field(
+        default="http://localhost:4318/v1/traces",
+        description="OTLP/HTTP JSON collector endpoint",
+    )
+
+    tracing_service_name: str = Field(
+        default="codeping-api", description="service.name attached to exported spans"
+    )
+
+    tracing_batch_size: int = Field(default=256, description="Spans exported per batch")
+
+    tracing_flush_interval_seconds: float = Field(
+        default=2.0, description="Maximum delay before buffered spans are exported"
+    )
+
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
 
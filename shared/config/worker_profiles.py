@@ -0,0 +1,91 @@
+"""Celery worker profiles: queues, pool type and autoscale bounds per stage."""
+
+from __future__ import annotations
+
+import importlib.util
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+from .settings import get_settings
+
+POOL_TYPES = ("prefork", "threads", "gevent", "eventlet", "solo")
+# Only the prefork pool supports Celery's --autoscale
+AUTOSCALING_POOLS = ("prefork",)
+
+
+@dataclass(frozen=True)
+class WorkerProfile:
+    """One worker process type (e.g. I/O-bound webhook, CPU-bound bulk)."""
+
+    name: str
+    queues: List[str]
+    pool: str
+    min_concurrency: int
+    max_concurrency: int
+    prefetch_multiplier: int
+
+    def worker_argv(self, loglevel: str = "info") -> List[str]:
+        """Arguments for ``celery_app.worker_main``."""
+        argv = [
+            "worker",
+            f"--loglevel={loglevel}",
+            f"--pool={self.pool}",
+            f"--queues={','.join(self.queues)}",
+            f"--prefetch-multiplier={self.prefetch_multiplier}",
+            f"--hostname={self.name}@%h",
+        ]
+        if (
+            self.pool in AUTOSCALING_POOLS
+            and self.min_concurrency < self.max_concurrency
+        ):
+            argv.append(f"--autoscale={self.max_concurrency},{self.min_concurrency}")
+        else:
+            # Thread and green pools are sized once; use the upper bound
+            argv.append(f"--concurrency={self.max_concurrency}")
+        return argv
+
+
+def _validate_pool(profile: str, pool: str) -> None:
+    if pool not in POOL_TYPES:
+        raise ValueError(
+            f"Unknown pool '{pool}' for worker profile '{profile}' "
+            f"(expected one of {', '.join(POOL_TYPES)})"
+        )
+    if pool in ("gevent", "eventlet") and importlib.util.find_spec(pool) is None:
+        raise ValueError(
+            f"Worker profile '{profile}' uses the {pool} pool "
+            f"but {pool} is not installed"
+        )
+
+
+def get_worker_profiles(settings: Any = None) -> Dict[str, WorkerProfile]:
+    """Worker profiles configured in settings, keyed by name."""
+    settings = settings or get_settings()
+
+    profiles = {
+        "webhook": WorkerProfile(
+            name="webhook",
+            queues=[settings.celery_webhook_queue, settings.celery_default_queue],
+            pool=settings.celery_webhook_worker_pool,
+            min_concurrency=settings.celery_webhook_worker_min_concurrency,
+            max_concurrency=settings.celery_webhook_worker_max_concurrency,
+            prefetch_multiplier=settings.celery_webhook_prefetch_multiplier,
+        ),
+        "bulk": WorkerProfile(
+            name="bulk",
+            queues=[settings.celery_bulk_queue],
+            pool=settings.celery_bulk_worker_pool,
+            min_concurrency=settings.celery_bulk_worker_min_concurrency,
+            max_concurrency=settings.celery_bulk_worker_max_concurrency,
+            prefetch_multiplier=settings.celery_bulk_prefetch_multiplier,
+        ),
+    }
+
+    for profile in profiles.values():
+        _validate_pool(profile.name, profile.pool)
+        if not 1 <= profile.min_concurrency <= profile.max_concurrency:
+            raise ValueError(
+                f"Worker profile '{profile.name}' needs "
+                f"1 <= min_concurrency <= max_concurrency"
+            )
+    return profiles
@@ -7,17 +7,46 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
 import logging
+import logging.handlers
+import queue
+import random
+import sys
+import threading
 import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Tuple
 from types import MappingProxyType
 
+from shared.utils import tracing
+from shared.utils.metrics import latency_metrics
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # 모듈 흐름 추적을 위한 전용 로거
 flow_logger = logging.getLogger("module_flow")
 flow_logger.setLevel(logging.INFO)
 
+# Flow 로그 출력 설정 (configure_flow_logging 으로 변경)
+# - compact: 한 줄 JSON 출력 여부
+# - use_orjson: orjson 직렬화 사용 여부
+_flow_config = {"compact": False, "use_orjson": False}
+
+# 모듈별 flow 로그 샘플링 비율 (0.0 ~ 1.0, 미지정 시 1.0)
+module_sample_rates: Dict[str, float] = {}
+
 # 각 모듈별 로거
 module_loggers = {
     "WebhookReceiver": logging.getLogger("modules.webhook_receiver"),
@@ -29,8 +58,165 @@ module_loggers = {
 }
 
 
+def configure_flow_logging(
+    compact: bool = False,
+    json_backend: str = "auto",
+    sample_rates: Optional[Dict[str, float]] = None,
+):
+    """Flow 로그 포맷, JSON 백엔드, 모듈별 샘플링 비율 설정"""
+    _flow_config["compact"] = compact
+    _flow_config["use_orjson"] = ORJSON_AVAILABLE and json_backend in (
+        "auto",
+        "orjson",
+    )
+    if json_backend == "orjson" and not ORJSON_AVAILABLE:
+        logging.getLogger(__name__).warning(
+            "orjson not installed, falling back to json for flow logs"
+        )
+
+    module_sample_rates.clear()
+    for module_name, rate in (sample_rates or {}).items():
+        module_sample_rates[module_name] = min(max(float(rate), 0.0), 1.0)
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """크기 제한 큐로 레코드를 넘기는 핸들러 (가득 차면 drop 정책 적용)
+
+    - drop_oldest: 가장 오래된 레코드를 버리고 새 레코드를 넣음
+    - drop_newest: 새 레코드를 버림
+    """
+
+    def __init__(self, log_queue: queue.Queue, overflow_policy: str = "drop_oldest"):
+        super().__init__(log_queue)
+        if overflow_policy not in ("drop_oldest", "drop_newest"):
+            raise ValueError(f"Unknown log queue overflow policy: {overflow_policy}")
+        self.overflow_policy = overflow_policy
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+
+        if self.overflow_policy == "drop_oldest":
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                pass
+
+        with self._dropped_lock:
+            self.dropped += 1
+
+
+class _RoutingHandler(logging.Handler):
+    """QueueListener 에서 레코드를 원래 로거의 핸들러로 전달"""
+
+    def __init__(self, handlers: Dict[str, logging.Handler]):
+        super().__init__()
+        self.handlers = handlers
+
+    def emit(self, record: logging.LogRecord):
+        handler = self.handlers.get(record.name)
+        if handler is not None:
+            handler.handle(record)
+
+
+# 비동기 로그 전송 상태 (setup_detailed_logging 에서 설정)
+_async_logging: Dict[str, Any] = {"handler": None, "listener": None}
+
+
+def _attach_handlers(handlers: Dict[logging.Logger, logging.Handler], settings):
+    """로거에 핸들러 연결 (비동기 모드면 공유 QueueHandler 를 연결)"""
+    if not settings.log_async_enabled:
+        for logger, handler in handlers.items():
+            logger.addHandler(handler)
+        return
+
+    shutdown_logging()
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.log_queue_maxsize)
+    queue_handler = BoundedQueueHandler(
+        log_queue, overflow_policy=settings.log_queue_overflow_policy
+    )
+    listener = _DrainingQueueListener(
+        log_queue,
+        _RoutingHandler({logger.name: handler for logger, handler in handlers.items()}),
+    )
+    for logger in handlers:
+        logger.addHandler(queue_handler)
+
+    _async_logging["handler"] = queue_handler
+    _async_logging["listener"] = listener
+    listener.start()
+
+
+class _DrainingQueueListener(logging.handlers.QueueListener):
+    """종료 신호를 블로킹 put 으로 넣는 QueueListener
+
+    기본 구현은 put_nowait 이라 큐가 가득 차 있으면 queue.Full 로 실패하고
+    리스너 스레드가 종료되지 않습니다. 리스너가 큐를 비우는 동안 기다립니다.
+    """
+
+    sentinel_timeout = 5.0
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel, timeout=self.sentinel_timeout)
+
+
+def shutdown_logging():
+    """비동기 로그 큐를 비우고 리스너 종료 (애플리케이션 종료 시 호출)"""
+    listener = _async_logging["listener"]
+    queue_handler = _async_logging["handler"]
+    if listener is not None:
+        try:
+            listener.stop()  # 큐에 남은 레코드를 모두 처리한 뒤 종료
+        except queue.Full:
+            # 리스너가 멈춰 큐가 비워지지 않음: 데몬 스레드이므로 두고 종료
+            sys.stderr.write("log queue listener did not drain; records dropped\n")
+    if queue_handler is not None:
+        for logger in [flow_logger, *module_loggers.values()]:
+            logger.removeHandler(queue_handler)
+    _async_logging["listener"] = None
+    _async_logging["handler"] = None
+
+
+def get_log_queue_stats() -> Dict[str, Any]:
+    """비동기 로그 큐 상태 및 드롭 카운터"""
+    queue_handler = _async_logging["handler"]
+    if queue_handler is None:
+        return {"enabled": False, "queued": 0, "dropped": 0}
+    return {
+        "enabled": True,
+        "queued": queue_handler.queue.qsize(),
+        "maxsize": queue_handler.queue.maxsize,
+        "overflow_policy": queue_handler.overflow_policy,
+        "dropped": queue_handler.dropped,
+    }
+
+
 def setup_detailed_logging():
-    """상세한 로깅 설정"""
+    """상세한 로깅 설정
+
+    LOG_ASYNC_ENABLED=true 이면 StreamHandler 대신 QueueHandler/QueueListener 를
+    사용해 느린 stdout 이 이벤트 루프와 Celery 태스크를 막지 않도록 합니다.
+    """
+
+    # Flow 로그 포맷/샘플링 설정 (Settings 기반)
+    from shared.config.settings import get_settings
+
+    settings = get_settings()
+    configure_flow_logging(
+        compact=settings.log_flow_format.lower() == "compact",
+        json_backend=settings.log_json_backend.lower(),
+        sample_rates=settings.log_flow_sample_rates,
+    )
 
     # 전체 로깅 포맷 설정
     formatter = logging.Formatter(
@@ -48,8 +234,8 @@ def setup_detailed_logging():
     )
     flow_handler = logging.StreamHandler()
     flow_handler.setFormatter(flow_formatter)
-    flow_logger.addHandler(flow_handler)
     flow_logger.propagate = False
+    handlers: Dict[logging.Logger, logging.Handler] = {flow_logger: flow_handler}
 
     # 각 모듈 로거 설정
     for module_name, logger in module_loggers.items():
@@ -60,52 +246,270 @@ def setup_detailed_logging():
         )
         module_handler = logging.StreamHandler()
         module_handler.setFormatter(module_formatter)
-        logger.addHandler(module_handler)
+        handlers[logger] = module_handler
         logger.propagate = False
 
+    _attach_handlers(handlers, settings)
+
+
+# 컨텍스트(요청/태스크/스레드)별 상태: 하나의 ModuleIOLogger 를 동시에 공유해도
+# 타이밍이 섞이지 않도록 인스턴스 대신 contextvars 에 저장합니다.
+_correlation_id: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
+_span_stack: ContextVar[Tuple["SpanFrame", ...]] = ContextVar(
+    "module_io_spans", default=()
+)
+_pending_starts: ContextVar[Mapping[Tuple[str, str], float]] = ContextVar(
+    "module_io_pending_starts", default=MappingProxyType({})
+)
+
+
+def get_correlation_id() -> Optional[str]:
+    """현재 컨텍스트의 push 단위 correlation ID"""
+    return _correlation_id.get()
+
+
+def set_correlation_id(correlation_id: Optional[str]):
+    """correlation ID 설정 후 reset_correlation_id 에 넘길 토큰 반환"""
+    return _correlation_id.set(correlation_id)
+
+
+def reset_correlation_id(token) -> None:
+    _correlation_id.reset(token)
+
+
+@contextmanager
+def correlation_scope(correlation_id: Optional[str] = None) -> Iterator[str]:
+    """블록 안의 모든 로그/스팬에 correlation ID 부여 (없으면 새로 생성)"""
+    correlation_id = correlation_id or uuid.uuid4().hex
+    token = _correlation_id.set(correlation_id)
+    try:
+        yield correlation_id
+    finally:
+        _correlation_id.reset(token)
+
+
+class CorrelationIdMiddleware:
+    """GitHub delivery ID(X-GitHub-Delivery)를 요청 전체의 correlation ID 로 사용
+
+    헤더가 없으면 새 ID 를 만들고, 응답 헤더 X-Correlation-ID 로 돌려줍니다.
+    """
+
+    def __init__(self, app, header_name: str = "x-github-delivery"):
+        self.app = app
+        self.header_name = header_name.lower().encode("latin-1")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = None
+        for name, value in scope.get("headers", ()):
+            if name == self.header_name:
+                incoming = value.decode("latin-1")
+                break
+
+        with correlation_scope(incoming) as correlation_id:
+
+            async def send_with_header(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", ()))
+                    headers.append((b"x-correlation-id", correlation_id.encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_header)
+
+
+@dataclass
+class SpanFrame:
+    """진행 중인 스팬 하나 (컨텍스트별 스택에 쌓임)"""
+
+    module_name: str
+    operation: str
+    started: float
+    parent: Optional["SpanFrame"] = None
+    output: Any = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    token: Any = field(default=None, repr=False)
+    trace_span: Any = field(default=None, repr=False)
+    trace_token: Any = field(default=None, repr=False)
+
+    @property
+    def depth(self) -> int:
+        return 0 if self.parent is None else self.parent.depth + 1
+
+
+class _Span:
+    """``with io_logger.span("parse"):`` / ``@io_logger.span("parse")`` 구현
+
+    호출별 상태는 모두 contextvars 스택에 있으므로 하나의 _Span 을 데코레이터로
+    공유해 동시에 실행해도 안전합니다.
+    """
+
+    def __init__(
+        self, io_logger: "ModuleIOLogger", operation: str, data: Any, metadata
+    ):
+        self._io_logger = io_logger
+        self._operation = operation
+        self._data = data
+        self._metadata = metadata
+
+    def __enter__(self) -> SpanFrame:
+        stack = _span_stack.get()
+        frame = SpanFrame(
+            module_name=self._io_logger.module_name,
+            operation=self._operation,
+            started=time.perf_counter(),
+            parent=stack[-1] if stack else None,
+            metadata=dict(self._metadata or {}),
+        )
+        frame.token = _span_stack.set(stack + (frame,))
+        frame.trace_span, frame.trace_token = tracing.start_span(
+            f"{frame.module_name}.{self._operation}", self._metadata
+        )
+        self._io_logger._emit_input(self._operation, self._data, self._metadata)
+        return frame
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        frame = _span_stack.get()[-1]
+        duration = time.perf_counter() - frame.started
+        tracing.end_span(frame.trace_span, frame.trace_token, exc)
+        _span_stack.reset(frame.token)
+
+        metadata = frame.metadata
+        parent = frame.parent
+        if parent is not None:
+            metadata = {
+                **metadata,
+                "parent_operation": f"{parent.module_name}.{parent.operation}",
+                "depth": frame.depth,
+            }
+
+        if exc is None:
+            self._io_logger._emit_output(
+                self._operation, duration, frame.output, metadata
+            )
+        else:
+            self._io_logger._emit_error(self._operation, duration, exc, metadata)
+        return False
+
+    async def __aenter__(self) -> SpanFrame:
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        return self.__exit__(exc_type, exc, tb)
+
+    def __call__(self, func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with self as frame:
+                    frame.output = await func(*args, **kwargs)
+                    return frame.output
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self as frame:
+                frame.output = func(*args, **kwargs)
+                return frame.output
+
+        return wrapper
+
 
 class ModuleIOLogger:
-    """모듈별 입출력 로깅 클래스"""
+    """모듈별 입출력 로깅 클래스
+
+    ``span()`` 은 컨텍스트 매니저/데코레이터로 중첩을 지원합니다. 기존
+    ``log_input``/``log_output`` 쌍도 시작 시각을 contextvars 에 저장하므로
+    동시 요청 간에 실행 시간이 섞이지 않습니다.
+    """
 
     def __init__(self, module_name: str):
         self.module_name = module_name
         self.logger = module_loggers.get(
             module_name, logging.getLogger(f"modules.{module_name.lower()}")
         )
-        self.start_time = None
+
+    def span(self, operation: str, data: Any = None, metadata: Dict = None) -> _Span:
+        """입력/출력/오류 로깅과 타이밍을 묶는 스팬"""
+        return _Span(self, operation, data, metadata)
 
     def log_input(self, operation: str, data: Any = None, metadata: Dict = None):
         """모듈 입력 데이터 로깅"""
-        self.start_time = time.time()
+        starts = dict(_pending_starts.get())
+        starts[(self.module_name, operation)] = time.perf_counter()
+        _pending_starts.set(starts)
 
-        # 입력 데이터 요약
-        input_summary = self._summarize_data(data, max_items=5)
+        self._emit_input(operation, data, metadata)
 
-        self.logger.info(f"🔵 INPUT  | {operation}")
-        if input_summary:
-            self.logger.info(f"📥 Data   | {input_summary}")
-        if metadata:
-            self.logger.info(f"ℹ️  Meta   | {metadata}")
+    def log_output(self, operation: str, data: Any = None, metadata: Dict = None):
+        """모듈 출력 데이터 로깅"""
+        duration = self._pop_duration(operation)
+        if duration is not None:
+            tracing.record_span(f"{self.module_name}.{operation}", duration, metadata)
+        self._emit_output(operation, duration, data, metadata)
+
+    def log_error(self, operation: str, error: Exception, metadata: Dict = None):
+        """모듈 오류 로깅"""
+        duration = self._pop_duration(operation)
+        if duration is not None:
+            tracing.record_span(
+                f"{self.module_name}.{operation}", duration, metadata, error
+            )
+        self._emit_error(operation, duration, error, metadata)
+
+    def _pop_duration(self, operation: str) -> Optional[float]:
+        starts = _pending_starts.get()
+        started = starts.get((self.module_name, operation))
+        if started is None:
+            return None
+
+        remaining = dict(starts)
+        del remaining[(self.module_name, operation)]
+        _pending_starts.set(remaining)
+        return time.perf_counter() - started
+
+    def _emit_input(self, operation: str, data: Any, metadata: Optional[Dict]):
+        if self.logger.isEnabledFor(logging.INFO):
+            # 입력 데이터 요약
+            input_summary = self._summarize_data(data, max_items=5)
+
+            self.logger.info(f"🔵 INPUT  | {operation}")
+            if input_summary:
+                self.logger.info(f"📥 Data   | {input_summary}")
+            if metadata:
+                self.logger.info(f"ℹ️  Meta   | {metadata}")
 
         # Flow 로거에도 기록
         log_module_io(
             self.module_name, f"{operation}_INPUT", input_data=data, metadata=metadata
         )
 
-    def log_output(self, operation: str, data: Any = None, metadata: Dict = None):
-        """모듈 출력 데이터 로깅"""
-
-        # 실행 시간 계산
-        duration = time.time() - self.start_time if self.start_time else 0
-
-        # 출력 데이터 요약
-        output_summary = self._summarize_data(data, max_items=5)
-
-        self.logger.info(f"🟢 OUTPUT | {operation} (⏱️ {duration:.3f}s)")
-        if output_summary:
-            self.logger.info(f"📤 Result | {output_summary}")
-        if metadata:
-            self.logger.info(f"ℹ️  Meta   | {metadata}")
+    def _emit_output(
+        self,
+        operation: str,
+        duration: Optional[float],
+        data: Any,
+        metadata: Optional[Dict],
+    ):
+        # 히스토그램 집계 (시작 시각을 알 때만)
+        if duration is not None:
+            latency_metrics.observe(self.module_name, operation, duration)
+        duration = duration or 0
+
+        if self.logger.isEnabledFor(logging.INFO):
+            # 출력 데이터 요약
+            output_summary = self._summarize_data(data, max_items=5)
+
+            self.logger.info(f"🟢 OUTPUT | {operation} (⏱️ {duration:.3f}s)")
+            if output_summary:
+                self.logger.info(f"📤 Result | {output_summary}")
+            if metadata:
+                self.logger.info(f"ℹ️  Meta   | {metadata}")
 
         # Flow 로거에도 기록
         log_module_io(
@@ -115,9 +519,18 @@ class ModuleIOLogger:
             metadata={**(metadata or {}), "duration_seconds": duration},
         )
 
-    def log_error(self, operation: str, error: Exception, metadata: Dict = None):
-        """모듈 오류 로깅"""
-        duration = time.time() - self.start_time if self.start_time else 0
+    def _emit_error(
+        self,
+        operation: str,
+        duration: Optional[float],
+        error: BaseException,
+        metadata: Optional[Dict],
+    ):
+        if duration is not None:
+            latency_metrics.observe(
+                self.module_name, operation, duration, outcome="error"
+            )
+        duration = duration or 0
 
         self.logger.error(f"🔴 ERROR  | {operation} (⏱️ {duration:.3f}s)")
         self.logger.error(f"❌ Error  | {type(error).__name__}: {str(error)}")
@@ -292,7 +705,17 @@ def log_module_io(
     output_data: Any = None,
     metadata: Dict = None,
 ):
-    """모듈별 입력/출력 데이터 로깅 (기존 함수 호환성 유지)"""
+    """모듈별 입력/출력 데이터 로깅 (기존 함수 호환성 유지)
+
+    비활성 레벨이거나 샘플링에서 제외되면 payload 를 만들지 않고 바로 반환합니다.
+    """
+    if not flow_logger.isEnabledFor(logging.INFO):
+        return
+
+    sample_rate = module_sample_rates.get(module_name, 1.0)
+    if sample_rate < 1.0 and random.random() >= sample_rate:
+        return
+
     log_entry = {
         "timestamp": datetime.now().isoformat(),
         "module": module_name,
@@ -301,12 +724,36 @@ def log_module_io(
         "output": simplify_data(output_data) if output_data is not None else None,
         "metadata": metadata or {},
     }
+    correlation_id = _correlation_id.get()
+    if correlation_id is not None:
+        log_entry["correlation_id"] = correlation_id
+
+    flow_logger.info("MODULE_FLOW: %s", _dump_flow_entry(log_entry))
+
 
-    flow_logger.info(
-        "MODULE_FLOW: %s",
-        json.dumps(
+def _dump_flow_entry(log_entry: Dict) -> str:
+    """Flow 로그 엔트리 직렬화 (compact 모드는 한 줄 JSON)"""
+    if not _flow_config["compact"]:
+        return json.dumps(
             log_entry, ensure_ascii=False, indent=2, default=default_json_serializer
-        ),
+        )
+
+    if _flow_config["use_orjson"]:
+        try:
+            return orjson.dumps(
+                log_entry,
+                default=default_json_serializer,
+                option=orjson.OPT_NON_STR_KEYS,
+            ).decode()
+        except TypeError:
+            # orjson 이 처리하지 못하는 값은 표준 json 으로 재시도
+            pass
+
+    return json.dumps(
+        log_entry,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=default_json_serializer,
     )
 
 
@@ -0,0 +1,167 @@
+"""
+모듈별 지연 시간 히스토그램
+
+ModuleIOLogger 가 측정한 duration 을 (모듈, 작업, 결과) 별로 집계하고
+Prometheus 텍스트 포맷으로 내보냅니다.
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+
+# 5ms ~ 60s 구간의 기본 버킷 (초)
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+QUANTILES: Tuple[float, ...] = (0.5, 0.95, 0.99)
+
+MetricKey = Tuple[str, str, str]
+
+
+class LatencyHistogram:
+    """고정 버킷 히스토그램 (기록 O(log n), 메모리 고정)"""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)  # 마지막은 +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """버킷 내 선형 보간으로 분위수 추정 (최댓값을 넘지 않음)"""
+        if self.count == 0:
+            return 0.0
+
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                fraction = (rank - cumulative) / bucket_count
+                return min(lower + (upper - lower) * fraction, self.max)
+            cumulative += bucket_count
+        return self.max
+
+
+class LatencyMetrics:
+    """(module, operation, outcome) 별 히스토그램 레지스트리"""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self._buckets = tuple(buckets)
+        self._histograms: Dict[MetricKey, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(
+        self, module: str, operation: str, seconds: float, outcome: str = "ok"
+    ) -> None:
+        key = (module, operation, outcome)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram(self._buckets)
+            histogram.observe(seconds)
+
+    def snapshot(self) -> Dict[MetricKey, Dict[str, float]]:
+        """p50/p95/p99/max 요약"""
+        with self._lock:
+            return {
+                key: {
+                    "count": histogram.count,
+                    "sum": histogram.sum,
+                    "p50": histogram.quantile(0.5),
+                    "p95": histogram.quantile(0.95),
+                    "p99": histogram.quantile(0.99),
+                    "max": histogram.max,
+                }
+                for key, histogram in self._histograms.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def render_prometheus(self, prefix: str = "codeping_module") -> str:
+        """Prometheus 텍스트 포맷 (histogram + 분위수/최댓값 gauge)"""
+        name = f"{prefix}_operation_duration_seconds"
+        lines = [
+            f"# HELP {name} Module operation latency measured by ModuleIOLogger.",
+            f"# TYPE {name} histogram",
+        ]
+        summary_lines = [
+            f"# HELP {name}_quantile Estimated latency quantiles per operation.",
+            f"# TYPE {name}_quantile gauge",
+        ]
+        max_lines = [
+            f"# HELP {name}_max Slowest observed latency per operation.",
+            f"# TYPE {name}_max gauge",
+        ]
+
+        with self._lock:
+            for key in sorted(self._histograms):
+                histogram = self._histograms[key]
+                labels = _format_labels(key)
+
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.buckets, histogram.counts):
+                    cumulative += bucket_count
+                    lines.append(
+                        f'{name}_bucket{{{labels},le="{bound:g}"}} {cumulative}'
+                    )
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f"{name}_sum{{{labels}}} {histogram.sum:.6f}")
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+                for q in QUANTILES:
+                    summary_lines.append(
+                        f'{name}_quantile{{{labels},quantile="{q:g}"}} '
+                        f"{histogram.quantile(q):.6f}"
+                    )
+                max_lines.append(f"{name}_max{{{labels}}} {histogram.max:.6f}")
+
+        return "\n".join(lines + summary_lines + max_lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: MetricKey) -> str:
+    module, operation, outcome = key
+    return (
+        f'module="{_escape_label(module)}",'
+        f'operation="{_escape_label(operation)}",'
+        f'outcome="{_escape_label(outcome)}"'
+    )
+
+
+def render_counter(name: str, help_text: str, value: float) -> str:
+    """단일 counter 메트릭 렌더링"""
+    return f"# HELP {name} {help_text}\n# TYPE {name} counter\n{name} {value}\n"
+
+
+# 프로세스 전역 레지스트리
+latency_metrics = LatencyMetrics()
@@ -0,0 +1,385 @@
+"""
+경량 분산 트레이싱
+
+ModuleIOLogger 스팬, Celery 태스크, DB 쿼리, S3 업로드를 하나의 push 단위
+트레이스로 묶어 로컬 JSONL 파일 또는 OTLP/HTTP(JSON) 수집기로 내보냅니다.
+트레이스 ID 는 correlation ID(X-GitHub-Delivery)에서 파생되므로 API 프로세스와
+워커 프로세스의 스팬이 같은 트레이스로 합쳐집니다.
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import queue
+import secrets
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_current_span: ContextVar[Optional["TraceSpan"]] = ContextVar(
+    "trace_current_span", default=None
+)
+_correlation_lookup = None  # shared.utils.logging.get_correlation_id (순환 import 방지)
+
+
+@dataclass
+class TraceSpan:
+    """완료되었거나 진행 중인 스팬 하나"""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def to_dict(self, service_name: str) -> Dict[str, Any]:
+        return {
+            "service": service_name,
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": (self.end_ns - self.start_ns) / 1e6,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class FileSpanExporter:
+    """스팬을 JSON Lines 로 파일에 추가 기록"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: List[Dict[str, Any]]) -> None:
+        with open(self.path, "a", encoding="utf-8") as handle:
+            for span in spans:
+                handle.write(json.dumps(span, ensure_ascii=False, default=str) + "\n")
+
+
+class OTLPHttpSpanExporter:
+    """OTLP/HTTP JSON 포맷으로 수집기(/v1/traces)에 전송 (외부 의존성 없음)"""
+
+    def __init__(self, endpoint: str, timeout: float = 2.0):
+        self.endpoint = endpoint
+        self.timeout = timeout
+
+    def export(self, spans: List[Dict[str, Any]]) -> None:
+        by_service: Dict[str, List[Dict[str, Any]]] = {}
+        for span in spans:
+            by_service.setdefault(span["service"], []).append(_to_otlp_span(span))
+
+        payload = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {"key": "service.name", "value": {"stringValue": service}}
+                        ]
+                    },
+                    "scopeSpans": [
+                        {"scope": {"name": "codeping.tracing"}, "spans": otlp_spans}
+                    ],
+                }
+                for service, otlp_spans in by_service.items()
+            ]
+        }
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(payload, default=str).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+def _to_otlp_span(span: Dict[str, Any]) -> Dict[str, Any]:
+    otlp = {
+        "traceId": span["trace_id"],
+        "spanId": span["span_id"],
+        "name": span["name"],
+        "kind": 1,
+        "startTimeUnixNano": str(span["start_ns"]),
+        "endTimeUnixNano": str(span["end_ns"]),
+        "attributes": [
+            {"key": key, "value": {"stringValue": str(value)}}
+            for key, value in span["attributes"].items()
+        ],
+        "status": (
+            {"code": 2, "message": span["error"]} if span["error"] else {"code": 1}
+        ),
+    }
+    if span["parent_id"]:
+        otlp["parentSpanId"] = span["parent_id"]
+    return otlp
+
+
+class Tracer:
+    """스팬을 모아 백그라운드 스레드에서 배치로 내보내는 트레이서"""
+
+    def __init__(
+        self,
+        exporter,
+        service_name: str,
+        batch_size: int = 256,
+        flush_interval: float = 2.0,
+        max_queue: int = 10000,
+    ):
+        self.exporter = exporter
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._stopped = threading.Event()
+        self._worker = threading.Thread(
+            target=self._run, name="trace-exporter", daemon=True
+        )
+        self._worker.start()
+
+    def submit(self, span: TraceSpan) -> None:
+        try:
+            self._queue.put_nowait(span.to_dict(self.service_name))
+        except queue.Full:
+            self.dropped += 1
+
+    def shutdown(self) -> None:
+        """남은 스팬을 모두 내보내고 종료"""
+        self._stopped.set()
+        self._worker.join(timeout=self.flush_interval + 5)
+
+    def _run(self) -> None:
+        while True:
+            batch = self._drain(timeout=self.flush_interval)
+            if batch:
+                self._export(batch)
+            if self._stopped.is_set() and self._queue.empty():
+                return
+
+    def _drain(self, timeout: float) -> List[Dict[str, Any]]:
+        batch: List[Dict[str, Any]] = []
+        deadline = time.monotonic() + timeout
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or (self._stopped.is_set() and self._queue.empty()):
+                break
+            try:
+                batch.append(self._queue.get(timeout=min(remaining, 0.1)))
+            except queue.Empty:
+                continue
+        return batch
+
+    def _export(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            self.exporter.export(batch)
+        except Exception as exc:
+            logger.warning("Failed to export %d trace spans: %s", len(batch), exc)
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+_tracing_enabled: Optional[bool] = None
+
+
+def _create_tracer() -> Optional[Tracer]:
+    from shared.config.settings import get_settings
+
+    settings = get_settings()
+    if not settings.tracing_enabled:
+        return None
+
+    if settings.tracing_exporter == "otlp":
+        exporter = OTLPHttpSpanExporter(settings.tracing_otlp_endpoint)
+    else:
+        exporter = FileSpanExporter(settings.tracing_file_path)
+
+    return Tracer(
+        exporter,
+        service_name=settings.tracing_service_name,
+        batch_size=settings.tracing_batch_size,
+        flush_interval=settings.tracing_flush_interval_seconds,
+    )
+
+
+def get_tracer() -> Optional[Tracer]:
+    """설정에 따라 트레이서를 지연 생성 (비활성화 시 None)"""
+    global _tracer, _tracing_enabled
+    if _tracing_enabled is False:
+        return None
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracing_enabled is None:
+                _tracer = _create_tracer()
+                _tracing_enabled = _tracer is not None
+    return _tracer
+
+
+def configure_tracing(tracer: Optional[Tracer]) -> None:
+    """트레이서 직접 지정 (테스트/커스텀 exporter 용)"""
+    global _tracer, _tracing_enabled
+    with _tracer_lock:
+        _tracer = tracer
+        _tracing_enabled = None if tracer is None else True
+
+
+def shutdown_tracing() -> None:
+    """남은 스팬을 내보내고 트레이서 해제"""
+    global _tracer, _tracing_enabled
+    with _tracer_lock:
+        tracer, _tracer, _tracing_enabled = _tracer, None, None
+    if tracer is not None:
+        tracer.shutdown()
+
+
+def _reset_after_fork() -> None:
+    # 익스포터 스레드는 fork 후 자식 프로세스로 복제되지 않으므로 새로 생성
+    global _tracer, _tracing_enabled
+    _tracer = None
+    _tracing_enabled = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+atexit.register(shutdown_tracing)
+
+
+def _trace_id_for(correlation_id: Optional[str]) -> str:
+    """correlation ID 를 OTLP 형식(32 hex) 트레이스 ID 로 변환"""
+    if not correlation_id:
+        return secrets.token_hex(16)
+    compact = correlation_id.replace("-", "").lower()
+    if len(compact) == 32 and all(c in "0123456789abcdef" for c in compact):
+        return compact
+    return hashlib.blake2b(correlation_id.encode(), digest_size=16).hexdigest()
+
+
+def _current_correlation_id() -> Optional[str]:
+    global _correlation_lookup
+    if _correlation_lookup is None:
+        from shared.utils.logging import get_correlation_id
+
+        _correlation_lookup = get_correlation_id
+    return _correlation_lookup()
+
+
+def current_span_id() -> Optional[str]:
+    span = _current_span.get()
+    return span.span_id if span else None
+
+
+def start_span(
+    name: str,
+    attributes: Optional[Dict[str, Any]] = None,
+    parent_id: Optional[str] = None,
+):
+    """스팬 시작; ``(span, token)`` 반환 (트레이싱 비활성화 시 ``(None, None)``)"""
+    if get_tracer() is None:
+        return None, None
+
+    parent = _current_span.get()
+    span = TraceSpan(
+        name=name,
+        trace_id=(
+            parent.trace_id if parent else _trace_id_for(_current_correlation_id())
+        ),
+        span_id=secrets.token_hex(8),
+        parent_id=parent_id or (parent.span_id if parent else None),
+        start_ns=time.time_ns(),
+        attributes=dict(attributes or {}),
+    )
+    return span, _current_span.set(span)
+
+
+def end_span(span: Optional[TraceSpan], token, error: Optional[BaseException] = None):
+    """스팬 종료 후 익스포터 큐로 전달"""
+    if span is None:
+        return
+    _current_span.reset(token)
+    span.end_ns = time.time_ns()
+    if error is not None:
+        span.error = f"{type(error).__name__}: {error}"
+
+    tracer = get_tracer()
+    if tracer is not None:
+        tracer.submit(span)
+
+
+def record_span(
+    name: str,
+    duration_seconds: float,
+    attributes: Optional[Dict[str, Any]] = None,
+    error: Optional[BaseException] = None,
+) -> None:
+    """이미 끝난 작업을 현재 스팬의 자식으로 기록 (log_input/log_output 쌍 등)"""
+    tracer = get_tracer()
+    if tracer is None:
+        return
+
+    parent = _current_span.get()
+    end_ns = time.time_ns()
+    span = TraceSpan(
+        name=name,
+        trace_id=(
+            parent.trace_id if parent else _trace_id_for(_current_correlation_id())
+        ),
+        span_id=secrets.token_hex(8),
+        parent_id=parent.span_id if parent else None,
+        start_ns=end_ns - int(duration_seconds * 1e9),
+        end_ns=end_ns,
+        attributes=dict(attributes or {}),
+        error=f"{type(error).__name__}: {error}" if error is not None else None,
+    )
+    tracer.submit(span)
+
+
+@contextmanager
+def trace_span(name: str, **attributes: Any) -> Iterator[Optional[TraceSpan]]:
+    """``with trace_span("s3.upload", key=key):`` 형태의 범용 스팬"""
+    span, token = start_span(name, attributes)
+    try:
+        yield span
+    except BaseException as exc:
+        end_span(span, token, exc)
+        raise
+    else:
+        end_span(span, token)
+
+
+def instrument_engine(engine) -> None:
+    """SQLAlchemy 엔진의 쿼리 실행을 ``db.<VERB>`` 스팬으로 기록"""
+    from sqlalchemy import event
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("trace_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("trace_query_start")
+        if not starts:
+            return
+        duration = time.perf_counter() - starts.pop()
+        verb = statement.lstrip().split(None, 1)[0].upper() if statement else "SQL"
+        record_span(
+            f"db.{verb}",
+            duration,
+            {"db.statement": statement[:200], "db.executemany": executemany},
+        )
@@ -0,0 +1,184 @@
+"""Tests for events indexes and retention."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    func,
+    insert,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.exc import IntegrityError
+from yeonjae_universal_data_storage.models import Event
+
+from infrastructure.aws.blob_index import DiffBlob
+from infrastructure.database.event_partitions import (
+    EventKey,
+    apply_retention,
+    ensure_event_indexes,
+)
+from infrastructure.database.event_payloads import EventPayload
+from infrastructure.database.event_writer import EventWriteBuffer
+
+NOW = datetime(2024, 6, 15, 12, 0)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/events.db")
+    Event.__table__.create(engine)
+    EventPayload.__table__.create(engine)
+    EventKey.__table__.create(engine)
+    yield engine
+    engine.dispose()
+
+
+def _seed(engine, months):
+    """One event (and payload) on the first of each given month of 2024."""
+    with engine.begin() as connection:
+        for month in months:
+            created_at = datetime(2024, month, 1, 9, 0)
+            sha = f"{month:040x}"
+            connection.execute(
+                insert(Event.__table__),
+                [
+                    {
+                        "repository": "test/repo",
+                        "commit_sha": sha,
+                        "pusher": "testuser",
+                        "payload": "",
+                        "created_at": created_at,
+                    }
+                ],
+            )
+            connection.execute(
+                insert(EventKey.__table__),
+                [
+                    {
+                        "repository": "test/repo",
+                        "commit_sha": sha,
+                        "created_at": created_at,
+                    }
+                ],
+            )
+            connection.execute(
+                insert(EventPayload.__table__),
+                [
+                    {
+                        "repository": "test/repo",
+                        "commit_sha": sha,
+                        "codec": "none",
+                        "raw_size": 2,
+                        "payload": b"{}",
+                        "created_at": created_at,
+                    }
+                ],
+            )
+
+
+def _count(engine, table) -> int:
+    with engine.connect() as connection:
+        return connection.scalar(select(func.count()).select_from(table))
+
+
+def test_recent_pushes_query_uses_composite_index(engine):
+    """ "Pushes to repo X since T" is served by (repository, created_at)."""
+    with engine.begin() as connection:
+        ensure_event_indexes(connection)
+
+    with engine.connect() as connection:
+        plan = " ".join(
+            str(row[-1])
+            for row in connection.execute(
+                text(
+                    "EXPLAIN QUERY PLAN SELECT id FROM events "
+                    "WHERE repository = 'test/repo' AND created_at >= '2024-06-14'"
+                )
+            )
+        )
+    assert "ix_events_repository_created_at" in plan
+
+
+def test_retention_deletes_whole_expired_months(engine):
+    """Without partitions, rows and payloads before the cutoff month go."""
+    _seed(engine, months=[1, 2, 3, 4, 5, 6])
+
+    assert apply_retention(engine, retention_months=3, now=NOW) == ["2 rows"]
+
+    assert _count(engine, Event.__table__) == 4  # March (cutoff month) onwards
+    assert _count(engine, EventPayload.__table__) == 4
+    assert _count(engine, EventKey.__table__) == 4
+    assert apply_retention(engine, retention_months=3, now=NOW) == []
+
+
+def test_retention_releases_diff_blob_references(engine):
+    """Each deleted event that points at an S3 blob gives its reference back."""
+    content_hash = "ab" * 32
+    DiffBlob.__table__.create(engine)
+    _seed(engine, months=[1, 2, 6])
+    with engine.begin() as connection:
+        connection.execute(
+            insert(DiffBlob.__table__),
+            [
+                {
+                    "content_hash": content_hash,
+                    "s3_key": f"diffs/sha256/ab/{content_hash}.gz",
+                    "size_bytes": 10,
+                    "ref_count": 3,
+                }
+            ],
+        )
+        connection.execute(
+            update(Event.__table__).values(
+                diff_url=f"s3://bucket/diffs/sha256/ab/{content_hash}.gz"
+            )
+        )
+
+    apply_retention(engine, retention_months=3, now=NOW)
+
+    with engine.connect() as connection:
+        assert connection.scalar(select(DiffBlob.__table__.c.ref_count)) == 1
+
+
+def test_archive_and_disabled_retention_keep_rows(engine):
+    """Archiving needs partitions; 0 months disables retention entirely."""
+    _seed(engine, months=[1, 6])
+
+    assert apply_retention(engine, retention_months=1, mode="archive", now=NOW) == []
+    assert apply_retention(engine, retention_months=0, now=NOW) == []
+    assert _count(engine, Event.__table__) == 2
+    with pytest.raises(ValueError):
+        apply_retention(engine, retention_months=1, mode="truncate", now=NOW)
+
+
+def test_event_keys_guard_a_table_without_a_unique_commit_key(engine):
+    """Like a partitioned events table, only event_keys rejects the duplicate."""
+    by_month = Table(
+        "events_by_month",
+        MetaData(),
+        Column("id", Integer, primary_key=True),
+        Column("repository", String(255)),
+        Column("commit_sha", String(64)),
+        Column("created_at", DateTime),
+    )
+    by_month.create(engine)
+    buffer = EventWriteBuffer(lambda: engine, table=by_month, dedup_keys=True)
+    row = {"repository": "test/repo", "commit_sha": "a" * 40}
+
+    buffer.write(dict(row))
+    with pytest.raises(IntegrityError):
+        buffer.write({**row, "created_at": NOW})
+    buffer.close()
+
+    assert _count(engine, by_month) == 1
@@ -0,0 +1,129 @@
+"""Tests for compressed event payload storage."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+from yeonjae_universal_data_storage.models import Event
+
+from infrastructure.database.event_payloads import (
+    EventPayload,
+    load_event_payload,
+    migrate_inline_payloads,
+    split_event_row,
+)
+from infrastructure.database.event_partitions import ensure_event_indexes
+from infrastructure.database.event_writer import EventWriteBuffer
+from infrastructure.database.migrations import MIGRATIONS, run_data_migrations
+from shared.config.settings import get_settings
+
+HEAD_SHA = "a" * 40
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/events.db")
+    Event.__table__.create(engine)
+    EventPayload.__table__.create(engine)
+    yield engine
+    engine.dispose()
+
+
+def _payload() -> str:
+    return json.dumps(
+        {
+            "ref": "refs/heads/main",
+            "after": HEAD_SHA,
+            "head_commit": {"id": HEAD_SHA, "timestamp": "2024-05-01T10:00:00+09:00"},
+            "commits": [
+                {"id": "b" * 40, "added": ["a.py"], "modified": ["b.py"]},
+                {"id": HEAD_SHA, "modified": ["b.py"], "removed": ["c.py"]},
+            ]
+            * 50,
+        }
+    )
+
+
+def _event_row() -> dict:
+    return {"repository": "test/repo", "pusher": "testuser", "payload": _payload()}
+
+
+def test_split_extracts_hot_fields_and_compresses():
+    """Head SHA, UTC timestamp and file count come out of the payload."""
+    event, payload_row = split_event_row(_event_row(), "gzip")
+
+    assert event["payload"] == ""
+    assert event["commit_sha"] == HEAD_SHA
+    assert event["timestamp_utc"] == datetime(2024, 5, 1, 1, 0)
+    assert event["files_changed"] == 3
+    assert payload_row["codec"] == "gzip"
+    assert len(payload_row["payload"]) < payload_row["raw_size"] / 5
+
+
+def test_buffered_writes_store_payload_in_side_table(engine):
+    """events rows stay small and the blob is loaded only on demand."""
+    buffer = EventWriteBuffer(lambda: engine, payload_codec="gzip")
+    buffer.write(_event_row())
+    buffer.close()
+
+    with engine.connect() as connection:
+        stored = connection.execute(
+            select(Event.__table__.c.payload, Event.__table__.c.files_changed)
+        ).one()
+        assert tuple(stored) == ("", 3)
+        payload = load_event_payload(connection, "test/repo", HEAD_SHA)
+        created = [
+            connection.execute(select(table.c.created_at)).scalar()
+            for table in (Event.__table__, EventPayload.__table__)
+        ]
+    assert created[0] == created[1]
+    assert payload == json.loads(_payload())
+
+
+def test_migration_moves_inline_payloads(engine):
+    """Existing inline rows are compressed, back-filled and indexed."""
+    created_at = datetime(2023, 1, 2, 3, 4)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Event.__table__),
+            [{**_event_row(), "commit_sha": HEAD_SHA, "created_at": created_at}],
+        )
+
+    with engine.connect() as connection:
+        assert migrate_inline_payloads(connection, codec="gzip", batch_size=1) == 1
+        assert migrate_inline_payloads(connection, codec="gzip") == 0
+    with engine.begin() as connection:
+        ensure_event_indexes(connection)
+
+    with engine.connect() as connection:
+        timestamp = connection.execute(select(Event.__table__.c.timestamp_utc)).scalar()
+        assert timestamp == datetime(2024, 5, 1, 1, 0)
+        assert (
+            load_event_payload(connection, "test/repo", HEAD_SHA)["after"] == HEAD_SHA
+        )
+        # Expires with its event, not a retention period after the migration
+        payload_created = select(EventPayload.__table__.c.created_at)
+        assert connection.execute(payload_created).scalar() == created_at
+
+
+@pytest.mark.parametrize("storage, inline", [("inline", True), ("compressed", False)])
+def test_payload_migration_follows_the_storage_setting(
+    engine, monkeypatch, storage, inline
+):
+    """Inline storage keeps events.payload for readers that parse it."""
+    monkeypatch.setenv("EVENT_PAYLOAD_STORAGE", storage)
+    get_settings.cache_clear()
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Event.__table__), [{**_event_row(), "commit_sha": HEAD_SHA}]
+        )
+
+    run_data_migrations(engine, [m for m in MIGRATIONS if m.version == 3])
+    get_settings.cache_clear()
+
+    with engine.connect() as connection:
+        payload = connection.execute(select(Event.__table__.c.payload)).scalar()
+    assert bool(payload) is inline
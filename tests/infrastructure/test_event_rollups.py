@@ -0,0 +1,105 @@
+"""Tests for incrementally maintained event rollups."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, select
+from yeonjae_universal_data_storage.models import Event
+
+from infrastructure.database.event_rollups import (
+    EventRollupDaily,
+    EventRollupHourly,
+    compact_rollups,
+    rebuild_rollups,
+)
+from infrastructure.database.event_writer import EventWriteBuffer
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/events.db")
+    for table in (Event, EventRollupHourly, EventRollupDaily):
+        table.__table__.create(engine)
+    yield engine
+    engine.dispose()
+
+
+def _event(index: int, hour: int, **overrides) -> dict:
+    row = {
+        "repository": "test/repo",
+        "commit_sha": f"{index:040x}",
+        "pusher": "alice",
+        "payload": "{}",
+        "commit_count": 2,
+        "files_changed": 3,
+        "created_at": datetime(2024, 5, 1, hour, 30),
+    }
+    row.update(overrides)
+    return row
+
+
+def _rollups(engine, model):
+    with engine.connect() as connection:
+        return [
+            (
+                row.bucket_start.hour,
+                row.pusher,
+                row.pushes,
+                row.commits,
+                row.files_changed,
+            )
+            for row in connection.execute(
+                select(model.__table__).order_by("bucket_start", "pusher")
+            )
+        ]
+
+
+def test_inserts_update_hourly_and_daily_rollups(engine):
+    """Each committed event is counted once; failed duplicates are not."""
+    buffer = EventWriteBuffer(
+        lambda: engine, max_batch=10, flush_interval=10, rollups=True
+    )
+    buffer.submit(_event(0, hour=9))
+    buffer.submit(_event(1, hour=9))
+    buffer.submit(_event(2, hour=10, pusher="bob", commit_count=1))
+    duplicate = buffer.submit(_event(1, hour=9))
+    buffer.flush()
+    buffer.submit(_event(3, hour=10))
+    buffer.close()
+
+    assert duplicate.exception() is not None
+    assert _rollups(engine, EventRollupHourly) == [
+        (9, "alice", 2, 4, 6),
+        (10, "alice", 1, 2, 3),
+        (10, "bob", 1, 1, 3),
+    ]
+    assert _rollups(engine, EventRollupDaily) == [
+        (0, "alice", 3, 6, 9),
+        (0, "bob", 1, 1, 3),
+    ]
+
+
+def test_rebuild_matches_incremental_and_compaction_keeps_daily(engine):
+    """Backfill from events gives the same counts; old hourly rows are dropped."""
+    buffer = EventWriteBuffer(lambda: engine, rollups=True)
+    for index, hour in enumerate((9, 9, 10, 23)):
+        buffer.write(_event(index, hour=hour))
+    buffer.close()
+    incremental = _rollups(engine, EventRollupHourly), _rollups(
+        engine, EventRollupDaily
+    )
+
+    with engine.begin() as connection:
+        assert rebuild_rollups(connection, batch_size=3) == 4
+    assert (
+        _rollups(engine, EventRollupHourly),
+        _rollups(engine, EventRollupDaily),
+    ) == incremental
+
+    assert (
+        compact_rollups(engine, hourly_retention_days=30, now=datetime(2024, 7, 1)) == 3
+    )
+    assert _rollups(engine, EventRollupHourly) == []
+    assert _rollups(engine, EventRollupDaily) == [(0, "alice", 4, 8, 12)]
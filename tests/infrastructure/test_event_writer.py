@@ -0,0 +1,101 @@
+"""Tests for the batched event write buffer."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.exc import IntegrityError
+from yeonjae_universal_data_storage.models import Event
+
+from infrastructure.database.event_writer import EventWriteBuffer
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/events.db")
+    Event.__table__.create(engine)
+    yield engine
+    engine.dispose()
+
+
+def _event(index: int, **overrides) -> dict:
+    row = {
+        "repository": "test/repo",
+        "commit_sha": f"{index:040x}",
+        "pusher": "testuser",
+        "ref": "refs/heads/main",
+        "payload": "{}",
+    }
+    row.update(overrides)
+    return row
+
+
+def _count(engine) -> int:
+    with engine.connect() as connection:
+        return connection.scalar(select(func.count()).select_from(Event.__table__))
+
+
+def test_concurrent_writers_share_batches(engine):
+    """Many sync writers are committed in a few multi-row batches."""
+    buffer = EventWriteBuffer(lambda: engine, max_batch=50, flush_interval=0.05)
+
+    threads = [
+        threading.Thread(target=buffer.write, args=(_event(index),))
+        for index in range(200)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    buffer.close()
+
+    assert _count(engine) == 200
+    assert buffer.stats()["batches"] < 200
+    with engine.connect() as connection:
+        platform, commit_count = connection.execute(
+            select(Event.__table__.c.platform, Event.__table__.c.commit_count)
+        ).first()
+    assert (platform, commit_count) == ("github", 1)  # column defaults kept
+
+
+def test_single_write_is_flushed_after_the_interval(engine):
+    """A lone event is not held back waiting for a full batch."""
+    buffer = EventWriteBuffer(lambda: engine, max_batch=500, flush_interval=0.01)
+
+    buffer.write(_event(0))
+
+    assert _count(engine) == 1
+    buffer.close()
+
+
+def test_duplicate_only_fails_its_own_row(engine):
+    """A constraint violation is isolated to the offending event."""
+    buffer = EventWriteBuffer(lambda: engine, max_batch=10, flush_interval=10)
+
+    futures = [buffer.submit(_event(index)) for index in range(3)]
+    duplicate = buffer.submit(_event(1))
+    buffer.flush()
+
+    assert all(future.result() is None for future in futures)
+    with pytest.raises(IntegrityError):
+        duplicate.result()
+    assert _count(engine) == 3
+    buffer.close()
+
+
+def test_async_durability_returns_before_commit(engine):
+    """Fire-and-forget writes are persisted at the latest on close."""
+    buffer = EventWriteBuffer(
+        lambda: engine, max_batch=1000, flush_interval=10, durability="async"
+    )
+
+    for index in range(5):
+        buffer.write(_event(index))
+    assert buffer.stats()["buffered"] == 5
+
+    buffer.close()
+    assert _count(engine) == 5
+    with pytest.raises(RuntimeError):
+        buffer.write(_event(99))
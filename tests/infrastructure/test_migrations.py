@@ -0,0 +1,97 @@
+"""Tests for the versioned migration runner."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from infrastructure.database.migrations import (
+    MIGRATIONS,
+    Migration,
+    create_index,
+    current_version,
+    run_data_migrations,
+    run_migrations,
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/migrations.db")
+    yield engine
+    engine.dispose()
+
+
+def test_fresh_database_is_migrated_once(engine):
+    """Schema migrations apply on an empty database; a second run is a no-op."""
+    assert run_migrations(engine) == [
+        migration.version for migration in MIGRATIONS if not migration.data
+    ]
+
+    tables = set(inspect(engine).get_table_names())
+    assert {"events", "event_payloads", "event_rollups_daily", "push_status"} <= tables
+    indexes = {index["name"] for index in inspect(engine).get_indexes("events")}
+    assert "ix_events_repository_created_at" in indexes
+    assert run_migrations(engine) == []
+
+
+def test_only_pending_migrations_run(engine):
+    """Applied versions are skipped and failures leave the version unrecorded."""
+    calls = []
+
+    def create_table(connection):
+        calls.append(1)
+        connection.execute(
+            text("CREATE TABLE widgets (id INTEGER PRIMARY KEY, name TEXT)")
+        )
+
+    def index_widgets(connection):
+        calls.append(2)
+        create_index(connection, "ix_widgets_name", "widgets", "name")
+
+    def broken(connection):
+        calls.append(3)
+        raise RuntimeError("boom")
+
+    migrations = [
+        Migration(1, "widgets", create_table),
+        Migration(2, "widgets name index", index_widgets, transactional=False),
+    ]
+    assert run_migrations(engine, migrations) == [1, 2]
+
+    with pytest.raises(RuntimeError):
+        run_migrations(engine, migrations + [Migration(3, "broken", broken)])
+    assert current_version(engine) == 2
+    assert calls == [1, 2, 3]
+
+    assert run_migrations(engine, migrations) == []
+    assert calls == [1, 2, 3]
+
+
+def test_data_migrations_run_only_on_request(engine):
+    """Startup skips row rewrites; the opt-in runner repeats them every time."""
+    rewrites = []
+
+    def create_table(connection):
+        connection.execute(text("CREATE TABLE widgets (id INTEGER PRIMARY KEY)"))
+
+    def backfill(connection):
+        rewrites.append(connection.get_execution_options().get("isolation_level"))
+        connection.execute(text("INSERT INTO widgets (id) VALUES (1)"))
+        connection.commit()
+
+    migrations = [
+        Migration(1, "widgets", create_table),
+        Migration(2, "widgets backfill", backfill, transactional=False, data=True),
+    ]
+    assert run_migrations(engine, migrations) == [1]
+    assert rewrites == []
+
+    assert run_data_migrations(engine, migrations) == [2]
+    with engine.begin() as connection:
+        connection.execute(text("DELETE FROM widgets"))
+    assert run_data_migrations(engine, migrations) == [2]
+    assert rewrites == [None, None]  # not autocommit: commits per batch
+    assert current_version(engine) == 2
+    with engine.connect() as connection:
+        assert connection.scalar(text("SELECT COUNT(*) FROM widgets")) == 1
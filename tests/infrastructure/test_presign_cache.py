@@ -0,0 +1,90 @@
+"""Tests for the presigned URL cache."""
+
+from __future__ import annotations
+
+from infrastructure.aws.presign_cache import PresignedUrlCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value.encode()
+
+
+def _signer(calls: list):
+    def sign():
+        calls.append(1)
+        return f"https://signed/{len(calls)}"
+
+    return sign
+
+
+def test_reuses_url_within_reuse_window():
+    """Repeated requests inside the window are served from cache."""
+    clock = FakeClock()
+    cache = PresignedUrlCache(reuse_fraction=0.5, clock=clock)
+    calls: list = []
+
+    first = cache.get_or_sign("diffs/a.gz", 3600, _signer(calls))
+    clock.now += 1700
+    second = cache.get_or_sign("diffs/a.gz", 3600, _signer(calls))
+
+    assert first == second
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_evicts_before_url_gets_close_to_expiry():
+    """Entries past the reuse window are re-signed."""
+    clock = FakeClock()
+    cache = PresignedUrlCache(reuse_fraction=0.5, clock=clock)
+    calls: list = []
+
+    cache.get_or_sign("diffs/a.gz", 3600, _signer(calls))
+    clock.now += 1800
+    url = cache.get_or_sign("diffs/a.gz", 3600, _signer(calls))
+
+    assert url == "https://signed/2"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_keys_on_expiration_and_bounds_size():
+    """Different expirations are separate entries and LRU size is bounded."""
+    cache = PresignedUrlCache(max_entries=2, clock=FakeClock())
+    calls: list = []
+
+    cache.get_or_sign("diffs/a.gz", 3600, _signer(calls))
+    cache.get_or_sign("diffs/a.gz", 600, _signer(calls))
+    cache.get_or_sign("diffs/b.gz", 600, _signer(calls))
+
+    assert len(calls) == 3
+    assert cache.stats()["entries"] == 2
+
+
+def test_shared_redis_tier_reuses_other_replica_signatures():
+    """A second replica picks up the URL signed by the first via Redis."""
+    redis = FakeRedis()
+    first = PresignedUrlCache(redis_client=redis, clock=FakeClock())
+    second = PresignedUrlCache(redis_client=redis, clock=FakeClock())
+    calls: list = []
+
+    url = first.get_or_sign("diffs/a.gz", 3600, _signer(calls))
+    shared = second.get_or_sign("diffs/a.gz", 3600, _signer(calls))
+
+    assert shared == url
+    assert len(calls) == 1
+    assert second.stats()["redis_hits"] == 1
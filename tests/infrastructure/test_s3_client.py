@@ -0,0 +1,210 @@
+"""Tests for the S3 diff upload client against a moto S3 stand-in."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import io
+import os
+
+import pytest
+
+moto = pytest.importorskip("moto")
+boto3 = pytest.importorskip("boto3")
+
+from infrastructure.aws.s3_client import MIN_PART_SIZE, S3Client  # noqa: E402
+
+BUCKET = "test-diffs"
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    """S3Client bound to a mocked bucket."""
+    monkeypatch.setenv("AWS_S3_BUCKET", BUCKET)
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_REGION", "us-east-1")
+
+    with moto.mock_aws():
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=BUCKET)
+        client = S3Client(multipart_threshold=MIN_PART_SIZE, part_size=MIN_PART_SIZE)
+        yield client
+        client.close()
+
+
+def _get_object(client: S3Client, key: str) -> dict:
+    return client.s3_client.get_object(Bucket=BUCKET, Key=key)
+
+
+def test_upload_diff_small_payload_uses_single_put(s3_client):
+    """Payloads below the threshold are stored with one PUT."""
+    content = gzip.compress(b"diff --git a/x b/x\n")
+
+    url = asyncio.run(s3_client.upload_diff("diffs/small.gz", content))
+
+    assert url == f"s3://{BUCKET}/diffs/small.gz"
+    obj = _get_object(s3_client, "diffs/small.gz")
+    assert obj["Body"].read() == content
+    assert obj["ContentEncoding"] == "gzip"
+
+
+def test_upload_diff_large_payload_uses_multipart(s3_client):
+    """Payloads above the threshold are split into concurrent parts."""
+    content = os.urandom(MIN_PART_SIZE * 2 + 1024)
+
+    asyncio.run(s3_client.upload_diff("diffs/large.gz", content))
+
+    obj = _get_object(s3_client, "diffs/large.gz")
+    assert obj["Body"].read() == content
+    assert "-3" in obj["ETag"]  # multipart ETag carries the part count
+
+
+def test_upload_diff_stream_compresses_iterator(s3_client):
+    """Iterator sources are gzip-compressed on the fly."""
+    chunks = (f"+ line {i}\n" for i in range(10_000))
+
+    asyncio.run(s3_client.upload_diff_stream("diffs/stream.gz", chunks))
+
+    body = _get_object(s3_client, "diffs/stream.gz")["Body"].read()
+    expected = "".join(f"+ line {i}\n" for i in range(10_000)).encode()
+    assert gzip.decompress(body) == expected
+
+
+def test_upload_diff_stream_file_object_multipart(s3_client):
+    """Large file-like sources stream through multipart without buffering."""
+    raw = os.urandom(MIN_PART_SIZE + MIN_PART_SIZE // 2)  # incompressible
+
+    asyncio.run(s3_client.upload_diff_stream("diffs/file.gz", io.BytesIO(raw)))
+
+    obj = _get_object(s3_client, "diffs/file.gz")
+    assert gzip.decompress(obj["Body"].read()) == raw
+    assert "-2" in obj["ETag"]
+
+
+def test_upload_diffs_batch_reports_partial_failures(s3_client, monkeypatch):
+    """Batch uploads return per-key results and keep going past failures."""
+    items = {f"diffs/batch-{i}.gz": gzip.compress(b"+x\n" * i) for i in range(6)}
+    original_put = s3_client.s3_client.put_object
+
+    def flaky_put(**kwargs):
+        if kwargs["Key"] == "diffs/batch-3.gz":
+            raise RuntimeError("boom")
+        return original_put(**kwargs)
+
+    monkeypatch.setattr(s3_client.s3_client, "put_object", flaky_put)
+
+    batch = asyncio.run(s3_client.upload_diffs_batch(items))
+
+    assert [r.key for r in batch.results] == list(items)
+    assert [r.key for r in batch.failed] == ["diffs/batch-3.gz"]
+    assert "boom" in batch.failed[0].error
+    assert len(batch.succeeded) == 5
+    assert batch.total_bytes == sum(
+        len(v) for k, v in items.items() if k != "diffs/batch-3.gz"
+    )
+    assert (
+        _get_object(s3_client, "diffs/batch-5.gz")["Body"].read()
+        == items["diffs/batch-5.gz"]
+    )
+
+    metrics = s3_client.metrics.snapshot()
+    assert metrics["objects"] == 6
+    assert metrics["failures"] == 1
+    assert metrics["max_latency_seconds"] >= metrics["mean_latency_seconds"] > 0
+
+
+def test_upload_diff_deduplicated_skips_known_content(s3_client, monkeypatch):
+    """Identical content is uploaded once and later deliveries are skipped."""
+    content = gzip.compress(b"+ same diff\n")
+    puts = []
+    original_put = s3_client.s3_client.put_object
+
+    def counting_put(**kwargs):
+        puts.append(kwargs["Key"])
+        return original_put(**kwargs)
+
+    monkeypatch.setattr(s3_client.s3_client, "put_object", counting_put)
+
+    first = asyncio.run(s3_client.upload_diff_deduplicated(content))
+    second = asyncio.run(s3_client.upload_diff_deduplicated(content))
+
+    assert first.key == second.key
+    assert first.key.startswith("diffs/sha256/")
+    assert not first.deduplicated and second.deduplicated
+    assert puts == [first.key]
+    assert s3_client.metrics.snapshot()["bytes_saved"] == len(content)
+
+
+def test_upload_diff_deduplicated_uses_head_lookup(s3_client):
+    """A fresh client finds objects uploaded by another node via HEAD."""
+    content = gzip.compress(b"+ uploaded elsewhere\n")
+    asyncio.run(s3_client.upload_diff_deduplicated(content))
+
+    other = S3Client()
+    try:
+        result = asyncio.run(other.upload_diff_deduplicated(content))
+    finally:
+        other.close()
+
+    assert result.deduplicated
+
+
+def test_dedup_index_counts_references(s3_client, monkeypatch, tmp_path):
+    """The diff_blobs index tracks unique bytes versus delivered bytes."""
+    from infrastructure.aws import blob_index
+    from shared.config.database import create_tables_sync
+    from shared.config.settings import get_settings
+
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path}/blobs.db")
+    get_settings.cache_clear()
+    create_tables_sync()
+    s3_client.dedup_index_enabled = True
+
+    content = gzip.compress(b"+ indexed diff\n")
+    for _ in range(3):
+        asyncio.run(s3_client.upload_diff_deduplicated(content))
+
+    stats = blob_index.get_dedup_stats()
+    assert stats["unique_blobs"] == 1
+    assert stats["total_references"] == 3
+    assert stats["saved_bytes"] == 2 * len(content)
+    get_settings.cache_clear()
+
+
+def test_dedup_index_ignores_released_blobs(s3_client, monkeypatch, tmp_path):
+    """A blob whose references were all released is uploaded again."""
+    from infrastructure.aws import blob_index
+    from shared.config.database import create_tables_sync
+    from shared.config.settings import get_settings
+
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path}/blobs.db")
+    get_settings.cache_clear()
+    create_tables_sync()
+    s3_client.dedup_index_enabled = True
+
+    content = gzip.compress(b"+ collected diff\n")
+    first = asyncio.run(s3_client.upload_diff_deduplicated(content))
+    content_hash = first.key.rsplit("/", 1)[-1].split(".")[0]
+    assert blob_index.release_reference(content_hash) == 0
+    s3_client.s3_client.delete_object(Bucket=BUCKET, Key=first.key)
+
+    other = S3Client()
+    other.dedup_index_enabled = True
+    try:
+        second = asyncio.run(other.upload_diff_deduplicated(content))
+    finally:
+        other.close()
+
+    assert blob_index.lookup_blob(content_hash) == first.key
+    assert not second.deduplicated
+    assert _get_object(s3_client, first.key)["ContentLength"] > 0
+    get_settings.cache_clear()
+
+
+def test_get_presigned_url_is_cached(s3_client):
+    """Repeated presign requests for one key reuse the signature."""
+    first = s3_client.get_presigned_url("diffs/small.gz", expiration=600)
+    second = s3_client.get_presigned_url("diffs/small.gz", expiration=600)
+
+    assert first == second
+    assert s3_client.presign_cache.stats()["hits"] == 1
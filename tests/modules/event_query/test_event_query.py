@@ -0,0 +1,117 @@
+"""Tests for the keyset-paginated events read API."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from yeonjae_universal_data_storage.models import Event
+
+from infrastructure.database.event_writer import EventWriteBuffer
+from modules.event_query import decode_cursor, encode_cursor
+from modules.event_query.router import router
+from shared.config import database
+from shared.config.settings import get_settings
+
+START = datetime(2024, 5, 1, 9, 0)
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    """Events for two repositories, five per repository, one minute apart."""
+    monkeypatch.setenv("DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path}/events.db")
+    get_settings.cache_clear()
+    asyncio.run(database.dispose_engines())
+    database.create_tables_sync()
+    engine = database.get_sync_engine()
+    Event.__table__.create(engine)
+
+    buffer = EventWriteBuffer(lambda: engine, payload_codec="gzip", rollups=True)
+    for index in range(10):
+        sha = f"{index:040x}"
+        buffer.submit(
+            {
+                "repository": f"test/repo-{index % 2}",
+                "commit_sha": sha,
+                "pusher": "alice" if index < 6 else "bob",
+                "payload": json.dumps({"after": sha, "commits": []}),
+                "created_at": START + timedelta(minutes=index),
+            }
+        )
+    buffer.close()
+
+    app = FastAPI()
+    app.include_router(router)
+    yield TestClient(app)
+    asyncio.run(database.dispose_engines())
+    get_settings.cache_clear()
+
+
+def test_cursor_pages_walk_every_event_once(client):
+    """Keyset pages are newest-first, disjoint, and end with no cursor."""
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/events", params=params).json()
+        seen += [item["commit_sha"] for item in page["items"]]
+        assert all("payload" not in item for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [f"{index:040x}" for index in reversed(range(10))]
+
+
+def test_filters_and_payload_projection(client):
+    """Repository/pusher filters combine; payload is loaded only on request."""
+    page = client.get(
+        "/events",
+        params={
+            "repository": "test/repo-0",
+            "pusher": "alice",
+            "include_payload": True,
+        },
+    ).json()
+
+    assert [item["commit_sha"][-1] for item in page["items"]] == ["4", "2", "0"]
+    assert page["items"][0]["payload"] == {"after": f"{4:040x}", "commits": []}
+    assert client.get("/events", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_export_streams_ndjson(client, monkeypatch):
+    """The export walks all chunks and emits one JSON object per line."""
+    monkeypatch.setenv("EVENT_QUERY_EXPORT_CHUNK_SIZE", "4")
+    get_settings.cache_clear()
+
+    response = client.get(
+        "/events/export", params={"since": START + timedelta(minutes=2)}
+    )
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert len(lines) == 8
+    assert lines[-1]["created_at"] == (START + timedelta(minutes=2)).isoformat()
+
+
+def test_summary_reads_rollups(client):
+    """Per-pusher totals come from the rollup tables written with the events."""
+    response = client.get("/events/summary", params={"group_by": "pusher"})
+
+    items = response.json()["items"]
+    assert [(item["pusher"], item["pushes"]) for item in items] == [
+        ("alice", 6),
+        ("bob", 4),
+    ]
+    assert (
+        client.get("/events/summary", params={"granularity": "weekly"}).status_code
+        == 400
+    )
+
+
+def test_cursor_round_trip():
+    """Cursors are opaque but decode back to (created_at, id)."""
+    assert decode_cursor(encode_cursor(START, 42)) == (START, 42)
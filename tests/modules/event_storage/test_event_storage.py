@@ -0,0 +1,172 @@
+"""Tests for the buffered event storage path of the webhook task."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import os
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from yeonjae_universal_data_storage.models import Event
+from yeonjae_universal_git_data_parser.models import DiffData
+
+from infrastructure.database.event_rollups import (
+    EventRollupDaily,
+    compact_event_rollups,
+)
+from infrastructure.database.event_writer import close_event_writer, get_event_writer
+from modules.event_storage import EventStorageService
+from shared.config import database
+from shared.config.settings import get_settings
+
+
+@pytest.fixture(autouse=True)
+def events_table(monkeypatch, tmp_path):
+    """Temporary database with the events table."""
+    monkeypatch.setenv("DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path}/events.db")
+    monkeypatch.setenv("EVENT_PAYLOAD_STORAGE", "inline")
+    get_settings.cache_clear()
+    asyncio.run(database.dispose_engines())
+    database.create_tables_sync()
+    Event.__table__.create(database.get_sync_engine())
+    yield
+    close_event_writer()
+    asyncio.run(database.dispose_engines())
+    get_settings.cache_clear()
+
+
+def _store(
+    commit_sha: str = "a" * 40,
+    diff_content: bytes = b"+print('hi')\n",
+    service: EventStorageService = None,
+) -> None:
+    payload = {
+        "ref": "refs/heads/main",
+        "after": commit_sha,
+        "pusher": {"name": "octocat", "email": "octo@example.com"},
+        "commits": [{"id": commit_sha}],
+    }
+    diff = DiffData(
+        commit_sha=commit_sha,
+        repository="test/repo",
+        diff_content=diff_content,
+        added_lines=1,
+        deleted_lines=0,
+        files_changed=1,
+    )
+    (service or EventStorageService()).store_event_with_diff(
+        payload, {"X-GitHub-Event": "push"}, diff
+    )
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    """S3Client bound to a mocked bucket."""
+    moto = pytest.importorskip("moto")
+    boto3 = pytest.importorskip("boto3")
+    from infrastructure.aws.s3_client import S3Client
+
+    monkeypatch.setenv("AWS_S3_BUCKET", "test-diffs")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_REGION", "us-east-1")
+    with moto.mock_aws():
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="test-diffs")
+        client = S3Client()
+        yield client
+        client.close()
+
+
+def _daily_pushes() -> list:
+    table = EventRollupDaily.__table__
+    with database.get_sync_engine().connect() as connection:
+        return connection.execute(select(table.c.pusher, table.c.pushes)).all()
+
+
+def test_events_are_inserted_through_the_write_buffer():
+    """The task's storage call ends up as one buffered events row."""
+    _store()
+
+    assert get_event_writer().stats()["rows_written"] == 1
+    with database.get_sync_engine().connect() as connection:
+        row = connection.execute(select(Event.__table__)).mappings().one()
+    assert (row["platform"], row["pusher"], row["commit_count"]) == (
+        "github",
+        "octocat",
+        1,
+    )
+    assert gzip.decompress(row["diff_patch"]) == b"+print('hi')\n"
+    # Rollups are updated in the same transaction as the insert
+    assert _daily_pushes() == [("octocat", 1)]
+
+
+def test_same_large_diff_is_uploaded_to_s3_once(s3_client, monkeypatch):
+    """A second branch pushing the same diff seconds later reuses the object."""
+    results = []
+    upload = s3_client.upload_diff_deduplicated
+
+    async def recording_upload(content, **options):
+        results.append(await upload(content, **options))
+        return results[-1]
+
+    monkeypatch.setattr(s3_client, "upload_diff_deduplicated", recording_upload)
+    clock = SimpleNamespace(time=lambda: 1_700_000_000.0)
+    monkeypatch.setattr(gzip, "time", clock)
+    service = EventStorageService(s3_client=s3_client)
+    diff = os.urandom(300 * 1024)  # incompressible: above the inline limit
+
+    _store("a" * 40, diff, service)
+    clock.time = lambda: 1_700_000_005.0
+    _store("b" * 40, diff, service)
+
+    assert [result.deduplicated for result in results] == [False, True]
+    listing = s3_client.s3_client.list_objects_v2(Bucket="test-diffs")
+    assert [item["Key"] for item in listing["Contents"]] == [results[0].key]
+
+
+def test_redelivered_push_adds_no_blob_reference(s3_client):
+    """Only the stored event holds a reference; the rejected duplicate does not."""
+    from infrastructure.aws import blob_index
+
+    s3_client.dedup_index_enabled = True
+    service = EventStorageService(s3_client=s3_client)
+    diff = os.urandom(300 * 1024)
+
+    _store("a" * 40, diff, service)
+    with pytest.raises(IntegrityError):
+        _store("a" * 40, diff, service)
+
+    assert blob_index.get_dedup_stats()["total_references"] == 1
+
+
+def test_rollups_are_recounted_when_events_bypass_the_buffer(monkeypatch):
+    """With the buffer off, the nightly task folds in new events."""
+    monkeypatch.setenv("EVENT_ROLLUPS_ENABLED", "false")
+    get_settings.cache_clear()
+    _store()
+    close_event_writer()
+    assert _daily_pushes() == []
+
+    monkeypatch.setenv("EVENT_WRITE_BUFFER_ENABLED", "false")
+    get_settings.cache_clear()
+    compact_event_rollups()
+    assert _daily_pushes() == [("octocat", 1)]
+
+
+def test_task_module_binds_the_webhook_task_to_the_buffer(monkeypatch):
+    """Importing the task plugin swaps the package's storage service."""
+    from yeonjae_universal_webhook_receiver import tasks as receiver_tasks
+
+    # Restore the package's class after the test
+    monkeypatch.setattr(
+        receiver_tasks,
+        "LegacyDataStorageService",
+        receiver_tasks.LegacyDataStorageService,
+    )
+    from modules.event_storage import tasks
+
+    assert receiver_tasks.LegacyDataStorageService is EventStorageService
+    assert tasks.process_webhook_async is receiver_tasks.process_webhook_async
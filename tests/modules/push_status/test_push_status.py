@@ -0,0 +1,157 @@
+"""Tests for push status tracking and Celery result settings."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from modules.push_status import flush_push_status, get_push_status, record_push_status
+from modules.push_status.service import (
+    PROCESS_WEBHOOK_TASK,
+    on_inprocess_task,
+    on_task_finished,
+    on_task_published,
+    on_task_started,
+)
+from shared.config import database
+from shared.config.celery_app import build_result_config
+from shared.config.inprocess_executor import InProcessExecutor
+from shared.config.settings import Settings, get_settings
+from shared.utils.logging import correlation_scope
+
+
+@pytest.fixture(autouse=True)
+def status_table(monkeypatch, tmp_path):
+    """Temporary database with the push_status table."""
+    monkeypatch.setenv("DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path}/status.db")
+    get_settings.cache_clear()
+    asyncio.run(database.dispose_engines())
+    database.create_tables_sync()
+    yield
+    asyncio.run(database.dispose_engines())
+    get_settings.cache_clear()
+
+
+def _task(correlation_id: str) -> SimpleNamespace:
+    request = SimpleNamespace(headers={}, correlation_id=correlation_id)
+    return SimpleNamespace(name=PROCESS_WEBHOOK_TASK, request=request)
+
+
+def test_signals_track_a_push_through_the_pipeline():
+    """Publish, start and finish update one row keyed by delivery ID."""
+    payload = {
+        "ref": "refs/heads/main",
+        "after": "a" * 40,
+        "repository": {"full_name": "test/repo"},
+    }
+    on_task_published(
+        sender=PROCESS_WEBHOOK_TASK,
+        headers={"id": "task-1", "correlation_id": "d-1"},
+        body=([payload, {}], {}, {}),
+    )
+    assert flush_push_status()
+    assert get_push_status("d-1")["status"] == "queued"
+
+    on_task_started(task_id="task-1", task=_task("d-1"))
+    assert get_push_status("d-1")["status"] == "processing"
+
+    on_task_finished(
+        task_id="task-1",
+        task=_task("d-1"),
+        state="FAILURE",
+        retval=RuntimeError("GitHub API down"),
+    )
+    status = get_push_status("d-1")
+    assert status["status"] == "failed"
+    assert "GitHub API down" in status["error"]
+    assert (status["repository"], status["head_sha"]) == ("test/repo", "a" * 40)
+
+
+def test_coalesced_deliveries_each_get_a_status():
+    """A merged task records every delivery it carries, not only the last."""
+    headers = {"x-codeping-coalesced-deliveries": "d-1,d-2,d-3"}
+    on_task_published(
+        sender=PROCESS_WEBHOOK_TASK,
+        headers={"id": "task-1", "correlation_id": "d-3"},
+        body=([{"ref": "refs/heads/main"}, headers], {}, {}),
+    )
+    on_task_finished(
+        task_id="task-1", task=_task("d-3"), args=[{}, headers], state="SUCCESS"
+    )
+    flush_push_status()
+
+    assert [get_push_status(d)["status"] for d in ("d-1", "d-2", "d-3")] == [
+        "succeeded"
+    ] * 3
+
+
+def test_retry_is_not_a_failure_and_a_late_publish_does_not_rewind():
+    """RETRY maps to retrying; a stale queued write never overrides progress."""
+    on_task_started(task_id="task-1", task=_task("d-1"))
+    on_task_published(
+        sender=PROCESS_WEBHOOK_TASK,
+        headers={"id": "task-1", "correlation_id": "d-1"},
+        body=([{}, {}], {}, {}),
+    )
+    flush_push_status()
+    assert get_push_status("d-1")["status"] == "processing"
+
+    on_task_finished(
+        task_id="task-1", task=_task("d-1"), state="RETRY", retval="Retry in 60s"
+    )
+    assert get_push_status("d-1")["status"] == "retrying"
+
+    # Celery re-publishes the retried task
+    on_task_published(
+        sender=PROCESS_WEBHOOK_TASK,
+        headers={"id": "task-2", "correlation_id": "d-1"},
+        body=([{}, {}], {}, {}),
+    )
+    flush_push_status()
+    assert get_push_status("d-1")["status"] == "queued"
+
+
+def test_inprocess_executor_reports_status_without_celery_signals():
+    """Eager mode tracks pushes through the executor's listener."""
+    executor = InProcessExecutor(max_workers=1)
+    executor.add_listener(on_inprocess_task)
+    executor.register(PROCESS_WEBHOOK_TASK, lambda payload, headers: "ok")
+
+    with correlation_scope("d-7"):
+        executor.send_task(PROCESS_WEBHOOK_TASK, args=[{"ref": "main"}, {}]).get(5)
+    assert executor.drain(timeout=5)
+    flush_push_status()
+
+    status = get_push_status("d-7")
+    assert (status["status"], status["ref"]) == ("succeeded", "main")
+
+
+def test_other_tasks_are_not_tracked():
+    """Only the webhook pipeline task writes status rows."""
+    on_task_published(
+        sender="notion_sync.sync_documentation", headers={"id": "t"}, body=([], {}, {})
+    )
+    flush_push_status()
+    assert get_push_status("t") is None
+
+
+def test_missing_table_never_breaks_the_pipeline(monkeypatch, tmp_path):
+    """Tracking failures are logged, not raised."""
+    monkeypatch.setenv("DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path}/empty.db")
+    get_settings.cache_clear()
+
+    record_push_status("d-2", "queued")
+
+
+def test_results_are_ignored_unless_a_task_opts_in():
+    """Fire-and-forget by default; listed tasks keep their results."""
+    config = build_result_config(
+        Settings(celery_result_tasks=["notion_sync.sync_specific_page"])
+    )
+
+    assert config["task_ignore_result"] is True
+    assert config["task_annotations"] == {
+        "notion_sync.sync_specific_page": {"ignore_result": False}
+    }
@@ -0,0 +1,153 @@
+"""Tests for per-repository push coalescing."""
+
+from __future__ import annotations
+
+import json
+import time
+
+import pytest
+
+from modules.webhook_ingest import IngestDrainer, IngestQueue
+from modules.webhook_ingest.coalesce import (
+    PROCESS_WEBHOOK_TASK,
+    PushCoalescer,
+    merge_push_payloads,
+)
+from shared.utils.logging import correlation_scope
+
+
+class RecordingQueue:
+    def __init__(self):
+        self.sent = []
+
+    def send_task(self, task_name, args=None, kwargs=None):
+        self.sent.append((task_name, args, kwargs))
+
+
+def _push(repo: str, before: str, after: str, commit_ids) -> dict:
+    return {
+        "ref": "refs/heads/main",
+        "before": before,
+        "after": after,
+        "repository": {"full_name": repo},
+        "commits": [{"id": commit_id} for commit_id in commit_ids],
+    }
+
+
+def test_merge_spans_first_before_to_last_after():
+    """The merged push covers the union of commits in push order."""
+    merged = merge_push_payloads(
+        [_push("r", "a", "b", ["b"]), _push("r", "b", "d", ["b", "c", "d"])]
+    )
+
+    assert (merged["before"], merged["after"]) == ("a", "d")
+    assert [commit["id"] for commit in merged["commits"]] == ["b", "c", "d"]
+
+
+def test_burst_to_one_ref_becomes_one_task():
+    """Pushes inside the window are merged; other repos stay separate."""
+    queue = RecordingQueue()
+    coalescer = PushCoalescer(queue, window=0.05, max_pushes=10)
+
+    for index in range(3):
+        with correlation_scope(f"d-{index}"):
+            coalescer.send_task(
+                PROCESS_WEBHOOK_TASK,
+                args=[
+                    _push("org/app", str(index), str(index + 1), [str(index + 1)]),
+                    {"x-github-delivery": f"d-{index}"},
+                ],
+            )
+    coalescer.send_task(
+        PROCESS_WEBHOOK_TASK, args=[_push("org/other", "x", "y", ["y"]), {}]
+    )
+
+    deadline = time.monotonic() + 2
+    while len(queue.sent) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    coalescer.close()
+
+    payloads = {args[0]["repository"]["full_name"]: args for _, args, _ in queue.sent}
+    merged, headers = payloads["org/app"]
+    assert len(queue.sent) == 2
+    assert [commit["id"] for commit in merged["commits"]] == ["1", "2", "3"]
+    assert headers["x-codeping-coalesced-deliveries"] == "d-0,d-1,d-2"
+    assert coalescer.stats()["pushes_received"] == 4
+
+
+def test_max_pushes_dispatches_early_and_other_tasks_pass_through():
+    """A full buffer is sent at once; unrelated tasks are never buffered."""
+    queue = RecordingQueue()
+    coalescer = PushCoalescer(queue, window=60, max_pushes=2)
+
+    coalescer.send_task("notion_sync.sync_documentation")
+    coalescer.send_task(PROCESS_WEBHOOK_TASK, args=[_push("r", "a", "b", ["b"]), {}])
+    coalescer.send_task(PROCESS_WEBHOOK_TASK, args=[_push("r", "b", "c", ["c"]), {}])
+
+    assert [name for name, _, _ in queue.sent] == [
+        "notion_sync.sync_documentation",
+        PROCESS_WEBHOOK_TASK,
+    ]
+    coalescer.close()
+    assert len(queue.sent) == 2
+
+
+def test_force_push_starts_a_new_group():
+    """Commits discarded by a force-push are never merged into its task."""
+    queue = RecordingQueue()
+    coalescer = PushCoalescer(queue, window=60, max_pushes=10)
+
+    coalescer.send_task(PROCESS_WEBHOOK_TASK, args=[_push("r", "a", "b", ["b"]), {}])
+    coalescer.send_task(PROCESS_WEBHOOK_TASK, args=[_push("r", "b", "c", ["c"]), {}])
+    forced = {**_push("r", "c", "x", ["x"]), "forced": True}
+    coalescer.send_task(PROCESS_WEBHOOK_TASK, args=[forced, {}])
+    coalescer.send_task(PROCESS_WEBHOOK_TASK, args=[_push("r", "x", "y", ["y"]), {}])
+    coalescer.close()
+
+    merged = [args[0] for _, args, _ in queue.sent]
+    assert [
+        (payload["before"], payload["after"], payload["forced"]) for payload in merged
+    ] == [("a", "c", False), ("c", "y", True)]
+    assert [commit["id"] for commit in merged[1]["commits"]] == ["x", "y"]
+
+
+class BrokerDown(RecordingQueue):
+    def send_task(self, task_name, args=None, kwargs=None):
+        raise ConnectionError("broker down")
+
+
+class CoalescingService:
+    """Stand-in for WebhookService: parses the body and sends the push task."""
+
+    def __init__(self, task_queue):
+        self.task_queue = task_queue
+
+    async def process_webhook(self, headers, body, github_event):
+        self.task_queue.send_task(
+            PROCESS_WEBHOOK_TASK, args=[json.loads(body), headers]
+        )
+
+
+@pytest.mark.parametrize(
+    "task_queue, depth",
+    [
+        (RecordingQueue(), {"pending": 0, "dead": 0}),
+        (BrokerDown(), {"pending": 0, "dead": 2}),
+    ],
+)
+def test_drainer_settles_coalesced_rows_after_publish(tmp_path, task_queue, depth):
+    """Buffered rows stay queued until the merged task is published or fails."""
+    # max_attempts=1: a nacked row shows up as dead
+    ingest_queue = IngestQueue(str(tmp_path / "drain.db"), max_attempts=1)
+    for index in range(2):
+        body = json.dumps(_push("org/app", str(index), str(index + 1), [str(index)]))
+        ingest_queue.enqueue(body.encode(), {}, "push", f"d-{index}")
+    coalescer = PushCoalescer(task_queue, window=60, max_pushes=10)
+    drainer = IngestDrainer(ingest_queue, webhook_service=CoalescingService(coalescer))
+
+    assert drainer.drain_once() == 2
+    assert ingest_queue.depth() == {"pending": 2, "dead": 0}
+
+    coalescer.close()
+    assert ingest_queue.depth() == depth
+    ingest_queue.close()
@@ -0,0 +1,184 @@
+"""Tests for webhook delivery deduplication."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from modules.webhook_ingest import IngestDrainer, IngestQueue
+from modules.webhook_ingest.dedup import (
+    DeliveryDeduplicator,
+    DeliveryDedupMiddleware,
+    extract_dedup_keys,
+)
+from shared.config import database
+from shared.config.settings import get_settings
+
+SECRET = "test_webhook_secret"
+HEAD_SHA = "a" * 40
+
+
+def _push_body(after: str = HEAD_SHA) -> bytes:
+    return json.dumps(
+        {
+            "ref": "refs/heads/main",
+            "before": "b" * 40,
+            "after": after,
+            "repository": {"full_name": "test/repo", "name": "repo"},
+            "commits": [],
+        }
+    ).encode()
+
+
+def _headers(body: bytes, delivery_id: str) -> dict:
+    signature = hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+    return {
+        "X-Hub-Signature-256": f"sha256={signature}",
+        "X-GitHub-Event": "push",
+        "X-GitHub-Delivery": delivery_id,
+    }
+
+
+@pytest.fixture(autouse=True)
+def delivery_table(monkeypatch, tmp_path):
+    """Temporary database with the webhook_deliveries table."""
+    monkeypatch.setenv("DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path}/dedup.db")
+    get_settings.cache_clear()
+    asyncio.run(database.dispose_engines())
+    database.create_tables_sync()
+    yield
+    asyncio.run(database.dispose_engines())
+    get_settings.cache_clear()
+
+
+def test_extract_dedup_keys():
+    """Delivery ID and repo/ref/head SHA come from the parsed payload."""
+    keys = extract_dedup_keys({"x-github-delivery": "d-1"}, _push_body())
+
+    assert keys == ["delivery:d-1", f"head:test/repo:refs/heads/main:{HEAD_SHA}"]
+    # Branch deletions carry a zero SHA and are never treated as duplicates
+    assert extract_dedup_keys({}, _push_body(after="0" * 40)) == []
+    assert extract_dedup_keys({"x-github-delivery": "d-1"}, b"not json") == [
+        "delivery:d-1"
+    ]
+
+
+def test_extract_dedup_keys_ignores_nested_lookalike_fields():
+    """Fields named ref/full_name inside commits do not leak into the key."""
+    body = json.dumps(
+        {
+            "commits": [{"ref": "refs/heads/other", "full_name": "other/repo"}],
+            "ref": "refs/heads/main",
+            "after": HEAD_SHA,
+            "repository": {"full_name": "test/repo"},
+        }
+    ).encode()
+
+    assert extract_dedup_keys({}, body) == [
+        f"head:test/repo:refs/heads/main:{HEAD_SHA}"
+    ]
+
+
+def test_claim_is_shared_through_the_database():
+    """A second replica (fresh LRU) still rejects an already claimed key."""
+    keys = ["delivery:d-1"]
+
+    assert DeliveryDeduplicator().claim(keys) is True
+    other_replica = DeliveryDeduplicator()
+    assert other_replica.claim(keys) is False
+    assert other_replica.seen(keys) is True
+
+    other_replica.release(keys)
+    assert DeliveryDeduplicator().claim(keys) is True
+
+
+def test_drainer_skips_redelivered_push(tmp_path):
+    """Two deliveries of the same head SHA dispatch only once."""
+    ingest_queue = IngestQueue(str(tmp_path / "drain.db"))
+    for delivery_id in ("d-1", "d-2"):
+        ingest_queue.enqueue(
+            _push_body(), {"x-github-delivery": delivery_id}, "push", delivery_id
+        )
+
+    calls = []
+
+    class RecordingService:
+        async def process_webhook(self, headers, body, github_event):
+            calls.append(headers["x-github-delivery"])
+
+    drainer = IngestDrainer(
+        ingest_queue,
+        webhook_service=RecordingService(),
+        deduplicator=DeliveryDeduplicator(),
+    )
+
+    assert drainer.drain_once() == 2
+    assert calls == ["d-1"]
+    assert drainer.duplicates == 1
+    assert ingest_queue.depth()["pending"] == 0
+    ingest_queue.close()
+
+
+def test_redelivered_queue_row_takes_over_its_in_flight_claim(tmp_path):
+    """A crash between claim and dispatch does not turn the push into a duplicate."""
+    ingest_queue = IngestQueue(str(tmp_path / "drain.db"))
+    ingest_queue.enqueue(_push_body(), {"x-github-delivery": "d-1"}, "push", "d-1")
+    # First attempt: claimed, then the process died before dispatching
+    (row,) = ingest_queue.lease(1, lease_seconds=0)
+    keys = extract_dedup_keys(row.headers, row.body)
+    owner = f"ingest:{ingest_queue.queue_id}:{row.id}"
+    assert DeliveryDeduplicator().claim(keys, owner=owner)
+
+    # Another delivery of the same head SHA is still a duplicate meanwhile
+    assert DeliveryDeduplicator().claim([keys[1]], owner="ingest:other:1") is False
+
+    calls = []
+
+    class RecordingService:
+        async def process_webhook(self, headers, body, github_event):
+            calls.append(headers["x-github-delivery"])
+
+    drainer = IngestDrainer(
+        ingest_queue,
+        webhook_service=RecordingService(),
+        deduplicator=DeliveryDeduplicator(),
+    )
+
+    assert drainer.drain_once() == 1
+    assert calls == ["d-1"]
+    assert drainer.duplicates == 0
+    # Once dispatched the claim is done: even its owner is now a duplicate
+    assert DeliveryDeduplicator().claim(keys, owner=owner) is False
+    ingest_queue.close()
+
+
+def test_middleware_answers_duplicates_before_the_router():
+    """Redelivered pushes never reach the wrapped webhook router."""
+    calls = []
+    app = FastAPI()
+
+    @app.post("/webhook/")
+    async def webhook():
+        calls.append(1)
+        return JSONResponse({"status": "success"})
+
+    app.add_middleware(
+        DeliveryDedupMiddleware, deduplicator=DeliveryDeduplicator(), secret=SECRET
+    )
+    client = TestClient(app)
+    body = _push_body()
+
+    first = client.post("/webhook/", content=body, headers=_headers(body, "d-1"))
+    retry = client.post("/webhook/", content=body, headers=_headers(body, "d-1"))
+    redelivery = client.post("/webhook/", content=body, headers=_headers(body, "d-2"))
+
+    assert first.json() == {"status": "success"}
+    assert retry.json() == redelivery.json() == {"status": "duplicate"}
+    assert calls == [1]
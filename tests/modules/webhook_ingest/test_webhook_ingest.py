@@ -0,0 +1,109 @@
+"""Tests for the webhook ingest fast path."""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from modules.webhook_ingest import IngestDrainer, IngestQueue
+from modules.webhook_ingest.service import get_ingest_queue
+from shared.utils.logging import get_correlation_id as correlation_id
+
+SECRET = "test_webhook_secret"
+
+
+def _signature(body: bytes) -> str:
+    return "sha256=" + hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+
+
+def _push_body() -> bytes:
+    return json.dumps(
+        {
+            "ref": "refs/heads/main",
+            "repository": {"full_name": "test/repo", "name": "repo"},
+            "pusher": {"name": "testuser"},
+            "commits": [],
+        }
+    ).encode()
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    """App built with the ingest fast path enabled."""
+    from shared.config.settings import get_settings
+
+    monkeypatch.setenv("GITHUB_WEBHOOK_SECRET", SECRET)
+    monkeypatch.setenv("WEBHOOK_INGEST_ENABLED", "true")
+    monkeypatch.setenv("WEBHOOK_INGEST_QUEUE_PATH", str(tmp_path / "ingest.db"))
+    get_settings.cache_clear()
+    get_ingest_queue.cache_clear()
+
+    from main import create_app
+
+    yield TestClient(create_app())
+    get_ingest_queue().close()
+    get_ingest_queue.cache_clear()
+    get_settings.cache_clear()
+
+
+def test_push_is_enqueued_and_acknowledged(client):
+    """A signed push returns 202 after only the enqueue."""
+    body = _push_body()
+    response = client.post(
+        "/webhook/",
+        content=body,
+        headers={
+            "X-Hub-Signature-256": _signature(body),
+            "X-GitHub-Event": "push",
+            "X-GitHub-Delivery": "d-1",
+        },
+    )
+
+    assert response.status_code == 202
+    assert response.json() == {"status": "accepted", "delivery_id": "d-1"}
+    [queued] = get_ingest_queue().lease(10)
+    assert queued.body == body
+    assert queued.event == "push"
+
+
+def test_invalid_signature_is_rejected_without_enqueue(client):
+    """Bad signatures never reach the queue."""
+    response = client.post(
+        "/webhook/",
+        content=_push_body(),
+        headers={"X-Hub-Signature-256": "sha256=bad", "X-GitHub-Event": "push"},
+    )
+
+    assert response.status_code == 401
+    assert get_ingest_queue().depth()["pending"] == 0
+
+
+def test_drainer_dispatches_and_retries(tmp_path):
+    """The drainer acks processed deliveries and releases failed ones."""
+    ingest_queue = IngestQueue(str(tmp_path / "drain.db"), max_attempts=2)
+    ingest_queue.enqueue(b"{}", {"x-github-event": "push"}, "push", "ok")
+    ingest_queue.enqueue(b"{}", {"x-github-event": "push"}, "push", "boom")
+
+    class FlakyService:
+        async def process_webhook(self, headers, body, github_event):
+            if correlation_id() == "boom":
+                raise RuntimeError("broker down")
+
+    drainer = IngestDrainer(ingest_queue, webhook_service=FlakyService())
+
+    assert drainer.drain_once() == 2
+    assert drainer.processed == 1 and drainer.failed == 1
+    assert ingest_queue.depth() == {"pending": 1, "dead": 0}
+    ingest_queue.close()
+
+
+def test_queue_rejects_unknown_synchronous_mode(tmp_path):
+    """The PRAGMA value comes from settings and is checked before use."""
+    with pytest.raises(ValueError):
+        IngestQueue(str(tmp_path / "bad.db"), synchronous="FULL; DROP TABLE x")
+
+    assert IngestQueue(str(tmp_path / "ok.db"), synchronous="full").path
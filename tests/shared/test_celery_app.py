@@ -0,0 +1,89 @@
+"""Tests for Celery queue routing configuration."""
+
+from __future__ import annotations
+
+from celery import Celery
+from celery.app.utils import find_app
+
+from shared.config import celery_app as celery_app_module
+from shared.config.celery_app import (
+    build_beat_schedule,
+    build_routing_config,
+    prefetch_multiplier_for,
+)
+from shared.config.settings import Settings
+
+
+def _app(settings: Settings) -> Celery:
+    app = Celery("routing-test", set_as_current=False)
+    app.conf.update(
+        broker_url=settings.celery_broker_url, **build_routing_config(settings)
+    )
+    return app
+
+
+def test_webhook_and_bulk_tasks_use_separate_queues():
+    """Webhook work never shares a queue with Notion sync."""
+    app = _app(Settings())
+
+    webhook = app.amqp.router.route({}, "webhook_receiver.process_webhook_async")
+    bulk = app.amqp.router.route({}, "notion_sync.sync_documentation")
+    other = app.amqp.router.route({}, "misc.task")
+    maintenance = app.amqp.router.route({}, "events.maintain_partitions")
+
+    assert webhook["queue"].name == "webhook_queue"
+    assert bulk["queue"].name == "bulk"
+    assert other["queue"].name == "celery"
+    assert maintenance["queue"].name == "bulk"
+    assert app.conf.task_acks_late is True
+
+
+def test_priorities_follow_broker_ordering():
+    """Redis runs priority 0 first, AMQP the highest number first."""
+    redis = build_routing_config(Settings(celery_broker_url="redis://localhost:6379/0"))
+    amqp = build_routing_config(Settings(celery_broker_url="amqp://localhost//"))
+
+    assert redis["task_routes"]["webhook_receiver.*"]["priority"] == 0
+    assert redis["task_routes"]["notion_sync.*"]["priority"] == 9
+    assert amqp["task_routes"]["webhook_receiver.*"]["priority"] == 9
+    assert amqp["task_routes"]["notion_sync.*"]["priority"] == 0
+    assert redis["broker_transport_options"]["queue_order_strategy"] == "priority"
+
+
+def test_priorities_can_be_disabled():
+    """CELERY_MAX_PRIORITY=0 leaves routes and queues without priorities."""
+    config = build_routing_config(Settings(celery_max_priority=0))
+
+    assert "priority" not in config["task_routes"]["webhook_receiver.*"]
+    assert "task_queue_max_priority" not in config
+
+
+def test_prefetch_multiplier_per_queue():
+    """Workers touching the webhook queue prefetch conservatively."""
+    settings = Settings(
+        celery_webhook_prefetch_multiplier=1, celery_bulk_prefetch_multiplier=8
+    )
+
+    assert prefetch_multiplier_for(["webhook_queue"], settings) == 1
+    assert prefetch_multiplier_for(["webhook_queue", "bulk"], settings) == 1
+    assert prefetch_multiplier_for(["bulk"], settings) == 8
+
+
+def test_event_retention_is_scheduled_only_when_enabled():
+    """The partition/retention job is off by default and runs daily when set."""
+    schedule = build_beat_schedule(Settings(event_retention_months=12))
+    disabled = build_beat_schedule(Settings())
+
+    assert schedule["maintain-event-partitions"]["task"] == "events.maintain_partitions"
+    assert schedule["compact-event-rollups"]["task"] == "events.compact_rollups"
+    assert "maintain-event-partitions" not in disabled
+    assert "sync-notion-documentation" in disabled
+
+
+def test_celery_cli_finds_the_lazy_app(monkeypatch):
+    """``celery -A shared.config.celery_app`` resolves the lazily created app."""
+    app = Celery("cli-test", set_as_current=False)
+    monkeypatch.setattr(celery_app_module, "_celery_app", app)
+
+    assert find_app("shared.config.celery_app") is app
+    assert find_app("shared.config.celery_app:celery_app") is app
@@ -0,0 +1,56 @@
+"""Tests for the pooled engine registry in shared.config.database."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from shared.config import database
+from shared.config.settings import get_settings
+
+
+@pytest.fixture(autouse=True)
+def isolated_registry(monkeypatch, tmp_path):
+    """Point settings at a temporary database and start with an empty registry."""
+    monkeypatch.setenv("DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path}/registry.db")
+    get_settings.cache_clear()
+    asyncio.run(database.dispose_engines())
+    yield
+    asyncio.run(database.dispose_engines())
+    get_settings.cache_clear()
+
+
+def test_engines_are_cached_per_url():
+    """Repeated lookups return the same engine and session maker."""
+    assert database.get_engine() is database.get_engine()
+    assert database.get_sync_engine() is database.get_sync_engine()
+    assert database.get_session_maker() is database.get_session_maker()
+    assert database.get_engine() is not database.get_sync_engine()
+
+
+def test_sessions_share_one_pool():
+    """Sessions reuse the cached sync engine instead of building new pools."""
+    with database.get_session() as first:
+        first_bind = first.get_bind()
+    with database.get_session() as second:
+        second_bind = second.get_bind()
+
+    assert first_bind is second_bind is database.get_sync_engine()
+
+
+def test_dispose_engines_clears_registry():
+    """Disposing drops cached engines so the next call builds a fresh one."""
+    engine = database.get_engine()
+    asyncio.run(database.dispose_engines())
+
+    assert database.get_engine() is not engine
+
+
+def test_reset_after_fork_drops_inherited_engines():
+    """The fork hook forgets engines inherited from the parent process."""
+    engine = database.get_sync_engine()
+    database._registry_lock.acquire()  # held by another thread at fork time
+    database._reset_after_fork()
+
+    assert database.get_sync_engine() is not engine
@@ -0,0 +1,102 @@
+"""Tests for the in-process (eager mode) task executor."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from shared.config.inprocess_executor import ExecutorSaturated, InProcessExecutor
+from shared.utils.logging import correlation_scope, get_correlation_id
+
+
+def test_runs_sync_and_async_tasks_with_caller_context():
+    """Both task kinds run and see the publisher's correlation ID."""
+    executor = InProcessExecutor(max_workers=2)
+
+    async def async_task(value):
+        await asyncio.sleep(0)
+        return value, get_correlation_id()
+
+    executor.register("sync", lambda value: (value * 2, get_correlation_id()))
+    executor.register("async", async_task)
+
+    with correlation_scope("d-1"):
+        sync_result = executor.send_task("sync", args=[21])
+        async_result = executor.send_task("async", args=["x"])
+
+    assert sync_result.get(timeout=5) == (42, "d-1")
+    assert async_result.get(timeout=5) == ("x", "d-1")
+    assert executor.drain(timeout=5)
+    assert executor.stats()["succeeded"] == 2
+
+
+def test_per_task_limit_serialises_runs():
+    """A task limited to 1 never runs concurrently with itself."""
+    executor = InProcessExecutor(max_workers=4, task_limits={"sync_docs": 1})
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def sync_docs():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+
+    executor.register("sync_docs", sync_docs)
+    results = [executor.send_task("sync_docs") for _ in range(4)]
+    for result in results:
+        result.get(timeout=5)
+
+    assert peak[0] == 1
+    executor.drain(timeout=5)
+
+
+def test_backpressure_and_drain():
+    """A full executor rejects new work; drain waits and then refuses more."""
+    executor = InProcessExecutor(max_workers=1, max_pending=1, submit_timeout=0.05)
+    release = threading.Event()
+    executor.register("block", release.wait)
+    executor.register("fail", lambda: 1 / 0)
+
+    first = executor.send_task("block", args=[5])
+    with pytest.raises(ExecutorSaturated):
+        executor.send_task("block", args=[5])
+
+    release.set()
+    assert first.get(timeout=5) is True
+    with pytest.raises(ZeroDivisionError):
+        executor.send_task("fail").get(timeout=5)
+
+    assert executor.drain(timeout=5)
+    assert executor.stats()["rejected"] == 1
+    assert executor.stats()["failed"] == 1
+    with pytest.raises(ExecutorSaturated):
+        executor.send_task("block")
+
+
+def test_unknown_task_fails_loudly():
+    """Unregistered task names fail instead of being silently dropped."""
+    executor = InProcessExecutor()
+
+    with pytest.raises(LookupError):
+        executor.send_task("nope.task").get(timeout=5)
+    executor.drain(timeout=5)
+
+
+def test_drain_timeout_covers_all_tasks():
+    """Tasks finishing one after another share one deadline, not one each."""
+    executor = InProcessExecutor(max_workers=1)
+    for delay in (0.15, 0.3, 0.45):
+        future = Future()
+        executor._inflight.add(future)
+        threading.Timer(delay, future.set_result, args=[None]).start()
+
+    started = time.monotonic()
+    assert not executor.drain(timeout=0.25)
+    assert time.monotonic() - started < 0.4
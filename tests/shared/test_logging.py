@@ -0,0 +1,203 @@
+"""Tests for module flow logging in shared.utils.logging."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import queue
+import time
+
+import pytest
+
+from shared.utils import logging as flow_logging
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def captured_flow():
+    """Capture flow logger output and restore logging config afterwards."""
+    handler = ListHandler()
+    flow_logging.flow_logger.addHandler(handler)
+    level = flow_logging.flow_logger.level
+    yield handler
+    flow_logging.flow_logger.removeHandler(handler)
+    flow_logging.flow_logger.setLevel(level)
+    flow_logging.configure_flow_logging()
+
+
+@pytest.mark.parametrize("backend", ["json", "orjson"])
+def test_compact_mode_emits_single_line_json(captured_flow, backend):
+    """Compact mode serializes each flow event onto one line."""
+    flow_logging.configure_flow_logging(compact=True, json_backend=backend)
+
+    flow_logging.log_module_io(
+        "DiffAnalyzer", "analyze_INPUT", input_data={"files": ["a.py", "b.py"]}
+    )
+
+    message = captured_flow.messages[-1]
+    assert "\n" not in message
+    entry = json.loads(message.removeprefix("MODULE_FLOW: "))
+    assert entry["module"] == "DiffAnalyzer"
+    assert entry["input"] == {"files": ["a.py", "b.py"]}
+
+
+def test_disabled_level_skips_payload_building(captured_flow, monkeypatch):
+    """No simplification or serialization happens when INFO is disabled."""
+    flow_logging.flow_logger.setLevel(logging.WARNING)
+    monkeypatch.setattr(
+        flow_logging, "simplify_data", pytest.fail  # would be called otherwise
+    )
+
+    flow_logging.log_module_io("DiffAnalyzer", "analyze_INPUT", input_data={"x": 1})
+
+    assert captured_flow.messages == []
+
+
+def test_sample_rate_drops_module_events(captured_flow):
+    """A zero sample rate silences one module without touching the others."""
+    flow_logging.configure_flow_logging(sample_rates={"DiffAnalyzer": 0.0})
+
+    flow_logging.log_module_io("DiffAnalyzer", "analyze_INPUT")
+    flow_logging.log_module_io("DataStorage", "store_INPUT")
+
+    assert len(captured_flow.messages) == 1
+    assert "DataStorage" in captured_flow.messages[0]
+
+
+@pytest.mark.parametrize(
+    "policy, expected",
+    [("drop_oldest", ["2", "3"]), ("drop_newest", ["1", "2"])],
+)
+def test_bounded_queue_handler_overflow_policies(policy, expected):
+    """A full queue drops records per policy and counts them."""
+    log_queue: queue.Queue = queue.Queue(maxsize=2)
+    handler = flow_logging.BoundedQueueHandler(log_queue, overflow_policy=policy)
+    logger = logging.getLogger("tests.bounded_queue")
+
+    for message in ["1", "2", "3"]:
+        record = logger.makeRecord(logger.name, logging.INFO, "", 0, message, (), None)
+        handler.handle(record)
+
+    queued = [log_queue.get_nowait().getMessage() for _ in range(log_queue.qsize())]
+    assert queued == expected
+    assert handler.dropped == 1
+
+
+def test_async_logging_flushes_on_shutdown(monkeypatch):
+    """Async mode routes records through the queue and drains on shutdown."""
+    from shared.config.settings import get_settings
+
+    monkeypatch.setenv("LOG_ASYNC_ENABLED", "true")
+    get_settings.cache_clear()
+    capture = ListHandler()
+    loggers = [flow_logging.flow_logger, *flow_logging.module_loggers.values()]
+    original_handlers = {logger: list(logger.handlers) for logger in loggers}
+    try:
+        flow_logging.setup_detailed_logging()
+        listener = flow_logging._async_logging["listener"]
+        listener.handlers[0].handlers["module_flow"] = capture
+
+        flow_logging.flow_logger.info("queued record")
+        assert flow_logging.get_log_queue_stats()["enabled"]
+        flow_logging.shutdown_logging()
+
+        assert capture.messages == ["queued record"]
+        assert not flow_logging.get_log_queue_stats()["enabled"]
+    finally:
+        flow_logging.shutdown_logging()
+        for logger, handlers in original_handlers.items():
+            logger.handlers[:] = handlers
+        get_settings.cache_clear()
+
+
+def test_listener_stops_with_a_full_queue():
+    """The stop sentinel waits for room instead of raising queue.Full."""
+    log_queue: queue.Queue = queue.Queue(maxsize=2)
+    capture = ListHandler()
+
+    class SlowHandler(logging.Handler):
+        def emit(self, record):
+            time.sleep(0.05)
+            capture.emit(record)
+
+    listener = flow_logging._DrainingQueueListener(log_queue, SlowHandler())
+    listener.start()
+    logger = logging.getLogger("tests.full_queue")
+    for message in ["1", "2", "3", "4"]:
+        record = logger.makeRecord(logger.name, logging.INFO, "", 0, message, (), None)
+        log_queue.put(record)
+
+    listener.stop()
+
+    assert capture.messages == ["1", "2", "3", "4"]
+
+
+def test_span_timings_do_not_mix_across_concurrent_tasks():
+    """One shared logger times concurrent coroutines independently."""
+    from shared.utils.metrics import latency_metrics
+
+    latency_metrics.reset()
+    io_logger = flow_logging.ModuleIOLogger("DiffAnalyzer")
+
+    async def work(delay: float):
+        async with io_logger.span(f"parse_{delay}"):
+            await asyncio.sleep(delay)
+
+    async def main():
+        await asyncio.gather(work(0.05), work(0.01))
+
+    asyncio.run(main())
+
+    snapshot = latency_metrics.snapshot()
+    slow = snapshot[("DiffAnalyzer", "parse_0.05", "ok")]["max"]
+    fast = snapshot[("DiffAnalyzer", "parse_0.01", "ok")]["max"]
+    assert slow >= 0.05 > fast
+    latency_metrics.reset()
+
+
+def test_span_nesting_and_decorator(captured_flow):
+    """Nested spans report their parent and decorators capture the result."""
+    storage = flow_logging.ModuleIOLogger("DataStorage")
+    analyzer = flow_logging.ModuleIOLogger("DiffAnalyzer")
+
+    @analyzer.span("analyze")
+    def analyze():
+        return {"files": 2}
+
+    with storage.span("store"):
+        assert analyze() == {"files": 2}
+
+    analyze_output = next(m for m in captured_flow.messages if "analyze_OUTPUT" in m)
+    assert '"parent_operation": "DataStorage.store"' in analyze_output
+    assert '"depth": 1' in analyze_output
+
+
+def test_correlation_scope_tags_flow_events(captured_flow):
+    """Flow events carry the per-push correlation ID."""
+    with flow_logging.correlation_scope("delivery-123"):
+        flow_logging.log_module_io("WebhookReceiver", "receive_INPUT")
+    flow_logging.log_module_io("WebhookReceiver", "receive_OUTPUT")
+
+    assert '"correlation_id": "delivery-123"' in captured_flow.messages[0]
+    assert "correlation_id" not in captured_flow.messages[1]
+    assert flow_logging.get_correlation_id() is None
+
+
+def test_correlation_middleware_uses_github_delivery_id():
+    """The API echoes X-GitHub-Delivery back as X-Correlation-ID."""
+    from fastapi.testclient import TestClient
+
+    from main import app
+
+    response = TestClient(app).get("/health", headers={"X-GitHub-Delivery": "abc"})
+
+    assert response.headers["x-correlation-id"] == "abc"
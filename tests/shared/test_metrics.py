@@ -0,0 +1,60 @@
+"""Tests for module latency histograms and the /metrics endpoint."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from shared.utils.logging import ModuleIOLogger
+from shared.utils.metrics import LatencyHistogram, latency_metrics
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    latency_metrics.reset()
+    yield
+    latency_metrics.reset()
+
+
+def test_histogram_quantiles_and_max():
+    """Quantiles interpolate within buckets and never exceed the max."""
+    histogram = LatencyHistogram(buckets=(0.1, 1.0))
+    for _ in range(98):
+        histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(2.0)
+
+    assert histogram.count == 100
+    assert histogram.quantile(0.5) <= 0.1
+    assert 0.1 < histogram.quantile(0.99) <= 1.0
+    assert histogram.max == 2.0
+    assert histogram.quantile(1.0) == 2.0
+
+
+def test_module_io_logger_records_durations():
+    """log_output and log_error feed per-module, per-operation histograms."""
+    io_logger = ModuleIOLogger("DiffAnalyzer")
+    io_logger.log_input("analyze")
+    io_logger.log_output("analyze", data={"files": 1})
+    io_logger.log_input("analyze")
+    io_logger.log_error("analyze", ValueError("bad diff"))
+
+    snapshot = latency_metrics.snapshot()
+    assert snapshot[("DiffAnalyzer", "analyze", "ok")]["count"] == 1
+    assert snapshot[("DiffAnalyzer", "analyze", "error")]["count"] == 1
+
+
+def test_metrics_endpoint_renders_prometheus_text():
+    """/metrics exposes histogram buckets and quantile gauges."""
+    latency_metrics.observe("DataStorage", "store", 0.02)
+
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    labels = 'module="DataStorage",operation="store",outcome="ok"'
+    assert f"codeping_module_operation_duration_seconds_count{{{labels}}} 1" in body
+    assert f'{labels},quantile="0.99"' in body
+    assert "codeping_log_records_dropped_total 0" in body
@@ -0,0 +1,97 @@
+"""Tests for entry-point plugin discovery."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from shared.config import plugins
+from shared.config.celery_app import build_beat_schedule
+from shared.config.settings import Settings
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    plugins.clear_plugin_cache()
+    yield
+    plugins.clear_plugin_cache()
+
+
+def _entry_points(scans: list, routers: dict = None):
+    def scan():
+        scans.append(1)
+        return {plugins.ROUTER_GROUP: dict(routers or {}), plugins.TASK_GROUP: {}}
+
+    return scan
+
+
+def test_entry_points_override_builtins_and_lists_select_plugins(monkeypatch):
+    """Entry points win over builtins; enable/disable lists filter by name."""
+    monkeypatch.setattr(
+        plugins,
+        "_scan",
+        _entry_points(
+            [],
+            {
+                "webhook_receiver": "custom.router:router",
+                "reports": "reports.api:router",
+            },
+        ),
+    )
+
+    everything = plugins.get_router_plugins(Settings())
+    only_reports = plugins.get_router_plugins(Settings(plugins_enabled=["reports"]))
+    tasks = plugins.get_task_plugins(Settings(plugins_disabled=["notion_sync"]))
+
+    assert [(plugin.name, plugin.value) for plugin in everything] == [
+        ("reports", "reports.api:router"),
+        ("webhook_receiver", "custom.router:router"),
+    ]
+    assert [plugin.name for plugin in only_reports] == ["reports"]
+    assert [plugin.module for plugin in tasks] == [
+        "modules.event_storage.tasks",
+        "yeonjae_universal_webhook_receiver.tasks",
+    ]
+
+
+def test_discovery_is_cached_in_process_and_on_disk(monkeypatch, tmp_path):
+    """A fresh process reuses the cache file until sys.path directories change."""
+    scans = []
+    cache_path = str(tmp_path / "plugins.json")
+    monkeypatch.setattr(
+        plugins, "_scan", _entry_points(scans, {"reports": "reports.api:router"})
+    )
+    settings = Settings(plugin_cache_path=cache_path)
+
+    plugins.get_router_plugins(settings)
+    plugins.get_task_plugins(settings)
+    plugins.clear_plugin_cache()  # next process
+    assert plugins.get_router_plugins(settings)[0].name == "reports"
+    assert len(scans) == 1
+
+    with open(cache_path, encoding="utf-8") as handle:
+        cached = json.load(handle)
+    cached["fingerprint"] = []  # a package was installed since
+    with open(cache_path, "w", encoding="utf-8") as handle:
+        json.dump(cached, handle)
+    plugins.clear_plugin_cache()
+    plugins.get_router_plugins(settings)
+    assert len(scans) == 2
+
+
+def test_plugin_load_resolves_attribute_paths():
+    """``module:attribute`` returns the attribute, a bare module the module."""
+    module = plugins.Plugin("json", plugins.TASK_GROUP, "json")
+    attribute = plugins.Plugin("dumps", plugins.ROUTER_GROUP, "json:dumps")
+
+    assert module.load() is json
+    assert attribute.load() is json.dumps
+
+
+def test_disabled_task_plugin_drops_its_beat_entry():
+    """Nodes without notion_sync do not schedule its periodic sync."""
+    assert "sync-notion-documentation" in build_beat_schedule(Settings())
+    assert "sync-notion-documentation" not in build_beat_schedule(
+        Settings(plugins_disabled=["notion_sync"])
+    )
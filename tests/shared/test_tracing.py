@@ -0,0 +1,76 @@
+"""Tests for processing-chain tracing."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from shared.utils import tracing
+from shared.utils.logging import ModuleIOLogger, correlation_scope
+
+
+class ListExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+
+@pytest.fixture
+def exporter():
+    """Install a tracer that collects spans in memory."""
+    collected = ListExporter()
+    tracing.configure_tracing(
+        tracing.Tracer(collected, service_name="test", flush_interval=0.05)
+    )
+    yield collected
+    tracing.shutdown_tracing()
+
+
+def test_spans_nest_under_correlation_trace(exporter):
+    """Module spans share a trace derived from the correlation ID."""
+    receiver = ModuleIOLogger("WebhookReceiver")
+    storage = ModuleIOLogger("DataStorage")
+    delivery = "72d3162e-cc78-11e3-81ab-4c9367dc0958"
+
+    with correlation_scope(delivery):
+        with receiver.span("receive"):
+            with storage.span("store"):
+                pass
+    tracing.shutdown_tracing()
+
+    spans = {span["name"]: span for span in exporter.spans}
+    root = spans["WebhookReceiver.receive"]
+    child = spans["DataStorage.store"]
+    assert root["trace_id"] == child["trace_id"] == delivery.replace("-", "")
+    assert child["parent_id"] == root["span_id"]
+    assert root["parent_id"] is None
+    assert root["end_ns"] >= child["end_ns"] >= child["start_ns"] >= root["start_ns"]
+
+
+def test_trace_span_records_errors_and_db_queries(exporter, tmp_path):
+    """Generic spans capture failures; instrumented engines emit db spans."""
+    engine = create_engine(f"sqlite:///{tmp_path}/trace.db")
+    tracing.instrument_engine(engine)
+
+    with pytest.raises(RuntimeError):
+        with tracing.trace_span("s3.upload", key="diffs/a.gz"):
+            with engine.begin() as conn:
+                conn.execute(text("CREATE TABLE t (id INTEGER)"))
+            raise RuntimeError("upload failed")
+    tracing.shutdown_tracing()
+
+    spans = {span["name"]: span for span in exporter.spans}
+    assert spans["s3.upload"]["error"] == "RuntimeError: upload failed"
+    assert spans["db.CREATE"]["parent_id"] == spans["s3.upload"]["span_id"]
+
+
+def test_tracing_disabled_is_noop():
+    """Without a tracer, starting a span does nothing."""
+    tracing.configure_tracing(None)
+
+    span, token = tracing.start_span("anything")
+
+    assert span is None and token is None
+    tracing.shutdown_tracing()
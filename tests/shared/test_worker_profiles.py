@@ -0,0 +1,49 @@
+"""Tests for Celery worker profiles."""
+
+from __future__ import annotations
+
+import pytest
+
+from shared.config.settings import Settings
+from shared.config.worker_profiles import get_worker_profiles
+
+
+def test_profiles_split_queues_and_pools():
+    """Webhook and bulk stages get their own queues and execution model."""
+    profiles = get_worker_profiles(Settings())
+
+    assert profiles["webhook"].queues == ["webhook_queue", "celery"]
+    assert profiles["webhook"].pool == "threads"
+    assert profiles["bulk"].queues == ["bulk"]
+    assert profiles["bulk"].pool == "prefork"
+
+
+def test_prefork_autoscales_and_thread_pools_use_max():
+    """Only prefork gets --autoscale; other pools are sized to the maximum."""
+    profiles = get_worker_profiles(
+        Settings(
+            celery_webhook_worker_max_concurrency=64,
+            celery_bulk_worker_min_concurrency=2,
+            celery_bulk_worker_max_concurrency=8,
+        )
+    )
+
+    bulk_argv = profiles["bulk"].worker_argv()
+    webhook_argv = profiles["webhook"].worker_argv()
+    assert "--autoscale=8,2" in bulk_argv
+    assert "--pool=prefork" in bulk_argv
+    assert "--concurrency=64" in webhook_argv
+    assert "--prefetch-multiplier=1" in webhook_argv
+
+
+def test_invalid_pool_or_bounds_are_rejected():
+    """Misconfiguration fails at launch instead of starting a bad worker."""
+    with pytest.raises(ValueError, match="Unknown pool"):
+        get_worker_profiles(Settings(celery_bulk_worker_pool="fork"))
+    with pytest.raises(ValueError, match="min_concurrency"):
+        get_worker_profiles(
+            Settings(
+                celery_bulk_worker_min_concurrency=5,
+                celery_bulk_worker_max_concurrency=2,
+            )
+        )
@@ -0,0 +1,63 @@
+"""Cold-start regression tests for the API process."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+ROOT = Path(__file__).parent.parent
+
+# Wall-clock budgets flake on shared runners; run them where timing is stable
+CHECK_BUDGET = os.environ.get("STARTUP_BUDGET_CHECK", "").lower() in ("1", "true")
+
+
+def _audit_report() -> dict:
+    completed = subprocess.run(
+        [sys.executable, "scripts/audit_startup_imports.py", "--json"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    return json.loads(completed.stdout)
+
+
+def test_health_probe_loads_no_heavy_dependency():
+    """``import main`` + /health loads none of the ``FORBIDDEN_MODULES``."""
+    report = _audit_report()
+
+    assert report["status"] == 200
+    assert report["forbidden_loaded"] == []
+
+
+@pytest.mark.skipif(not CHECK_BUDGET, reason="set STARTUP_BUDGET_CHECK=1")
+def test_health_probe_stays_within_cold_start_budget():
+    """``import main`` + /health fits the cold-start budget (opt-in)."""
+    report = _audit_report()
+
+    assert report["within_budget"], report["top_imports"][:10]
+
+
+def test_feature_routers_load_on_first_non_probe_request(monkeypatch, tmp_path):
+    """Probes skip the loader; the first other request includes the routers."""
+    monkeypatch.setenv("DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path}/app.db")
+    monkeypatch.setenv("DATABASE_MIGRATE_ON_STARTUP", "false")
+    from main import create_app
+    from shared.config.settings import get_settings
+
+    get_settings.cache_clear()
+    app = create_app()
+    client = TestClient(app)
+
+    assert client.get("/metrics").status_code == 200
+    probe_routes = len(app.routes)
+    summary = client.get("/events/summary", params={"granularity": "weekly"})
+    assert summary.status_code == 400
+    assert len(app.routes) > probe_routes
+    get_settings.cache_clear()